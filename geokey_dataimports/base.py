@@ -3,5 +3,7 @@
 from model_utils import Choices
 
 
-STATUS = Choices('active', 'invalid', 'deleted')
+STATUS = Choices('active', 'invalid', 'deleted', 'pending', 'processing')
 FORMAT = Choices('GeoJSON', 'KML', 'CSV')
+JOB_STATUS = Choices('pending', 'processing', 'completed', 'failed')
+INFERENCE = Choices('full', 'sample')
@@ -0,0 +1 @@
+"""All benchmarks for the extension."""
@@ -0,0 +1,107 @@
+"""Benchmark of classifying values into types."""
+
+import time
+import random
+
+from ..helpers.type_helpers import is_numeric, is_date, is_time, classify
+
+
+def generate_values(count=1000000, seed=0):
+    """
+    Generate mixed values, as found in files.
+
+    The same parameters always produce the same values.
+
+    Parameters
+    ----------
+    count : int
+        Number of values.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    list
+        Generated values.
+    """
+    generator = random.Random(seed)
+    makers = [
+        lambda: str(generator.randint(-100000, 100000)),
+        lambda: '%.3f' % generator.uniform(-1000, 1000),
+        lambda: '20%02d-%02d-%02d' % (
+            generator.randint(0, 30),
+            generator.randint(1, 12),
+            generator.randint(1, 28)
+        ),
+        lambda: '20%02d-%02d-%02dT%02d:%02d:%02d' % (
+            generator.randint(0, 30),
+            generator.randint(1, 12),
+            generator.randint(1, 28),
+            generator.randint(0, 23),
+            generator.randint(0, 59),
+            generator.randint(0, 59)
+        ),
+        lambda: '%s:%02d' % (
+            generator.randint(0, 23),
+            generator.randint(0, 59)
+        ),
+        lambda: generator.choice(['Meat', 'Fish', 'Vegetables', 'London']),
+        lambda: 'POINT (%.4f %.4f)' % (
+            generator.uniform(-180, 180),
+            generator.uniform(-90, 90)
+        )
+    ]
+
+    return [generator.choice(makers)() for _ in range(count)]
+
+
+def classify_with_helpers(value):
+    """Get all types the value can have, checking each type on its own."""
+    types = set()
+
+    if is_numeric(value):
+        types.add('NumericField')
+    if is_date(value):
+        types.update(['DateField', 'DateTimeField'])
+    if is_time(value):
+        types.add('TimeField')
+
+    return types
+
+
+def benchmark_classifier(count=1000000, seed=0):
+    """
+    Compare the classifier with checking each type on its own.
+
+    Parameters
+    ----------
+    count : int
+        Number of values to classify.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    dict
+        Seconds taken by each approach and the speedup.
+    """
+    values = generate_values(count, seed)
+    results = {'values': count}
+
+    for name, method in [
+            ('helpers', classify_with_helpers),
+            ('classifier', classify)]:
+        start = time.time()
+        for value in values:
+            method(value)
+        results[name] = time.time() - start
+
+    results['speedup'] = results['helpers'] / results['classifier']
+    return results
+
+
+if __name__ == '__main__':
+    print(
+        '%(values)s values: helpers %(helpers).2fs, classifier '
+        '%(classifier).2fs (%(speedup).1fx faster)' % benchmark_classifier()
+    )
@@ -0,0 +1,273 @@
+"""All generators of synthetic files for benchmarks."""
+
+import csv
+import json
+import random
+
+from xml.sax.saxutils import escape, quoteattr
+
+
+GEOMETRY_TYPES = ('Point', 'LineString', 'Polygon')
+
+
+def make_geometry(generator, geometry_type):
+    """
+    Make a random geometry.
+
+    Lines and polygons are small, around a random point.
+
+    Parameters
+    ----------
+    generator : random.Random
+        Generator of the random values.
+    geometry_type : str
+        `Point`, `LineString` or `Polygon`.
+
+    Returns
+    -------
+    dict
+        GeoJSON geometry.
+    """
+    x = round(generator.uniform(-179, 179), 6)
+    y = round(generator.uniform(-89, 89), 6)
+
+    if geometry_type == 'Point':
+        return {'type': 'Point', 'coordinates': [x, y]}
+
+    if geometry_type == 'LineString':
+        return {'type': 'LineString', 'coordinates': [[
+            round(x + generator.uniform(-0.5, 0.5), 6),
+            round(y + generator.uniform(-0.5, 0.5), 6)
+        ] for point in range(3)]}
+
+    if geometry_type == 'Polygon':
+        # Points go round the centre, so the ring never crosses itself
+        ring = [
+            [round(x + 0.5, 6), y],
+            [x, round(y + 0.5, 6)],
+            [round(x - 0.5, 6), y],
+            [x, round(y - 0.5, 6)]
+        ]
+        return {'type': 'Polygon', 'coordinates': [ring + ring[:1]]}
+
+    raise ValueError('Geometry type must be one of %s.' % ', '.join(
+        GEOMETRY_TYPES
+    ))
+
+
+def iter_features(features, columns=3, geometry_types=('Point',), seed=0):
+    """
+    Generate features with random geometries and properties.
+
+    The same parameters always produce the same features. Columns hold
+    integers, decimals and text in turn, geometry types are used in turn.
+
+    Parameters
+    ----------
+    features : int
+        Number of features.
+    columns : int
+        Number of properties of each feature.
+    geometry_types : tuple
+        Types of geometries.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    generator
+        Yields GeoJSON geometry and properties of each feature.
+    """
+    generator = random.Random(seed)
+    names = ['Column %s' % column for column in range(columns)]
+
+    for feature in range(features):
+        geometry = make_geometry(
+            generator,
+            geometry_types[feature % len(geometry_types)]
+        )
+        properties = {}
+
+        for column, name in enumerate(names):
+            if column % 3 == 0:
+                properties[name] = feature
+            elif column % 3 == 1:
+                properties[name] = round(generator.uniform(0, 1000), 2)
+            else:
+                properties[name] = 'Value %s' % generator.randint(0, 100)
+
+        yield geometry, properties
+
+
+def to_wkt(geometry):
+    """Write GeoJSON geometry as WKT."""
+    def points(coordinates):
+        return ', '.join('%s %s' % tuple(point) for point in coordinates)
+
+    if geometry['type'] == 'Point':
+        return 'POINT (%s %s)' % tuple(geometry['coordinates'])
+
+    if geometry['type'] == 'LineString':
+        return 'LINESTRING (%s)' % points(geometry['coordinates'])
+
+    return 'POLYGON (%s)' % ', '.join(
+        '(%s)' % points(ring) for ring in geometry['coordinates']
+    )
+
+
+def to_kml(geometry):
+    """Write GeoJSON geometry as KML."""
+    def points(coordinates):
+        return '<coordinates>%s</coordinates>' % ' '.join(
+            '%s,%s' % tuple(point) for point in coordinates
+        )
+
+    if geometry['type'] == 'Point':
+        return '<Point>%s</Point>' % points([geometry['coordinates']])
+
+    if geometry['type'] == 'LineString':
+        return '<LineString>%s</LineString>' % points(
+            geometry['coordinates']
+        )
+
+    return (
+        '<Polygon><outerBoundaryIs><LinearRing>%s</LinearRing>'
+        '</outerBoundaryIs></Polygon>'
+    ) % points(geometry['coordinates'][0])
+
+
+def write_csv(path, rows, columns=3, geometry_types=('Point',), seed=0):
+    """
+    Write CSV file with WKT geometries.
+
+    The same parameters always produce the same file.
+
+    Parameters
+    ----------
+    path : str
+        Where to write the file.
+    rows : int
+        Number of rows.
+    columns : int
+        Number of columns next to the geometry.
+    geometry_types : tuple
+        Types of geometries.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    str
+        Path of the file.
+    """
+    names = ['Column %s' % column for column in range(columns)]
+
+    with open(path, 'w') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Geometry'] + names)
+
+        for geometry, properties in iter_features(
+                rows, columns, geometry_types, seed):
+            writer.writerow([to_wkt(geometry)] + [
+                properties[name] for name in names
+            ])
+
+    return path
+
+
+def write_geojson(path, features, columns=3, geometry_types=('Point',),
+                  seed=0):
+    """
+    Write GeoJSON file with a feature collection.
+
+    The same parameters always produce the same file, with the same features
+    as the CSV file.
+
+    Parameters
+    ----------
+    path : str
+        Where to write the file.
+    features : int
+        Number of features.
+    columns : int
+        Number of properties of each feature.
+    geometry_types : tuple
+        Types of geometries.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    str
+        Path of the file.
+    """
+    with open(path, 'w') as file:
+        file.write('{"type": "FeatureCollection", "features": [')
+
+        for index, (geometry, properties) in enumerate(iter_features(
+                features, columns, geometry_types, seed)):
+            if index:
+                file.write(',')
+
+            file.write(json.dumps({
+                'type': 'Feature',
+                'geometry': geometry,
+                'properties': properties
+            }, sort_keys=True))
+
+        file.write(']}')
+
+    return path
+
+
+def write_kml(path, placemarks, columns=3, geometry_types=('Point',),
+              seed=0):
+    """
+    Write KML file with properties of placemarks as extended data.
+
+    The same parameters always produce the same file, with the same features
+    as the CSV file.
+
+    Parameters
+    ----------
+    path : str
+        Where to write the file.
+    placemarks : int
+        Number of placemarks.
+    columns : int
+        Number of properties of each placemark.
+    geometry_types : tuple
+        Types of geometries.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    str
+        Path of the file.
+    """
+    names = ['Column %s' % column for column in range(columns)]
+
+    with open(path, 'w') as file:
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+        )
+
+        for geometry, properties in iter_features(
+                placemarks, columns, geometry_types, seed):
+            file.write('<Placemark><ExtendedData>%s</ExtendedData>%s'
+                       '</Placemark>' % (
+                           ''.join(
+                               '<Data name=%s><value>%s</value></Data>' % (
+                                   quoteattr(name),
+                                   escape(str(properties[name]))
+                               )
+                               for name in names
+                           ),
+                           to_kml(geometry)
+                       ))
+
+        file.write('</Document></kml>')
+
+    return path
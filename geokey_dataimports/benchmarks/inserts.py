@@ -0,0 +1,108 @@
+"""Benchmark of storing data features."""
+
+import os
+import time
+import shutil
+import tempfile
+
+from django.core.files import File
+from django.db import transaction
+from django.test.utils import override_settings
+from django.contrib.auth import get_user_model
+
+from geokey.projects.models import Project
+
+from ..base import FORMAT
+from ..models import DataImport
+from .generators import write_csv
+
+
+def time_parse(path, dataformat):
+    """
+    Time reading a file into a new data import.
+
+    Everything stored is rolled back afterwards.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    dataformat : str
+        Format of the file.
+
+    Returns
+    -------
+    tuple
+        Elapsed seconds and number of data features stored.
+    """
+    with transaction.atomic():
+        user = get_user_model().objects.create_user(
+            'benchmark@example.com',
+            'Benchmark'
+        )
+        project = Project.create(
+            'Benchmark', '', True, False, 'false', user
+        )
+        dataimport = DataImport(
+            name='Benchmark',
+            dataformat=dataformat,
+            project=project,
+            creator=user
+        )
+
+        with open(path) as file_obj:
+            dataimport.file.save(
+                os.path.basename(path),
+                File(file_obj),
+                save=False
+            )
+
+        start = time.time()
+        dataimport.save()
+        elapsed = time.time() - start
+
+        count = dataimport.datafeatures.count()
+        dataimport.file.delete(save=False)
+        transaction.set_rollback(True)
+
+    return elapsed, count
+
+
+def benchmark_inserts(rows=10000, batch_sizes=(1, 1000)):
+    """
+    Benchmark storing data features from a CSV file with each batch size.
+
+    Batch size of 1 inserts every row on its own, as it used to be.
+
+    Parameters
+    ----------
+    rows : int
+        Number of rows in the CSV file.
+    batch_sizes : tuple
+        Batch sizes to compare.
+
+    Returns
+    -------
+    list
+        Result for each batch size.
+    """
+    directory = tempfile.mkdtemp()
+    results = []
+
+    try:
+        path = write_csv(os.path.join(directory, 'benchmark.csv'), rows)
+
+        for batch_size in batch_sizes:
+            with override_settings(DATAIMPORTS_BATCH_SIZE=batch_size):
+                elapsed, count = time_parse(path, FORMAT.CSV)
+
+            results.append({
+                'batch_size': batch_size,
+                'rows': count,
+                'seconds': elapsed,
+                'rows_per_second': count / elapsed if elapsed else None
+            })
+    finally:
+        shutil.rmtree(directory)
+
+    return results
@@ -0,0 +1,245 @@
+"""Benchmark of each stage of data imports."""
+
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+
+from django.core.files import File
+from django.db import transaction
+from django.test.utils import override_settings
+from django.contrib.auth import get_user_model
+
+from geokey.projects.models import Project
+from geokey.categories.models import Category
+
+from ..base import FORMAT, INFERENCE, JOB_STATUS
+from ..models import DataImport, ContributionImport
+from ..helpers.field_helpers import assign_fields
+from ..helpers.inference_helpers import TypeInference
+from ..helpers.pipeline_helpers import infer_types, extract_geometries
+from .generators import write_csv, write_geojson, write_kml
+
+
+SIZES = (1000, 100000, 1000000)
+STAGES = ('parse', 'inference', 'insert', 'fields', 'import')
+WRITERS = {
+    FORMAT.CSV: (write_csv, 'csv'),
+    FORMAT.GeoJSON: (write_geojson, 'geojson'),
+    FORMAT.KML: (write_kml, 'kml')
+}
+
+
+def get_revision():
+    """Get the commit of the extension checked out, `None` if not known."""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT
+        ).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_stage_seconds(stats, name):
+    """Get seconds of a stage from stats of a data import, 0 if not run."""
+    for stage in stats['stages']:
+        if stage['name'] == name:
+            return stage['seconds']
+
+    return 0.0
+
+
+def drain(features):
+    """Read all features, counting them."""
+    count = 0
+
+    for feature in features:
+        count += 1
+
+    return count
+
+
+def time_stages(path, dataformat):
+    """
+    Time each stage of a data import of a file.
+
+    The file is read alone first, and read with inference (and geometry
+    extraction) next, time of inference is the difference. The file is
+    stored last, time of storing data features is taken from stats of the
+    data import. Everything stored is rolled back afterwards.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    dataformat : str
+        Format of the file.
+
+    Returns
+    -------
+    dict
+        Elapsed seconds of each stage, number of data features stored,
+        fields assigned and contributions imported.
+    """
+    seconds = {}
+
+    with transaction.atomic():
+        user = get_user_model().objects.create_user(
+            'benchmark@example.com',
+            'Benchmark'
+        )
+        project = Project.create(
+            'Benchmark', '', True, False, 'false', user
+        )
+        dataimport = DataImport(
+            name='Benchmark',
+            dataformat=dataformat,
+            project=project,
+            creator=user
+        )
+
+        with open(path) as file_obj:
+            dataimport.file.save(
+                os.path.basename(path),
+                File(file_obj),
+                save=False
+            )
+
+        start = time.time()
+        reader = dataimport.iter_features(TypeInference())
+        try:
+            drain(reader)
+        finally:
+            reader.close()
+        seconds['parse'] = time.time() - start
+
+        start = time.time()
+        inference = TypeInference()
+        reader = dataimport.iter_features(inference)
+        try:
+            drain(extract_geometries(
+                infer_types(reader, inference),
+                inference,
+                []
+            ))
+        finally:
+            reader.close()
+        seconds['inference'] = time.time() - start - seconds['parse']
+
+        dataimport.save()
+        seconds['insert'] = get_stage_seconds(dataimport.stats, 'insert')
+        datafeatures = dataimport.datafeatures.count()
+
+        dataimport.category = Category.objects.create(
+            name='Benchmark',
+            project=project,
+            creator=user
+        )
+        dataimport.save()
+
+        start = time.time()
+        fields = assign_fields(dataimport, [
+            (
+                datafield,
+                None,
+                datafield.name,
+                'NumericField' if 'NumericField' in datafield.types else
+                'TextField'
+            )
+            for datafield in dataimport.datafields.all()
+        ])
+        dataimport.keys = [field.key for field in fields]
+        dataimport.save()
+        seconds['fields'] = time.time() - start
+
+        contributionimport = ContributionImport.objects.create(
+            selection={'exclude': []},
+            dataimport=dataimport,
+            creator=user,
+            status=JOB_STATUS.processing
+        )
+
+        start = time.time()
+        contributionimport.process()
+        seconds['import'] = time.time() - start
+
+        dataimport.file.delete(save=False)
+        transaction.set_rollback(True)
+
+    return {
+        'seconds': seconds,
+        'datafeatures': datafeatures,
+        'fields': len(fields),
+        'contributions': contributionimport.imported
+    }
+
+
+def benchmark_stages(sizes=SIZES, dataformats=(FORMAT.CSV,), columns=3,
+                     geometry_types=('Point',), seed=0):
+    """
+    Benchmark each stage of data imports of generated files.
+
+    Files are generated for every format and size, with the same features.
+    Types are inferred from all features, contributions are imported by a
+    single worker: the results are comparable across commits and machines
+    with the same settings otherwise.
+
+    Parameters
+    ----------
+    sizes : tuple
+        Numbers of features in the files.
+    dataformats : tuple
+        Formats of the files.
+    columns : int
+        Number of properties of each feature.
+    geometry_types : tuple
+        Types of geometries, used in turn.
+    seed : int
+        Seed of the random values.
+
+    Returns
+    -------
+    list
+        Result for each format and size.
+    """
+    directory = tempfile.mkdtemp()
+    results = []
+
+    try:
+        for dataformat in dataformats:
+            write, extension = WRITERS[dataformat]
+
+            for size in sizes:
+                path = write(
+                    os.path.join(directory, 'benchmark.%s' % extension),
+                    size,
+                    columns,
+                    geometry_types,
+                    seed
+                )
+
+                with override_settings(
+                        DATAIMPORTS_INFERENCE=INFERENCE.full,
+                        DATAIMPORTS_IMPORT_WORKERS=1):
+                    result = time_stages(path, dataformat)
+
+                os.remove(path)
+                result.update({
+                    'dataformat': dataformat,
+                    'features': size,
+                    'columns': columns,
+                    'geometry_types': list(geometry_types),
+                    'seed': seed
+                })
+                result['features_per_second'] = dict(
+                    (stage, size / elapsed if elapsed > 0 else None)
+                    for stage, elapsed in result['seconds'].items()
+                )
+                results.append(result)
+    finally:
+        shutil.rmtree(directory)
+
+    return results
@@ -0,0 +1,117 @@
+"""All helpers for the COPY ingestion."""
+
+from six import PY2
+
+
+COPY_ESCAPES = [
+    ('\\', '\\\\'),
+    ('\t', '\\t'),
+    ('\n', '\\n'),
+    ('\r', '\\r')
+]
+
+
+def to_copy_value(value):
+    """
+    Make a value safe for the text format of COPY.
+
+    Parameters
+    ----------
+    value : str
+        Value to escape, `None` for NULL.
+
+    Returns
+    -------
+    str
+        Escaped value.
+    """
+    if value is None:
+        return '\\N'
+
+    for character, escaped in COPY_ESCAPES:
+        value = value.replace(character, escaped)
+
+    return value
+
+
+def to_array_literal(values):
+    """
+    Make an array literal out of text values.
+
+    Parameters
+    ----------
+    values : list
+        Values of the array, `None` for NULL.
+
+    Returns
+    -------
+    str
+        Array literal with all values quoted, `None` for NULL.
+    """
+    if values is None:
+        return None
+
+    return '{%s}' % ','.join(
+        '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+        for value in values
+    )
+
+
+def to_copy_row(values):
+    """
+    Make a single row for the text format of COPY.
+
+    Parameters
+    ----------
+    values : list
+        Values of the row.
+
+    Returns
+    -------
+    str
+        Tab separated values, ending with a new line.
+    """
+    return '\t'.join(to_copy_value(value) for value in values) + '\n'
+
+
+class CopyStream(object):
+    """
+    File-like object for `COPY ... FROM STDIN`.
+
+    Rows are pulled from the iterable only when the database asks for more
+    data, so they never have to be held in memory at once.
+    """
+
+    def __init__(self, rows):
+        """Initialise the stream."""
+        self.rows = iter(rows)
+        self.buffer = ''
+
+    def read(self, size=-1):
+        """Read up to size characters of rows (all when size is negative)."""
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += next(self.rows)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self.buffer)
+
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+
+        if PY2 and isinstance(data, unicode):
+            data = data.encode('utf-8')
+
+        return data
+
+    def readline(self, size=-1):
+        """Read a single row."""
+        if '\n' not in self.buffer:
+            try:
+                self.buffer += next(self.rows)
+            except StopIteration:
+                pass
+
+        index = self.buffer.find('\n') + 1 or len(self.buffer)
+        return self.read(index)
@@ -0,0 +1,87 @@
+"""All helpers for assigning fields to data imports."""
+
+from django.apps import apps
+from django.db import transaction
+from django.template.defaultfilters import slugify
+
+from geokey.categories.models import Field
+
+
+def get_unique_key(name, keys):
+    """
+    Make a key of a field that is not taken yet.
+
+    Parameters
+    ----------
+    name : str
+        Name the key is made of.
+    keys : container
+        Keys taken already.
+
+    Returns
+    -------
+    str
+        Slug of the name, numbered when the slug is taken.
+    """
+    proposed_key = slugify(name)
+    key = proposed_key
+    count = 1
+
+    while key in keys:
+        key = '%s-%s' % (proposed_key, count)
+        count += 1
+
+    return key
+
+
+def assign_fields(dataimport, assignments):
+    """
+    Assign fields of the category to data fields of a data import.
+
+    Fields of the category are loaded once, a new field is created for every
+    data field that is not assigned to an existing one, and properties of
+    data features are renamed to keys of the fields with a single update, so
+    every data feature is written once at most.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        Data import with a category.
+    assignments : list
+        Tuples of a data field, the key of an existing field (`None` to
+        create a new one, unless the data field has a key already), and name
+        and type of the field when it is created.
+
+    Returns
+    -------
+    list
+        Fields assigned, in order of the assignments.
+    """
+    category = dataimport.category
+    fields = dict((field.key, field) for field in category.fields.all())
+    assigned = []
+    renamed = {}
+
+    with transaction.atomic():
+        for datafield, key, name, fieldtype in assignments:
+            key = key or datafield.key
+            field = fields.get(key) if key else None
+
+            if field is None:
+                key = get_unique_key(datafield.name, fields)
+                field = Field.create(name, key, '', False, category, fieldtype)
+                fields[key] = field
+
+            if datafield.key != key:
+                datafield.key = key
+                datafield.save()
+
+            renamed[datafield.name] = key
+            assigned.append(field)
+
+        apps.get_model(
+            'geokey_dataimports',
+            'DataFeature'
+        ).objects.rename_properties(dataimport, renamed)
+
+    return assigned
@@ -0,0 +1,624 @@
+"""All helpers for importing data features as contributions."""
+
+import re
+import time
+import logging
+import multiprocessing
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import F, prefetch_related_objects
+from django.utils import timezone
+
+from six import string_types, text_type
+
+from geokey.core.base import STATUS_ACTION
+from geokey.core.exceptions import InputError
+from geokey.core.models import LoggerHistory, add_extra_info, generate_log
+from geokey.categories.models import LookupValue
+from geokey.contributions.models import Location, Observation
+
+from .pipeline_helpers import iter_batches
+
+
+LOOKUP_TYPES = ('LookupField', 'MultipleLookupField')
+
+logger = logging.getLogger(__name__)
+
+# Importer of the worker process, set up when the process starts
+_worker_importer = None
+
+
+def get_search_index(properties, fields):
+    """
+    Make the search index of a contribution.
+
+    Same as `Observation.create_search_index`, except that fields and their
+    lookup values are already loaded.
+
+    Parameters
+    ----------
+    properties : dict
+        Properties of the contribution.
+    fields : list
+        All fields of the category, lookup values prefetched.
+
+    Returns
+    -------
+    str
+        Comma separated search terms.
+    """
+    search_index = []
+
+    for field in fields:
+        value = None
+
+        if properties and field.key in properties.keys():
+            fieldtype = field.fieldtype
+
+            if fieldtype == 'TextField':
+                value = properties.get(field.key)
+
+            if fieldtype == 'NumericField':
+                value = str(properties.get(field.key))
+
+            if fieldtype == 'LookupField':
+                lookup_id = properties.get(field.key)
+                if lookup_id:
+                    value = next((
+                        lookupvalue.name
+                        for lookupvalue in field.lookupvalues.all()
+                        if lookupvalue.id == int(lookup_id)
+                    ), None)
+
+            if fieldtype == 'MultipleLookupField':
+                lookup_id = properties.get(field.key)
+                if lookup_id:
+                    value = ' '.join([
+                        lookupvalue.name
+                        for lookupvalue in field.lookupvalues.all()
+                        if lookupvalue.id in lookup_id
+                    ])
+
+        if value:
+            cleaned = re.sub(r'[\W_]+', ' ', text_type(value))
+            terms = cleaned.lower().split()
+
+            search_index = search_index + list(
+                set(terms) - set(search_index)
+            )
+
+    return ','.join(search_index)
+
+
+class ContributionImporter(object):
+    """
+    Convert data features of a data import to contributions in batches.
+
+    Contributions are the same as the ones `ContributionSerializer` makes, but
+    each batch is validated against fields of the category loaded once and
+    stored with a fixed number of queries: missing lookup values, locations,
+    observations, their history and logs are created in bulk, and data
+    features are marked as imported (and counted on the data import) with a
+    single update each. Existing lookup values are loaded once for the whole
+    import.
+    """
+
+    def __init__(self, dataimport, user):
+        """Initialise the importer."""
+        self.dataimport = dataimport
+        self.user = user
+        self.project = dataimport.project
+        self.category = dataimport.category
+        self.keys = set(dataimport.keys or [])
+        self.lookupfields = dataimport.get_lookup_fields()
+        self.lookupvalues = self.load_lookupvalues()
+
+    def load_lookupvalues(self):
+        """
+        Load all existing lookup values of lookup fields.
+
+        Returns
+        -------
+        dict
+            IDs of lookup values by their names, by field key.
+        """
+        lookupvalues = dict((key, {}) for key in self.lookupfields)
+        keys = dict(
+            (field.id, key) for key, field in self.lookupfields.items()
+        )
+
+        for field_id, name, lookup_id in LookupValue.objects.filter(
+                field__in=list(self.lookupfields.values())
+        ).order_by('id').values_list('field_id', 'name', 'id'):
+            lookupvalues[keys[field_id]].setdefault(name, lookup_id)
+
+        return lookupvalues
+
+    def create_lookupvalues(self, datafeatures):
+        """
+        Create lookup values used by data features that do not exist yet.
+
+        All of them are created at once and added to the loaded ones.
+
+        Parameters
+        ----------
+        datafeatures : list
+            Data features to import.
+        """
+        missing = []
+
+        for datafeature in datafeatures:
+            for key, value in datafeature.properties.items():
+                if (key not in self.keys or key not in self.lookupfields or
+                        value is None):
+                    continue
+
+                names = self.lookupvalues[key]
+                name = text_type(value)
+
+                if name not in names:
+                    names[name] = None
+                    missing.append((key, LookupValue(
+                        name=name,
+                        field=self.lookupfields[key]
+                    )))
+
+        LookupValue.objects.bulk_create(
+            [lookupvalue for key, lookupvalue in missing]
+        )
+
+        for key, lookupvalue in missing:
+            self.lookupvalues[key][lookupvalue.name] = lookupvalue.id
+
+    def is_category_valid(self):
+        """
+        Check if contributions can be added to the category.
+
+        Same as `ContributionSerializer.validate_category`: the category must
+        belong to the project and must not be inactive.
+
+        Returns
+        -------
+        boolean
+            Whether the category is valid.
+        """
+        return (
+            self.category.project_id == self.project.id and
+            self.category.status != 'inactive'
+        )
+
+    def load_fields(self):
+        """
+        Load all fields of the category, with their lookup values.
+
+        Returns
+        -------
+        list
+            All fields, subclassed, lookup values prefetched.
+        """
+        fields = list(self.category.fields.all())
+
+        for fieldtype in LOOKUP_TYPES:
+            prefetch_related_objects(
+                [field for field in fields if field.fieldtype == fieldtype],
+                'lookupvalues'
+            )
+
+        return fields
+
+    def get_properties(self, datafeature):
+        """
+        Get properties of a data feature as contribution properties.
+
+        Only properties with keys assigned to fields are kept, lookup values
+        are converted to their IDs (they must have been loaded or created
+        already) and empty values are replaced with `None`.
+
+        Parameters
+        ----------
+        datafeature : geokey_dataimports.models.DataFeature
+            Data feature to convert.
+
+        Returns
+        -------
+        dict
+            Contribution properties.
+        """
+        properties = {}
+
+        for key, value in datafeature.properties.items():
+            if key not in self.keys:
+                continue
+
+            if key in self.lookupfields and value is not None:
+                value = self.lookupvalues[key][text_type(value)]
+
+            if isinstance(value, string_types) and len(value) == 0:
+                value = None
+
+            properties[key] = value
+
+        return properties
+
+    def validate(self, properties, fields, status):
+        """
+        Validate contribution properties against fields of the category.
+
+        Same as `Observation.validate_full` (`validate_partial` for drafts).
+
+        Parameters
+        ----------
+        properties : dict
+            Contribution properties.
+        fields : list
+            All fields of the category, lookup values prefetched.
+        status : str
+            Status of the contribution.
+
+        Returns
+        -------
+        boolean
+            Whether the properties are valid.
+        """
+        for field in fields:
+            if field.status != 'active':
+                continue
+
+            value = properties.get(field.key)
+
+            if status == 'draft' and value is None:
+                continue
+
+            try:
+                field.validate_input(value)
+            except InputError:
+                return False
+
+        return True
+
+    def import_batch(self, datafeatures):
+        """
+        Import a single batch of data features.
+
+        Data features that do not validate, or have no geometry, are left as
+        they are.
+
+        Parameters
+        ----------
+        datafeatures : list
+            Data features to import.
+
+        Returns
+        -------
+        int
+            Number of contributions created.
+        """
+        if not self.is_category_valid():
+            return 0
+
+        status = self.category.default_status
+        datafeatures = [
+            datafeature for datafeature in datafeatures
+            if datafeature.geometry is not None
+        ]
+        self.create_lookupvalues(datafeatures)
+        prepared = [
+            (datafeature, self.get_properties(datafeature))
+            for datafeature in datafeatures
+        ]
+
+        fields = self.load_fields()
+        prepared = [
+            (datafeature, properties)
+            for datafeature, properties in prepared
+            if self.validate(properties, fields, status)
+        ]
+
+        if not prepared:
+            return 0
+
+        with transaction.atomic():
+            locations = Location.objects.bulk_create([
+                Location(geometry=datafeature.geometry, creator=self.user)
+                for datafeature, properties in prepared
+            ])
+
+            observations = []
+            for location, (datafeature, properties) in zip(
+                    locations, prepared):
+                observation = Observation(
+                    location=location,
+                    project=self.project,
+                    category=self.category,
+                    properties=properties,
+                    creator=self.user,
+                    status=status
+                )
+                observation.update_display_field()
+                observation.update_expiry_field()
+                observation.search_index = get_search_index(
+                    properties,
+                    fields
+                )
+                observations.append(observation)
+
+            observations = Observation.objects.bulk_create(observations)
+            histories = self.create_histories(observations)
+            self.create_logs(locations, observations, histories)
+
+            count = self.dataimport.datafeatures.filter(id__in=[
+                datafeature.id for datafeature, properties in prepared
+            ]).update(imported=True)
+            type(self.dataimport).objects.filter(
+                pk=self.dataimport.pk
+            ).update(imported_features=F('imported_features') + count)
+
+        return len(observations)
+
+    def create_histories(self, observations):
+        """Create the history entry each new observation gets when saved."""
+        history_model = Observation.history.model
+        history_date = timezone.now()
+        histories = []
+
+        for observation in observations:
+            attrs = {}
+            for field in observation._meta.fields:
+                attrs[field.attname] = getattr(observation, field.attname)
+
+            histories.append(history_model(
+                history_date=history_date,
+                history_type='+',
+                history_user=self.user,
+                **attrs
+            ))
+
+        return history_model.objects.bulk_create(histories)
+
+    def create_logs(self, locations, observations, histories):
+        """Create the logs new locations and observations get when saved."""
+        logs = []
+
+        for location in locations:
+            logs.append(generate_log(Location, location, add_extra_info({
+                'id': STATUS_ACTION.created,
+                'class': 'Location'
+            }, location)))
+
+        for observation, history in zip(observations, histories):
+            # New drafts are not logged
+            if observation.status == 'draft':
+                continue
+
+            log = generate_log(Observation, observation, add_extra_info({
+                'id': STATUS_ACTION.created,
+                'class': 'Observation',
+                'field': 'status',
+                'value': observation.status
+            }, observation))
+            log.historical = {
+                'id': str(history.pk),
+                'class': history.__class__.__name__
+            }
+            logs.append(log)
+
+        LoggerHistory.objects.bulk_create(logs)
+
+
+def import_datafeatures(dataimport, user, datafeatures, callback=None,
+                        start=None):
+    """
+    Import data features of a data import as contributions.
+
+    Data features are imported in order of their IDs, in batches of
+    `DATAIMPORTS_IMPORT_BATCH_SIZE`, each batch committed in its own
+    transaction together with whatever the callback stores. As in
+    `import_chunk`, data features of a batch are locked with `SELECT ... FOR
+    UPDATE SKIP LOCKED`, so the ones locked by another import, or imported
+    meanwhile, are skipped and none get imported twice.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        Data import the data features belong to.
+    user : geokey.users.models.User
+        User who creates the contributions.
+    datafeatures : django.db.models.query.QuerySet
+        Data features to import, the ones already imported are skipped.
+    callback : function
+        Called inside the transaction of each batch with the number of data
+        features processed and contributions created in the batch, and the
+        ID of the last data feature of the batch.
+    start : int
+        Only data features with IDs greater than this one are imported, used
+        to continue an interrupted import.
+
+    Returns
+    -------
+    int
+        Number of contributions created.
+    """
+    batch_size = getattr(settings, 'DATAIMPORTS_IMPORT_BATCH_SIZE', 500)
+    importer = ContributionImporter(dataimport, user)
+    imported = 0
+
+    datafeatures = datafeatures.filter(imported=False)
+
+    if start is not None:
+        datafeatures = datafeatures.filter(id__gt=start)
+
+    ids = datafeatures.order_by('id').values_list('id', flat=True)
+
+    for batch in iter_batches(ids, batch_size):
+        with transaction.atomic():
+            count = importer.import_batch(list(
+                dataimport.datafeatures.select_for_update(
+                    skip_locked=True
+                ).filter(
+                    id__in=batch,
+                    imported=False
+                ).order_by('id')
+            ))
+
+            if callback:
+                callback(len(batch), count, batch[-1])
+
+        imported += count
+
+    return imported
+
+
+def init_worker(dataimport_id, user_id):
+    """
+    Set up a worker process of a parallel import.
+
+    Connections inherited from the coordinator are dropped (they were closed
+    before the pool started), so the worker opens its own one.
+
+    Parameters
+    ----------
+    dataimport_id : int
+        ID of the data import.
+    user_id : int
+        ID of the user who creates the contributions.
+    """
+    global _worker_importer
+
+    connections.close_all()
+    dataimport = apps.get_model(
+        'geokey_dataimports',
+        'DataImport'
+    ).objects.get(pk=dataimport_id)
+    user = get_user_model().objects.get(pk=user_id)
+    _worker_importer = ContributionImporter(dataimport, user)
+
+
+def import_chunk(ids):
+    """
+    Import a single chunk of data features in a worker process.
+
+    Data features of the chunk are locked with `SELECT ... FOR UPDATE SKIP
+    LOCKED` and imported in batches in a single transaction. Data features
+    locked by someone else, or imported meanwhile, are skipped, so none get
+    imported twice.
+
+    Parameters
+    ----------
+    ids : list
+        IDs of data features in the chunk, in order.
+
+    Returns
+    -------
+    tuple
+        Number of data features processed and contributions created, and
+        seconds spent on the chunk.
+    """
+    batch_size = getattr(settings, 'DATAIMPORTS_IMPORT_BATCH_SIZE', 500)
+    importer = _worker_importer
+    started = time.time()
+    processed = 0
+    imported = 0
+
+    with transaction.atomic():
+        datafeatures = list(
+            importer.dataimport.datafeatures.select_for_update(
+                skip_locked=True
+            ).filter(
+                id__range=(ids[0], ids[-1]),
+                id__in=ids,
+                imported=False
+            ).order_by('id')
+        )
+
+        for batch in iter_batches(datafeatures, batch_size):
+            imported += importer.import_batch(batch)
+            processed += len(batch)
+
+    return processed, imported, time.time() - started
+
+
+def import_datafeatures_parallel(dataimport, user, datafeatures, workers,
+                                 callback=None):
+    """
+    Import data features of a data import as contributions in parallel.
+
+    Data features not imported yet are split into chunks of consecutive IDs
+    (`DATAIMPORTS_IMPORT_CHUNK_SIZE` each), imported by a pool of worker
+    processes, each with its own database connection. Missing lookup values
+    are created up front, so workers do not create the same ones.
+
+    Parameters
+    ----------
+    dataimport : geokey_dataimports.models.DataImport
+        Data import the data features belong to.
+    user : geokey.users.models.User
+        User who creates the contributions.
+    datafeatures : django.db.models.query.QuerySet
+        Data features to import, the ones already imported are skipped.
+    workers : int
+        Number of worker processes.
+    callback : function
+        Called after each chunk is committed with the number of data features
+        processed and contributions created in the chunk, and `None` as
+        chunks do not finish in order.
+
+    Returns
+    -------
+    tuple
+        Number of contributions created, and the speedup: time all workers
+        spent on chunks divided by the time the import took.
+    """
+    chunk_size = getattr(settings, 'DATAIMPORTS_IMPORT_CHUNK_SIZE', 5000)
+    batch_size = getattr(settings, 'DATAIMPORTS_IMPORT_BATCH_SIZE', 500)
+    started = time.time()
+    busy = 0
+    imported = 0
+
+    ids = list(datafeatures.filter(
+        imported=False
+    ).order_by('id').values_list('id', flat=True))
+
+    importer = ContributionImporter(dataimport, user)
+    for batch in iter_batches(ids, batch_size):
+        importer.create_lookupvalues(list(
+            dataimport.datafeatures.filter(id__in=batch).only('properties')
+        ))
+
+    # Forked workers must not share the connection of the coordinator
+    connections.close_all()
+    pool = multiprocessing.Pool(
+        workers,
+        initializer=init_worker,
+        initargs=(dataimport.id, user.id)
+    )
+
+    try:
+        for processed, count, seconds in pool.imap_unordered(
+                import_chunk, iter_batches(ids, chunk_size)):
+            busy += seconds
+            imported += count
+
+            if callback:
+                callback(processed, count, None)
+
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    speedup = busy / max(time.time() - started, 0.001)
+    logger.info(
+        'Imported %s data features of data import %s with %s workers, '
+        '%.2fx speedup.',
+        imported,
+        dataimport.id,
+        workers,
+        speedup
+    )
+
+    return imported, speedup
@@ -0,0 +1,249 @@
+"""All helpers for the type inference."""
+
+import json
+
+from collections import OrderedDict
+
+from osgeo import ogr
+
+from six import string_types
+
+from .type_helpers import VALUE_TYPES, WKT_REGEX, classify
+
+
+TEXT_TYPES = frozenset(['TextField', 'LookupField'])
+
+
+def parse_geometry(value, stats=None):
+    """
+    Parse WKT (or EWKT) geometry.
+
+    Values that do not look like WKT are rejected before reaching OGR. EWKT
+    is accepted only in WGS 84 (SRID 4326), as geometries are not
+    transformed.
+
+    Parameters
+    ----------
+    value : str
+        Value to parse.
+    stats : geokey_dataimports.helpers.stats_helpers.PipelineStats
+        Stats of the pipeline, values parsed by OGR are timed and counted as
+        the `ogr` stage.
+
+    Returns
+    -------
+    dict
+        GeoJSON geometry, `None` if the value is not a valid geometry.
+    """
+    if not isinstance(value, string_types):
+        return None
+
+    match = WKT_REGEX.match(value)
+    if match is None or match.group('srid') not in (None, '4326'):
+        return None
+
+    if stats is not None:
+        stats.enter('ogr')
+        stats.count('ogr')
+
+    try:
+        geometry = ogr.CreateGeometryFromWkt(str(match.group('wkt')))
+        return json.loads(geometry.ExportToJson())
+    except:
+        return None
+    finally:
+        if stats is not None:
+            stats.exit()
+
+
+class Column(object):
+    """
+    Inference state of a single column.
+
+    Each type the column could have is a candidate until a value rules it
+    out, ruled out types are never tested again. A candidate becomes one of
+    the column types once at least one value confirms it.
+    """
+
+    __slots__ = ('name', 'candidates', 'confirmed')
+
+    def __init__(self, name):
+        """Initialise the column."""
+        self.name = name
+        self.candidates = set(VALUE_TYPES)
+        self.candidates.add('GeometryField')
+        self.confirmed = set()
+
+    def test(self, fieldtypes, passed):
+        """Confirm the types when the test passed, rule them out otherwise."""
+        if passed:
+            self.confirmed.update(fieldtypes)
+        else:
+            self.candidates.difference_update(fieldtypes)
+
+    def observe(self, value, detect_geometry=False, stats=None):
+        """
+        Update the state with a single value.
+
+        Parameters
+        ----------
+        value : obj
+            Value of the column.
+        detect_geometry : boolean
+            Whether the value can hold a WKT geometry.
+        stats : geokey_dataimports.helpers.stats_helpers.PipelineStats
+            Stats of the pipeline, to time parsing geometries.
+
+        Returns
+        -------
+        dict
+            GeoJSON geometry held by the value, `None` if there is none.
+        """
+        candidates = self.candidates
+
+        if detect_geometry and 'GeometryField' in candidates:
+            geometry = parse_geometry(value, stats)
+            self.test(['GeometryField'], geometry is not None)
+
+            if geometry is not None:
+                return geometry
+
+        tested = candidates & VALUE_TYPES
+        if tested:
+            passed = classify(value, tested)
+            self.confirmed.update(passed)
+            candidates.difference_update(tested - passed)
+
+        return None
+
+    @property
+    def is_geometry(self):
+        """Whether the column has held only valid geometries."""
+        return (
+            'GeometryField' in self.candidates and
+            'GeometryField' in self.confirmed
+        )
+
+    @property
+    def types(self):
+        """All types the column can have."""
+        return TEXT_TYPES.union(self.candidates & self.confirmed)
+
+
+class TypeInference(object):
+    """
+    Column-oriented inference of field types.
+
+    Columns are kept by name, so each value is matched to its column in
+    constant time and inference is linear in the number of values.
+    """
+
+    def __init__(self, stats=None):
+        """
+        Initialise the inference.
+
+        Parameters
+        ----------
+        stats : geokey_dataimports.helpers.stats_helpers.PipelineStats
+            Stats of the pipeline, geometries parsed by OGR are timed apart
+            from the rest of the inference when given.
+        """
+        self.columns = OrderedDict()
+        self.geometryfield = None
+        self.stats = stats
+
+    def get_column(self, name):
+        """Get the column with the name, add it when it does not exist."""
+        column = self.columns.get(name)
+
+        if column is None:
+            column = self.columns[name] = Column(name)
+
+        return column
+
+    def add_columns(self, names):
+        """Add columns in the order they appear in a file."""
+        for name in names:
+            self.get_column(name)
+
+    def observe(self, properties, detect_geometry=False):
+        """
+        Update the state with properties of a single feature.
+
+        Parameters
+        ----------
+        properties : dict
+            Properties of the feature.
+        detect_geometry : boolean
+            Whether the properties can hold WKT geometries.
+
+        Returns
+        -------
+        dict
+            GeoJSON geometries found, by column name.
+        """
+        geometries = {}
+
+        for name, value in properties.items():
+            column = self.get_column(name)
+            was_geometry = column.is_geometry
+            geometry = column.observe(value, detect_geometry, self.stats)
+
+            if geometry is not None:
+                geometries[name] = geometry
+
+            if column.is_geometry != was_geometry:
+                self.geometryfield = self.find_geometryfield()
+
+        return geometries
+
+    def validate(self, properties):
+        """
+        Find properties that contradict the types of their columns.
+
+        Types are not updated, geometry columns are not checked.
+
+        Parameters
+        ----------
+        properties : dict
+            Properties of the feature.
+
+        Returns
+        -------
+        list
+            Names of properties with values that do not fit all types of
+            their columns.
+        """
+        conflicts = []
+
+        for name, value in properties.items():
+            tested = self.get_column(name).types & VALUE_TYPES
+
+            if tested and classify(value, tested) != tested:
+                conflicts.append(name)
+
+        return conflicts
+
+    def find_geometryfield(self):
+        """Find the first column that has held only valid geometries."""
+        for column in self.columns.values():
+            if column.is_geometry:
+                return column.name
+
+        return None
+
+    def get_datafields(self):
+        """
+        Get all columns that become data fields.
+
+        Returns
+        -------
+        list
+            Tuples of column name and its types, except columns with no name
+            or with geometries.
+        """
+        return [
+            (column.name, list(column.types))
+            for column in self.columns.values()
+            if column.name and not column.is_geometry
+        ]
@@ -0,0 +1,185 @@
+"""All helpers for showing data features on a map."""
+
+
+# Half the width of the world in Web Mercator (EPSG:3857), in metres
+WEB_MERCATOR_EXTENT = 20037508.342789244
+MAX_ZOOM = 24
+
+
+def get_tile_bounds(zoom, x, y):
+    """
+    Get bounds of a map tile in Web Mercator.
+
+    Parameters
+    ----------
+    zoom : int
+        Zoom level of the tile.
+    x : int
+        Column of the tile, from the west.
+    y : int
+        Row of the tile, from the north.
+
+    Returns
+    -------
+    tuple
+        Minimum X, minimum Y, maximum X and maximum Y, in metres.
+
+    Raises
+    ------
+    ValueError
+        When the tile does not exist.
+    """
+    zoom, x, y = int(zoom), int(x), int(y)
+    count = 2 ** zoom if 0 <= zoom <= MAX_ZOOM else 0
+
+    if not (0 <= x < count and 0 <= y < count):
+        raise ValueError('Tile %s/%s/%s does not exist.' % (zoom, x, y))
+
+    size = 2 * WEB_MERCATOR_EXTENT / count
+    xmin = -WEB_MERCATOR_EXTENT + x * size
+    ymax = WEB_MERCATOR_EXTENT - y * size
+
+    return (xmin, ymax - size, xmin + size, ymax)
+
+
+def parse_imported(value):
+    """
+    Parse the filter of data features by whether they are imported.
+
+    Parameters
+    ----------
+    value : str
+        `true` or `false`, empty when data features are not filtered.
+
+    Returns
+    -------
+    boolean
+        Whether data features must be imported, `None` for all of them.
+
+    Raises
+    ------
+    ValueError
+        When the value is not valid.
+    """
+    if not value:
+        return None
+
+    value = value.lower()
+    if value not in ('true', 'false'):
+        raise ValueError('Imported must be either true or false.')
+
+    return value == 'true'
+
+
+def parse_bbox(value):
+    """
+    Parse a bounding box.
+
+    Parameters
+    ----------
+    value : str
+        Minimum longitude, minimum latitude, maximum longitude and maximum
+        latitude, separated with commas. Empty for anywhere.
+
+    Returns
+    -------
+    tuple
+        Minimum longitude, minimum latitude, maximum longitude and maximum
+        latitude, `None` for anywhere.
+
+    Raises
+    ------
+    ValueError
+        When the bounding box is not valid.
+    """
+    if not value:
+        return None
+
+    bbox = tuple(float(coordinate) for coordinate in value.split(','))
+
+    if (len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3] or
+            bbox[0] < -180 or bbox[2] > 180 or
+            bbox[1] < -90 or bbox[3] > 90):
+        raise ValueError('Bounding box must be minimum longitude, minimum '
+                         'latitude, maximum longitude and maximum latitude.')
+
+    return bbox
+
+
+def parse_page(page, page_size, max_page_size):
+    """
+    Parse the page of results requested.
+
+    Parameters
+    ----------
+    page : str
+        Number of the page, starting with 1. Empty for the first one.
+    page_size : str
+        Number of results on a page. Empty for the maximum.
+    max_page_size : int
+        Maximum number of results on a page.
+
+    Returns
+    -------
+    tuple
+        Number of the page and number of results on a page.
+
+    Raises
+    ------
+    ValueError
+        When the page or the page size is not valid.
+    """
+    page = int(page) if page else 1
+    page_size = int(page_size) if page_size else max_page_size
+
+    if page < 1 or not 1 <= page_size <= max_page_size:
+        raise ValueError('Page must be positive, page size must be between '
+                         '1 and %s.' % max_page_size)
+
+    return page, page_size
+
+
+def parse_zoom(value):
+    """
+    Parse a zoom level.
+
+    Parameters
+    ----------
+    value : str
+        Zoom level, from 0 (whole world) to `MAX_ZOOM`.
+
+    Returns
+    -------
+    int
+        Zoom level.
+
+    Raises
+    ------
+    ValueError
+        When the zoom level is not valid.
+    """
+    zoom = int(value) if value else -1
+
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValueError('Zoom must be between 0 and %s.' % MAX_ZOOM)
+
+    return zoom
+
+
+def get_grid_size(zoom, cluster_size=64):
+    """
+    Get the size of grid cells data features are clustered in.
+
+    Parameters
+    ----------
+    zoom : int
+        Zoom level of the map.
+    cluster_size : int
+        Size of a cell on the map, in pixels (tiles are 256 pixels wide).
+
+    Returns
+    -------
+    float
+        Size of a cell, in degrees.
+    """
+    return 360.0 / 2 ** zoom * cluster_size / 256
@@ -36,17 +36,51 @@ class UnicodeReader:
         return self
 
 
-def import_from_csv(features, fields, file_obj):
+def iter_csv_features(fields, file_obj):
+    """
+    Iterate over rows of a CSV file.
+
+    Field names are read from the header straight away and added to the
+    fields, after that rows are read lazily one by one.
+
+    Parameters
+    ----------
+    fields : list
+        Names of fields found in the header get appended to it.
+    file_obj : file
+        CSV file.
+
+    Returns
+    -------
+    generator
+        Yields each row as a feature with its line and properties.
+    """
     if PY3:
         reader = csv.reader(file_obj)
     else:
         reader = UnicodeReader(file_obj)
     for fieldname in next(reader, None):
-        fields.append({
-            'name': strip_tags(fieldname),
-            'good_types': {'TextField', 'LookupField'},
-            'bad_types': set([])
-        })
+        fields.append(strip_tags(fieldname))
+
+    return iter_csv_rows(fields, reader)
+
+
+def iter_csv_rows(fields, reader):
+    """
+    Iterate over rows read by a CSV reader.
+
+    Parameters
+    ----------
+    fields : list
+        Names of fields, in the order of columns.
+    reader : csv.reader
+        Reader of a CSV file, header already read.
+
+    Returns
+    -------
+    generator
+        Yields each row as a feature with its line and properties.
+    """
     line = 0
     for row in reader:
         line += 1
@@ -54,10 +88,10 @@ def import_from_csv(features, fields, file_obj):
 
         for i, column in enumerate(row):
             if column:
-                field = fields[i]
-                properties[field['name']] = column
-
-        features.append({'line': line, 'properties': properties})
+                properties[fields[i]] = column
 
+        yield {'line': line, 'properties': properties}
 
 
+def import_from_csv(features, fields, file_obj):
+    features.extend(iter_csv_features(fields=fields, file_obj=file_obj))
@@ -0,0 +1,225 @@
+"""All helpers for the file processing pipeline."""
+
+import random
+
+from itertools import islice
+
+from .inference_helpers import parse_geometry
+
+
+def infer_types(features, inference):
+    """
+    Infer types of fields from the features passing through.
+
+    Features with no geometry of their own (CSV rows) get all geometries
+    found in their properties attached as `geometries`.
+
+    Parameters
+    ----------
+    features : iterable
+        Features to process.
+    inference : geokey_dataimports.helpers.inference_helpers.TypeInference
+        Inference of field types, updated as features pass through.
+
+    Returns
+    -------
+    generator
+        Yields each feature.
+    """
+    for feature in features:
+        detect_geometry = 'geometry' not in feature
+        geometries = inference.observe(feature['properties'], detect_geometry)
+
+        if detect_geometry:
+            feature['geometries'] = geometries
+
+        yield feature
+
+
+def reservoir_sample(items, size, seed=None):
+    """
+    Pick a uniform random sample of items in a single pass.
+
+    Uses reservoir sampling, so the number of items does not have to be known
+    in advance and only the sample is held in memory.
+
+    Parameters
+    ----------
+    items : iterable
+        Items to sample, consumed lazily.
+    size : int
+        Maximum number of items in the sample.
+    seed : int
+        Seed for the random generator, for repeatable samples.
+
+    Returns
+    -------
+    list
+        Sampled items, all of them when there are not more than the size.
+    """
+    generator = random.Random(seed)
+    sample = []
+
+    for index, item in enumerate(items):
+        if index < size:
+            sample.append(item)
+        else:
+            position = int(generator.random() * (index + 1))
+
+            if position < size:
+                sample[position] = item
+
+    return sample
+
+
+def attach_geometries(features, inference):
+    """
+    Attach geometries of the geometry field already inferred.
+
+    Features with no geometry of their own (CSV rows) get the geometry of
+    the geometry field attached as `geometries`, other fields are not
+    parsed.
+
+    Parameters
+    ----------
+    features : iterable
+        Features to process.
+    inference : geokey_dataimports.helpers.inference_helpers.TypeInference
+        Inference of field types.
+
+    Returns
+    -------
+    generator
+        Yields each feature.
+    """
+    geometryfield = inference.geometryfield
+
+    for feature in features:
+        if 'geometry' not in feature:
+            geometry = parse_geometry(
+                feature['properties'].get(geometryfield),
+                inference.stats
+            )
+            feature['geometries'] = {}
+
+            if geometry is not None:
+                feature['geometries'][geometryfield] = geometry
+
+        yield feature
+
+
+def validate_types(features, inference):
+    """
+    Validate the features passing through against types already inferred.
+
+    Used when types were inferred from a sample of the file. Features get the
+    names of properties that contradict the types of their fields attached
+    as `conflicts`, and geometries attached as by `attach_geometries`. Rows
+    with no valid geometry in the geometry field get it in `conflicts` too.
+
+    Parameters
+    ----------
+    features : iterable
+        Features to process.
+    inference : geokey_dataimports.helpers.inference_helpers.TypeInference
+        Inference of field types.
+
+    Returns
+    -------
+    generator
+        Yields each feature.
+    """
+    geometryfield = inference.geometryfield
+
+    for feature in attach_geometries(features, inference):
+        conflicts = inference.validate(feature['properties'])
+
+        if geometryfield is not None and feature.get('geometries') == {}:
+            conflicts.append(geometryfield)
+
+        feature['conflicts'] = conflicts
+        yield feature
+
+
+def extract_geometries(features, inference, errors):
+    """
+    Extract the geometry of each feature.
+
+    Features with no geometry of their own take it from the geometry field,
+    rows flagged with it by `validate_types` are kept without a geometry.
+    Rows are not kept in memory, so the geometry field can change while types
+    are still being inferred: features must have been inferred beforehand
+    for all of them to take the same field, only errors are final otherwise.
+
+    Parameters
+    ----------
+    features : iterable
+        Features to process, as yielded by `infer_types`, `validate_types` or
+        `attach_geometries`.
+    inference : geokey_dataimports.helpers.inference_helpers.TypeInference
+        Inference of field types.
+    errors : list
+        Errors found in the file, updated as features pass through.
+
+    Returns
+    -------
+    generator
+        Yields a tuple of geometry, properties and conflicts (`None` when
+        types were not validated) for each feature that has a geometry or is
+        flagged for not having one.
+    """
+    from_properties = False
+
+    for feature in features:
+        conflicts = feature.get('conflicts')
+
+        if 'geometry' in feature:
+            geometry = feature['geometry']
+        elif conflicts and inference.geometryfield in conflicts:
+            from_properties = True
+            yield None, feature['properties'], conflicts
+            continue
+        elif len(feature['geometries']) == 0:
+            errors.append({
+                'line': feature['line'],
+                'messages': ['The entry has no geometry set.']
+            })
+            continue
+        else:
+            from_properties = True
+            geometry = feature['geometries'].get(inference.geometryfield)
+
+        if geometry:
+            yield geometry, feature['properties'], conflicts
+
+    if from_properties and inference.geometryfield is None:
+        errors.append({
+            'messages': ['The file has no valid geometry field.']
+        })
+
+
+def iter_batches(items, size):
+    """
+    Split items into batches.
+
+    Parameters
+    ----------
+    items : iterable
+        Items to split, consumed lazily.
+    size : int
+        Maximum number of items in a batch.
+
+    Returns
+    -------
+    generator
+        Yields each batch as a list.
+    """
+    items = iter(items)
+
+    while True:
+        batch = list(islice(items, size))
+
+        if not batch:
+            break
+
+        yield batch
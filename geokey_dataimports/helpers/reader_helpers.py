@@ -0,0 +1,444 @@
+"""All helpers for the file readers."""
+
+import json
+
+try:
+    import xml.etree.cElementTree as ElementTree
+except ImportError:
+    import xml.etree.ElementTree as ElementTree
+
+from six import unichr
+from six.moves.html_entities import name2codepoint
+from six.moves.html_parser import HTMLParser
+
+
+WHITESPACE = ' \t\n\r'
+
+
+class StreamingJSONReader(object):
+    """
+    Incremental reader of a single JSON document.
+
+    It keeps only a small buffer of the file in memory and decodes values
+    from it one by one, so that large documents never get loaded at once.
+    A single value is never buffered beyond `max_size` characters.
+    """
+
+    def __init__(self, file_obj, chunk_size=65536, max_size=67108864):
+        """Initialise the reader."""
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self, size=None):
+        """Read the next chunk of the file into the buffer."""
+        if self.eof:
+            return False
+
+        chunk = self.file_obj.read(size or self.chunk_size)
+
+        if isinstance(chunk, bytes) and not isinstance(chunk, str):
+            chunk = chunk.decode('utf-8')
+
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character (or None at EOF)."""
+        while True:
+            while (self.position < len(self.buffer) and
+                    self.buffer[self.position] in WHITESPACE):
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.fill():
+                return None
+
+    def expect(self, characters):
+        """Consume the next character, which must be one of the given."""
+        character = self.peek()
+
+        if character is None or character not in characters:
+            raise ValueError(
+                'Expecting one of "%s" at position %s.' % (
+                    characters,
+                    self.position
+                )
+            )
+
+        self.position += 1
+        return character
+
+    def decode(self):
+        """
+        Decode the next JSON value from the file.
+
+        A value is only accepted when it is followed by at least one more
+        character (or the end of file), so that numbers and literals cut in
+        half by the chunk boundary never get decoded too early.
+
+        Raises
+        ------
+        ValueError
+            When the value is malformed, or does not fit `max_size`
+            characters.
+        """
+        self.peek()
+        size = self.chunk_size
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer,
+                    self.position
+                )
+
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+
+            if len(self.buffer) - self.position >= self.max_size:
+                raise ValueError(
+                    'Value is malformed or does not fit %s characters.' %
+                    self.max_size
+                )
+
+            # Grow the reads while a single value does not fit the buffer, so
+            # that very large values do not get decoded over and over again.
+            self.fill(min(
+                size,
+                self.max_size - len(self.buffer) + self.position
+            ))
+            size *= 2
+
+
+def iter_geojson_features(file_obj, chunk_size=65536, max_size=67108864):
+    """
+    Iterate over features of a GeoJSON FeatureCollection.
+
+    Features are decoded one at a time straight from the file, so memory use
+    does not depend on the size of the collection.
+
+    Parameters
+    ----------
+    file_obj : file
+        GeoJSON file.
+    chunk_size : int
+        Number of characters read from the file at once.
+    max_size : int
+        Maximum number of characters of a single feature (or any other value
+        of the collection).
+
+    Returns
+    -------
+    generator
+        Yields each feature as a dict.
+
+    Raises
+    ------
+    ValueError
+        When the file is not a JSON object, or a value is malformed or too
+        long.
+    KeyError
+        When the object has no `features`.
+    """
+    reader = StreamingJSONReader(
+        file_obj,
+        chunk_size=chunk_size,
+        max_size=max_size
+    )
+    reader.expect('{')
+    found = False
+
+    if reader.peek() == '}':
+        raise KeyError('features')
+
+    while True:
+        key = reader.decode()
+        reader.expect(':')
+
+        if key == 'features':
+            found = True
+            reader.expect('[')
+
+            if reader.peek() == ']':
+                reader.position += 1
+            else:
+                while True:
+                    yield reader.decode()
+
+                    if reader.expect(',]') == ']':
+                        break
+        else:
+            reader.decode()
+
+        if reader.expect(',}') == '}':
+            break
+
+    if not found:
+        raise KeyError('features')
+
+
+def get_local_name(tag):
+    """Get the name of an XML tag without its namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def read_coordinates(element):
+    """
+    Read coordinates of a KML geometry.
+
+    Altitudes are dropped, as geometries are stored in two dimensions.
+
+    Parameters
+    ----------
+    element : xml.etree.ElementTree.Element
+        Element with `coordinates` as its child.
+
+    Returns
+    -------
+    list
+        Positions (longitude and latitude).
+    """
+    for child in element:
+        if get_local_name(child.tag) == 'coordinates':
+            return [
+                [float(value) for value in position.split(',')[:2]]
+                for position in (child.text or '').split()
+            ]
+
+    return []
+
+
+def read_polygon(element):
+    """Read coordinates of a KML polygon, outer ring first."""
+    outer = []
+    inner = []
+
+    for boundary in element:
+        rings = inner
+        if get_local_name(boundary.tag) == 'outerBoundaryIs':
+            rings = outer
+
+        for ring in boundary:
+            if get_local_name(ring.tag) == 'LinearRing':
+                rings.append(read_coordinates(ring))
+
+    return outer + inner
+
+
+def read_geometry(element):
+    """
+    Read a KML geometry.
+
+    Parameters
+    ----------
+    element : xml.etree.ElementTree.Element
+        Geometry element.
+
+    Returns
+    -------
+    dict
+        GeoJSON geometry, `None` if the element is not a supported geometry.
+    """
+    name = get_local_name(element.tag)
+
+    if name == 'Point':
+        coordinates = read_coordinates(element)
+        if coordinates:
+            return {'type': 'Point', 'coordinates': coordinates[0]}
+    elif name in ('LineString', 'LinearRing'):
+        return {'type': 'LineString', 'coordinates': read_coordinates(element)}
+    elif name == 'Polygon':
+        return {'type': 'Polygon', 'coordinates': read_polygon(element)}
+    elif name == 'MultiGeometry':
+        geometries = [
+            geometry for geometry in map(read_geometry, element)
+            if geometry is not None
+        ]
+        types = set(geometry['type'] for geometry in geometries)
+
+        if len(types) == 1 and 'GeometryCollection' not in types:
+            return {
+                'type': 'Multi' + types.pop(),
+                'coordinates': [
+                    geometry['coordinates'] for geometry in geometries
+                ]
+            }
+
+        return {'type': 'GeometryCollection', 'geometries': geometries}
+
+    return None
+
+
+def read_placemark(element):
+    """
+    Read a KML placemark.
+
+    Attributes are read from `ExtendedData` (both `Data` and `SchemaData`)
+    and from the table in the description, if it has one.
+
+    Parameters
+    ----------
+    element : xml.etree.ElementTree.Element
+        Placemark element.
+
+    Returns
+    -------
+    dict
+        Feature, its geometry `None` if the placemark has no geometry.
+    """
+    geometry = None
+    properties = {}
+
+    for child in element:
+        name = get_local_name(child.tag)
+
+        if name == 'description':
+            description = child.text or ''
+            if '<table' in description.lower():
+                for datum in table_to_json(description):
+                    properties.update(datum)
+        elif name == 'ExtendedData':
+            for data in child.iter():
+                tag = get_local_name(data.tag)
+
+                if tag == 'Data':
+                    for value in data:
+                        if get_local_name(value.tag) == 'value':
+                            properties[data.get('name')] = value.text or ''
+                elif tag == 'SimpleData':
+                    properties[data.get('name')] = data.text or ''
+        elif geometry is None:
+            geometry = read_geometry(child)
+
+    return {'type': 'Feature', 'geometry': geometry, 'properties': properties}
+
+
+def iter_kml_features(path):
+    """
+    Iterate over features of a KML file.
+
+    The file is parsed incrementally and each placemark is dropped from the
+    tree once it has been read, so memory use does not depend on the number
+    of placemarks.
+
+    Parameters
+    ----------
+    path : str
+        Path to the KML file.
+
+    Returns
+    -------
+    generator
+        Yields each feature as a dict.
+    """
+    parents = []
+    placemarks = 0
+
+    for event, element in ElementTree.iterparse(path, ('start', 'end')):
+        is_placemark = get_local_name(element.tag) == 'Placemark'
+
+        if event == 'start':
+            parents.append(element)
+            placemarks += is_placemark
+            continue
+
+        parents.pop()
+
+        if is_placemark:
+            placemarks -= 1
+            yield read_placemark(element)
+
+        # Everything outside of placemarks gets dropped once it is read.
+        if parents and not placemarks:
+            parents[-1].remove(element)
+
+
+class TableParser(HTMLParser):
+    """Collect text of cells in the rows of the first HTML table."""
+
+    def __init__(self):
+        """Initialise the parser."""
+        HTMLParser.__init__(self)
+        self.rows = []
+        self.depth = 0
+        self.cell = None
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        """Start a row or a cell of the table."""
+        if self.done:
+            return
+
+        if tag == 'table':
+            self.depth += 1
+        elif self.depth == 1 and tag == 'tr':
+            self.rows.append([])
+        elif self.depth == 1 and tag == 'td' and self.rows:
+            self.cell = []
+
+    def handle_endtag(self, tag):
+        """End a cell or the table, ignoring any tables after it."""
+        if self.done:
+            return
+
+        if tag == 'table':
+            self.depth -= 1
+            self.done = not self.depth
+        elif self.depth == 1 and tag == 'td' and self.cell is not None:
+            self.rows[-1].append(''.join(self.cell))
+            self.cell = None
+
+    def handle_data(self, data):
+        """Add text to the current cell."""
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def handle_entityref(self, name):
+        """Add a named character reference to the current cell."""
+        if name in name2codepoint:
+            self.handle_data(unichr(name2codepoint[name]))
+
+    def handle_charref(self, name):
+        """Add a numeric character reference to the current cell."""
+        if name[0] in 'xX':
+            self.handle_data(unichr(int(name[1:], 16)))
+        else:
+            self.handle_data(unichr(int(name)))
+
+
+def table_to_json(table):
+    """
+    Read values from an HTML table with field names in the first column.
+
+    Parameters
+    ----------
+    table : str
+        HTML with a table.
+
+    Returns
+    -------
+    list
+        Values of the first table by field name, empty when it has no rows.
+    """
+    parser = TableParser()
+    parser.feed(table)
+    parser.close()
+
+    datum = dict(row[:2] for row in parser.rows if len(row) >= 2)
+    return [datum] if datum else []
@@ -0,0 +1,145 @@
+"""All helpers for selections of data features."""
+
+import json
+
+from six import integer_types
+
+
+def get_ranges(ids):
+    """
+    Collapse IDs into ranges of consecutive IDs.
+
+    Parameters
+    ----------
+    ids : iterable
+        IDs to collapse, in any order.
+
+    Returns
+    -------
+    list
+        Ranges as pairs of the first and the last ID, in order.
+    """
+    ranges = []
+
+    for value in sorted(set(ids)):
+        if ranges and ranges[-1][1] == value - 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+
+    return ranges
+
+
+def is_id(value):
+    """Check if the value can be an ID."""
+    return isinstance(value, integer_types) and not isinstance(value, bool)
+
+
+def parse_selection(value):
+    """
+    Parse a selection of data features.
+
+    A selection is JSON, either of all data features except some
+    (`{"exclude": [3, 9]}`), or of ranges of IDs, both ends included
+    (`{"ranges": [[1, 2], [4, 8]]}`). A plain list of IDs is accepted too,
+    and collapsed into ranges.
+
+    Parameters
+    ----------
+    value : str
+        Selection to parse, empty when nothing is selected.
+
+    Returns
+    -------
+    dict
+        Selection, with either `exclude` or `ranges`.
+
+    Raises
+    ------
+    ValueError
+        When the selection is not valid.
+    """
+    if not value:
+        return {'ranges': []}
+
+    selection = json.loads(value)
+
+    if isinstance(selection, list):
+        if not all(is_id(item) for item in selection):
+            raise ValueError('IDs must be integers.')
+
+        return {'ranges': get_ranges(selection)}
+
+    if isinstance(selection, dict) and list(selection.keys()) == ['exclude']:
+        exclude = selection['exclude']
+
+        if (not isinstance(exclude, list) or
+                not all(is_id(item) for item in exclude)):
+            raise ValueError('IDs must be integers.')
+
+        return {'exclude': sorted(set(exclude))}
+
+    if isinstance(selection, dict) and list(selection.keys()) == ['ranges']:
+        ranges = selection['ranges']
+
+        if (not isinstance(ranges, list) or not all(
+                isinstance(item, list) and len(item) == 2 and
+                is_id(item[0]) and is_id(item[1]) and item[0] <= item[1]
+                for item in ranges)):
+            raise ValueError('Ranges must be pairs of integers.')
+
+        return {'ranges': ranges}
+
+    raise ValueError('Selection must have either exclude or ranges.')
+
+
+def filter_selection(queryset, selection):
+    """
+    Filter data features by a selection.
+
+    IDs are passed to the database as arrays: ranges are matched with a
+    semi-join on the ranges unnested, excluded IDs with an anti-join. Neither
+    needs an `IN` list as long as the selection.
+
+    Parameters
+    ----------
+    queryset : django.db.models.query.QuerySet
+        Data features to filter.
+    selection : dict
+        Selection, as returned by `parse_selection`.
+
+    Returns
+    -------
+    django.db.models.query.QuerySet
+        Data features selected.
+    """
+    column = '"%s"."id"' % queryset.model._meta.db_table
+
+    if 'exclude' in selection:
+        if not selection['exclude']:
+            return queryset
+
+        return queryset.extra(
+            where=[
+                'NOT EXISTS (SELECT 1 FROM unnest(%%s::integer[]) AS '
+                'excluded(id) WHERE excluded.id = %s)' % column
+            ],
+            params=[selection['exclude']]
+        )
+
+    ranges = selection.get('ranges') or []
+
+    if not ranges:
+        return queryset.none()
+
+    return queryset.extra(
+        where=[
+            'EXISTS (SELECT 1 FROM unnest(%%s::integer[], %%s::integer[]) AS '
+            'selected(low, high) WHERE %s BETWEEN selected.low AND '
+            'selected.high)' % column
+        ],
+        params=[
+            [low for low, high in ranges],
+            [high for low, high in ranges]
+        ]
+    )
@@ -0,0 +1,114 @@
+"""All helpers for measuring stages of the pipeline."""
+
+from contextlib import contextmanager
+from timeit import default_timer
+
+
+class PipelineStats(object):
+    """
+    Time and rows of each stage of a pipeline of generators.
+
+    Stages pull from each other, so time is exclusive: while a stage waits
+    for the stage before it, the clock runs for that stage instead.
+    """
+
+    def __init__(self):
+        """Start the clock."""
+        self.names = []
+        self.seconds = {}
+        self.rows = {}
+        self.running = []
+        self.started = default_timer()
+        self.resumed = self.started
+
+    def add(self, name):
+        """Add the stage, unless it has been added already."""
+        if name not in self.seconds:
+            self.names.append(name)
+            self.seconds[name] = 0.0
+            self.rows[name] = 0
+
+    def enter(self, name):
+        """Pause the stage running, and run another one."""
+        now = default_timer()
+        self.add(name)
+
+        if self.running:
+            self.seconds[self.running[-1]] += now - self.resumed
+
+        self.running.append(name)
+        self.resumed = now
+
+    def exit(self):
+        """Pause the stage running, and run the one it was called by."""
+        now = default_timer()
+        self.seconds[self.running.pop()] += now - self.resumed
+        self.resumed = now
+
+    @contextmanager
+    def stage(self, name):
+        """Time everything within as the stage."""
+        self.enter(name)
+
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def count(self, name, rows=1):
+        """Count rows of the stage."""
+        self.add(name)
+        self.rows[name] += rows
+
+    def timed(self, items, name):
+        """
+        Time getting each item as the stage, counting the items.
+
+        Parameters
+        ----------
+        items : iterable
+            Items produced by the stage.
+        name : str
+            Name of the stage.
+
+        Returns
+        -------
+        generator
+            Yields each item.
+        """
+        iterator = iter(items)
+
+        while True:
+            self.enter(name)
+
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.exit()
+
+            self.rows[name] += 1
+            yield item
+
+    def to_dict(self):
+        """
+        Get the stats, in order of the stages.
+
+        Returns
+        -------
+        dict
+            Seconds since the clock started, and name, seconds and rows of
+            each stage.
+        """
+        return {
+            'seconds': round(default_timer() - self.started, 6),
+            'stages': [
+                {
+                    'name': name,
+                    'seconds': round(self.seconds[name], 6),
+                    'rows': self.rows[name]
+                }
+                for name in self.names
+            ]
+        }
@@ -1,11 +1,43 @@
 """All helpers for the type."""
 
+import re
 import time
 
+from six import string_types
+
 from iso8601 import parse_date
 from iso8601.iso8601 import ParseError
 
 
+# Same as `int()` would accept (no dot) and `float()` would accept (with dot)
+INTEGER_REGEX = re.compile(r'^\s*[+-]?\d(_?\d)*\s*$', re.UNICODE)
+DECIMAL_REGEX = re.compile(
+    r'^\s*[+-]?(\d(_?\d)*\.(\d(_?\d)*)?|\.\d(_?\d)*)([eE][+-]?\d(_?\d)*)?\s*$',
+    re.UNICODE
+)
+# ISO 8601 dates always start with a year
+DATE_REGEX = re.compile(r'^[0-9]{4}')
+# Same as `time.strptime()` would accept with `%H:%M`
+# (`\Z`, as `$` also matches before a trailing newline)
+TIME_REGEX = re.compile(r'^(2[0-3]|[0-1]\d|\d):([0-5]\d|\d)\Z', re.UNICODE)
+# WKT geometry, optionally with the SRID prefix of EWKT
+WKT_REGEX = re.compile(
+    r'^\s*(SRID=(?P<srid>\d+)\s*;\s*)?'
+    r'(?P<wkt>(POINT|LINESTRING|POLYGON|MULTIPOINT|MULTILINESTRING|'
+    r'MULTIPOLYGON|GEOMETRYCOLLECTION|CIRCULARSTRING|COMPOUNDCURVE|'
+    r'CURVEPOLYGON|MULTICURVE|MULTISURFACE|TRIANGLE|TIN|POLYHEDRALSURFACE)'
+    r'\s*(ZM|Z|M)?\s*(\(.*\)|EMPTY)\s*)$',
+    re.IGNORECASE | re.DOTALL
+)
+
+VALUE_TYPES = frozenset([
+    'NumericField',
+    'DateField',
+    'DateTimeField',
+    'TimeField'
+])
+
+
 def is_numeric(value=''):
     """
     Check if the value is numeric.
@@ -71,3 +103,47 @@ def is_time(value=''):
         return False
 
     return True
+
+
+def classify(value='', fieldtypes=VALUE_TYPES):
+    """
+    Get all types the value can have, in a single pass.
+
+    Precompiled patterns decide most values straight away, only values that
+    look like dates get parsed. Results are the same as with `is_numeric`,
+    `is_date` and `is_time`.
+
+    Parameters
+    ----------
+    value : str
+        Value to check.
+    fieldtypes : set
+        Types to check, others are skipped.
+
+    Returns
+    -------
+    set
+        Types the value can have, out of the types checked.
+    """
+    types = set()
+
+    if 'NumericField' in fieldtypes:
+        if not isinstance(value, str):
+            types.add('NumericField')
+        else:
+            regex = DECIMAL_REGEX if '.' in value else INTEGER_REGEX
+            if regex.match(value) and ('_' not in value or is_numeric(value)):
+                types.add('NumericField')
+
+    if 'DateField' in fieldtypes or 'DateTimeField' in fieldtypes:
+        if (isinstance(value, string_types) and DATE_REGEX.match(value) and
+                is_date(value)):
+            types.update(['DateField', 'DateTimeField'])
+
+    if 'TimeField' in fieldtypes:
+        if not isinstance(value, string_types):
+            value = str(value)
+        if TIME_REGEX.match(value):
+            types.add('TimeField')
+
+    return types & fieldtypes
@@ -0,0 +1,161 @@
+"""Command to benchmark data imports."""
+
+import json
+import platform
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...base import FORMAT
+from ...benchmarks.inserts import benchmark_inserts
+from ...benchmarks.classifier import benchmark_classifier
+from ...benchmarks.generators import GEOMETRY_TYPES
+from ...benchmarks.stages import (
+    SIZES,
+    STAGES,
+    get_revision,
+    benchmark_stages
+)
+
+
+class Command(BaseCommand):
+    """Benchmark parts of data imports."""
+
+    help = (
+        'Benchmark storing data features, classifying values or each stage '
+        'of data imports.'
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments of the command."""
+        parser.add_argument(
+            'benchmark',
+            nargs='?',
+            default='inserts',
+            choices=['inserts', 'classifier', 'stages'],
+            help='Benchmark to run.'
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Number of rows in the generated file.'
+        )
+        parser.add_argument(
+            '--batch-sizes',
+            default='1,1000',
+            help='Comma separated batch sizes to compare.'
+        )
+        parser.add_argument(
+            '--values',
+            type=int,
+            default=1000000,
+            help='Number of values to classify.'
+        )
+        parser.add_argument(
+            '--sizes',
+            default=','.join(str(size) for size in SIZES),
+            help='Comma separated numbers of features in generated files.'
+        )
+        parser.add_argument(
+            '--formats',
+            default=FORMAT.CSV,
+            help='Comma separated formats of generated files (%s).' % (
+                ', '.join(value for value, name in FORMAT)
+            )
+        )
+        parser.add_argument(
+            '--columns',
+            type=int,
+            default=3,
+            help='Number of properties of each feature.'
+        )
+        parser.add_argument(
+            '--geometry-types',
+            default='Point',
+            help='Comma separated geometry types, used in turn (%s).' % (
+                ', '.join(GEOMETRY_TYPES)
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of random values in generated files.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Where to write results of stages as JSON.'
+        )
+
+    def handle(self, *args, **options):
+        """Run the benchmark and print the results."""
+        if options['benchmark'] == 'classifier':
+            self.stdout.write(
+                '%(values)s values: helpers %(helpers).2fs, classifier '
+                '%(classifier).2fs (%(speedup).1fx faster)' %
+                benchmark_classifier(options['values'])
+            )
+            return
+
+        if options['benchmark'] == 'stages':
+            self.handle_stages(options)
+            return
+
+        batch_sizes = [
+            int(batch_size)
+            for batch_size in options['batch_sizes'].split(',')
+        ]
+
+        for result in benchmark_inserts(options['rows'], batch_sizes):
+            self.stdout.write(
+                'Batch size %(batch_size)s: %(rows)s rows in '
+                '%(seconds).2fs (%(rows_per_second).0f rows/s)' % result
+            )
+
+    def handle_stages(self, options):
+        """Benchmark each stage of data imports, writing results as JSON."""
+        dataformats = options['formats'].split(',')
+        geometry_types = options['geometry_types'].split(',')
+
+        for dataformat in dataformats:
+            if dataformat not in FORMAT:
+                raise CommandError('Unknown format: %s.' % dataformat)
+
+        for geometry_type in geometry_types:
+            if geometry_type not in GEOMETRY_TYPES:
+                raise CommandError(
+                    'Unknown geometry type: %s.' % geometry_type
+                )
+
+        results = benchmark_stages(
+            sizes=[int(size) for size in options['sizes'].split(',')],
+            dataformats=dataformats,
+            columns=options['columns'],
+            geometry_types=geometry_types,
+            seed=options['seed']
+        )
+
+        for result in results:
+            self.stdout.write(
+                '%s, %s features: %s' % (
+                    result['dataformat'],
+                    result['features'],
+                    ', '.join(
+                        '%s %.2fs' % (stage, result['seconds'][stage])
+                        for stage in STAGES
+                    )
+                )
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({
+                    'revision': get_revision(),
+                    'created': timezone.now().isoformat(),
+                    'python': platform.python_version(),
+                    'stages': list(STAGES),
+                    'results': results
+                }, file, indent=2, sort_keys=True)
+
+            self.stdout.write('Results written to %s.' % options['output'])
@@ -0,0 +1,71 @@
+"""Command to process data imports in the background."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...models import DataImport, ContributionImport
+
+
+class Command(BaseCommand):
+    """Process pending data imports."""
+
+    help = (
+        'Read files of pending data imports and import pending data '
+        'features as contributions, waiting for new ones.'
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments of the command."""
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when there are no pending data imports left.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Seconds to wait before checking for new data imports.'
+        )
+
+    def handle(self, *args, **options):
+        """Claim pending data imports one by one and process them."""
+        while True:
+            dataimport = DataImport.objects.claim()
+            contributionimport = None
+
+            if dataimport is None:
+                contributionimport = ContributionImport.objects.claim()
+
+            if dataimport:
+                dataimport.process()
+                self.stdout.write(
+                    'Data import %s: %s (%s data features)' % (
+                        dataimport.id,
+                        dataimport.status,
+                        dataimport.progress
+                    )
+                )
+            elif contributionimport:
+                contributionimport.process(parallel=True)
+                self.stdout.write(
+                    'Contribution import %s: %s (%s of %s imported)' % (
+                        contributionimport.id,
+                        contributionimport.status,
+                        contributionimport.imported,
+                        contributionimport.total
+                    )
+                )
+
+                if contributionimport.speedup is not None:
+                    self.stdout.write(
+                        '%s workers, %.2fx speedup' % (
+                            contributionimport.workers,
+                            contributionimport.speedup
+                        )
+                    )
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['sleep'])
@@ -0,0 +1,47 @@
+"""Command to repair counters of data features on data imports."""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Case, When
+
+from ...models import DataImport, DataFeature
+
+
+class Command(BaseCommand):
+    """Repair counters of data features on data imports."""
+
+    help = (
+        'Count data features of all data imports (and the ones imported) '
+        'again, fixing counters that went wrong.'
+    )
+
+    def handle(self, *args, **options):
+        """Count data features of all data imports at once."""
+        counts = dict(
+            (row['dataimport'], (row['total'], row['imported']))
+            for row in DataFeature.objects.values('dataimport').annotate(
+                total=Count('id'),
+                imported=Count(Case(When(imported=True, then=1)))
+            )
+        )
+        repaired = 0
+
+        for dataimport in DataImport.objects.only(
+                'id', 'total_features', 'imported_features'):
+            total, imported = counts.get(dataimport.id, (0, 0))
+
+            if (dataimport.total_features, dataimport.imported_features) != (
+                    total, imported):
+                DataImport.objects.filter(pk=dataimport.pk).update(
+                    total_features=total,
+                    imported_features=imported
+                )
+                repaired += 1
+                self.stdout.write(
+                    'Data import %s: %s out of %s imported' % (
+                        dataimport.id,
+                        imported,
+                        total
+                    )
+                )
+
+        self.stdout.write('%s data import(s) repaired.' % repaired)
@@ -0,0 +1,91 @@
+"""Command to resume interrupted data imports and contribution imports."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from ...models import DataImport, ContributionImport
+
+
+class Command(BaseCommand):
+    """Resume data imports and contribution imports interrupted."""
+
+    help = (
+        'Read files of data imports again, and continue contribution imports '
+        'from the last batch committed, when they stopped storing progress '
+        'while processing (e.g. the worker crashed).'
+    )
+
+    def add_arguments(self, parser):
+        """Add arguments of the command."""
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10,
+            help=(
+                'Minutes without progress after which a data import or a '
+                'contribution import is considered interrupted.'
+            )
+        )
+        parser.add_argument(
+            '--abort',
+            action='store_true',
+            help=(
+                'Finish interrupted data imports as invalid and contribution '
+                'imports as failed instead, keeping contributions already '
+                'imported.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        """Claim interrupted data imports, then contribution imports."""
+        timeout = timedelta(minutes=options['timeout'])
+
+        while True:
+            dataimport = DataImport.objects.claim_interrupted(timeout)
+
+            if dataimport is None:
+                break
+
+            if options['abort']:
+                dataimport.abort()
+            else:
+                dataimport.process()
+
+            self.stdout.write(
+                'Data import %s: %s (%s data features)' % (
+                    dataimport.id,
+                    dataimport.status,
+                    dataimport.progress
+                )
+            )
+
+        while True:
+            contributionimport = ContributionImport.objects.claim_interrupted(
+                timeout
+            )
+
+            if contributionimport is None:
+                break
+
+            if options['abort']:
+                contributionimport.finish(ContributionImport.STATUS.failed)
+            else:
+                contributionimport.process()
+
+            self.stdout.write(
+                'Contribution import %s: %s (%s of %s imported)' % (
+                    contributionimport.id,
+                    contributionimport.status,
+                    contributionimport.imported,
+                    contributionimport.total
+                )
+            )
+
+            if contributionimport.speedup is not None:
+                self.stdout.write(
+                    '%s workers, %.2fx speedup' % (
+                        contributionimport.workers,
+                        contributionimport.speedup
+                    )
+                )
@@ -1,11 +1,80 @@
 """All managers for the extension."""
 
-from django.db import models
+import json
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.utils import timezone
+from django.contrib.gis.geos import GEOSGeometry
 
 from .base import STATUS
+from .helpers.copy_helpers import CopyStream, to_array_literal, to_copy_row
+from .helpers.pipeline_helpers import iter_batches
+
+
+class ClaimMixin(object):
+    """Claim pending or interrupted instances for a background job."""
+
+    def claim(self):
+        """
+        Claim the oldest pending instance for processing.
+
+        Pending instances locked by another worker are skipped, so each
+        instance gets claimed only once.
+
+        Returns
+        -------
+        django.db.models.Model
+            Claimed instance, its status changed to `processing`. `None` if
+            there are no pending instances.
+        """
+        choices = self.model.STATUS
+
+        with transaction.atomic():
+            instance = self.get_queryset().select_for_update(
+                skip_locked=True
+            ).filter(status=choices.pending).order_by('created').first()
+
+            if instance:
+                instance.status = choices.processing
+                instance.save()
+
+        return instance
+
+    def claim_interrupted(self, timeout):
+        """
+        Claim the oldest instance interrupted while processing.
+
+        An instance is interrupted when it has not stored any progress for
+        longer than the timeout. Instances locked by a worker still
+        processing them are skipped. Claiming an instance stores progress
+        again, so each interrupted instance gets claimed only once.
+
+        Parameters
+        ----------
+        timeout : datetime.timedelta
+            Time after the last progress stored.
 
+        Returns
+        -------
+        django.db.models.Model
+            Claimed instance. `None` if there are no interrupted instances.
+        """
+        with transaction.atomic():
+            instance = self.get_queryset().select_for_update(
+                skip_locked=True
+            ).filter(
+                status=self.model.STATUS.processing,
+                modified__lt=timezone.now() - timeout
+            ).order_by('created').first()
+
+            if instance:
+                instance.save()
+
+        return instance
 
-class DataImportManager(models.Manager):
+
+class DataImportManager(ClaimMixin, models.Manager):
     """Manage a single data import."""
 
     def get_queryset(self):
@@ -21,3 +90,499 @@ class DataImportManager(models.Manager):
             DataImportManager,
             self
         ).get_queryset().exclude(status=STATUS.deleted)
+
+
+class ContributionImportManager(ClaimMixin, models.Manager):
+    """Manage imports of data features as contributions."""
+
+
+class DataFeatureManager(models.Manager):
+    """Manage data features."""
+
+    def ingest(self, datafeatures, dataimport, callback=None):
+        """
+        Store new data features of a data import.
+
+        Uses `COPY ... FROM STDIN` when `DATAIMPORTS_INGESTION` is set to
+        `copy` and the database is PostgreSQL, batched inserts otherwise.
+
+        Parameters
+        ----------
+        datafeatures : iterable
+            Tuples of geometry (GeoJSON or `None`), properties and conflicts,
+            consumed lazily.
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        callback : function
+            Called with the number of data features stored so far.
+
+        Returns
+        -------
+        int
+            Number of data features stored.
+        """
+        ingestion = getattr(settings, 'DATAIMPORTS_INGESTION', 'orm')
+
+        if (ingestion == 'copy' and
+                connections[self.db].vendor == 'postgresql'):
+            return self.copy_from(datafeatures, dataimport, callback)
+
+        return self.bulk_insert(datafeatures, dataimport, callback)
+
+    def bulk_insert(self, datafeatures, dataimport, callback=None):
+        """
+        Store new data features with batched inserts.
+
+        Batches hold up to `DATAIMPORTS_BATCH_SIZE` data features.
+
+        Parameters
+        ----------
+        datafeatures : iterable
+            Tuples of geometry (GeoJSON or `None`), properties and conflicts,
+            consumed lazily.
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        callback : function
+            Called with the number of data features stored after each batch.
+
+        Returns
+        -------
+        int
+            Number of data features stored.
+        """
+        batch_size = getattr(settings, 'DATAIMPORTS_BATCH_SIZE', 1000)
+        count = 0
+
+        for batch in iter_batches(datafeatures, batch_size):
+            self.bulk_create([
+                self.model(
+                    geometry=(
+                        json.dumps(geometry) if geometry is not None else None
+                    ),
+                    properties=properties,
+                    conflicts=conflicts or None,
+                    dataimport=dataimport
+                )
+                for geometry, properties, conflicts in batch
+            ])
+            count += len(batch)
+
+            if callback:
+                callback(count)
+
+        return count
+
+    def copy_from(self, datafeatures, dataimport, callback=None):
+        """
+        Store new data features with `COPY ... FROM STDIN`.
+
+        Rows are streamed to the database as they are produced, geometries
+        are sent as EWKB and properties as JSON text.
+
+        Parameters
+        ----------
+        datafeatures : iterable
+            Tuples of geometry (GeoJSON or `None`), properties and conflicts,
+            consumed lazily.
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        callback : function
+            Called with the number of data features stored once COPY is done
+            (the connection cannot be used for anything else while copying).
+
+        Returns
+        -------
+        int
+            Number of data features stored.
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+
+        columns = [
+            opts.get_field(name).column for name in [
+                'created',
+                'modified',
+                'imported',
+                'geometry',
+                'properties',
+                'conflicts',
+                'dataimport'
+            ]
+        ]
+        sql = 'COPY %s (%s) FROM STDIN' % (
+            quote_name(opts.db_table),
+            ', '.join(quote_name(column) for column in columns)
+        )
+
+        now = timezone.now().isoformat()
+        count = [0]
+
+        def rows():
+            for geometry, properties, conflicts in datafeatures:
+                if geometry is not None:
+                    geometry = GEOSGeometry(
+                        json.dumps(geometry),
+                        srid=4326
+                    ).hexewkb.decode('ascii')
+
+                count[0] += 1
+
+                yield to_copy_row([
+                    now,
+                    now,
+                    'f',
+                    geometry,
+                    json.dumps(properties),
+                    to_array_literal(conflicts or None),
+                    str(dataimport.id)
+                ])
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(sql, CopyStream(rows()))
+
+        if callback:
+            callback(count[0])
+
+        return count[0]
+
+    def rename_properties(self, dataimport, keys):
+        """
+        Rename properties of all data features of a data import.
+
+        Every property is renamed with a single `UPDATE`, properties are
+        rebuilt by the database (`jsonb_object_agg`) and only data features
+        that have any of them are written. When a property is renamed to a
+        key that exists already, the renamed value is kept.
+
+        Parameters
+        ----------
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        keys : dict
+            New keys of properties, by their current names.
+
+        Returns
+        -------
+        int
+            Number of data features updated.
+        """
+        keys = dict(
+            (name, key) for name, key in keys.items()
+            if key and key != name
+        )
+
+        if not keys:
+            return 0
+
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+
+        properties_column = quote_name(opts.get_field('properties').column)
+        names = list(keys.keys())
+        sql = (
+            'UPDATE %s SET %s = ('
+            'SELECT jsonb_object_agg(COALESCE(renamed.key, property.key), '
+            'property.value ORDER BY renamed.key IS NOT NULL) '
+            'FROM jsonb_each(%s) AS property '
+            'LEFT JOIN unnest(%%s::text[], %%s::text[]) AS renamed(name, key) '
+            'ON renamed.name = property.key), %s = %%s '
+            'WHERE %s = %%s AND %s ?| %%s::text[]'
+        ) % (
+            quote_name(opts.db_table),
+            properties_column,
+            properties_column,
+            quote_name(opts.get_field('modified').column),
+            quote_name(opts.get_field('dataimport').column),
+            properties_column
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [
+                names,
+                [keys[name] for name in names],
+                timezone.now(),
+                dataimport.id,
+                names
+            ])
+            return cursor.rowcount
+
+    def get_conditions(self, dataimport, imported=None, bbox=None,
+                       srid=4326):
+        """
+        Make SQL conditions to filter data features of a data import.
+
+        Parameters
+        ----------
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        imported : boolean
+            Whether data features must be imported, `None` for all of them.
+        bbox : tuple
+            Minimum X, minimum Y, maximum X and maximum Y data features must
+            intersect, `None` for anywhere.
+        srid : int
+            Spatial reference system of the bounding box.
+
+        Returns
+        -------
+        tuple
+            Conditions joined with `AND`, and their parameters.
+        """
+        quote_name = connections[self.db].ops.quote_name
+        opts = self.model._meta
+
+        conditions = ['%s = %%s' % quote_name(
+            opts.get_field('dataimport').column
+        )]
+        params = [dataimport.id]
+
+        if bbox is not None:
+            envelope = 'ST_MakeEnvelope(%%s, %%s, %%s, %%s, %d)' % srid
+            if srid != 4326:
+                envelope = 'ST_Transform(%s, 4326)' % envelope
+
+            conditions.append('%s::geometry && %s' % (
+                quote_name(opts.get_field('geometry').column),
+                envelope
+            ))
+            params.extend(bbox)
+
+        if imported is not None:
+            conditions.append('%s = %%s' % quote_name(
+                opts.get_field('imported').column
+            ))
+            params.append(imported)
+
+        return ' AND '.join(conditions), params
+
+    def get_tile(self, dataimport, bounds, imported=None):
+        """
+        Render data features of a data import as a Mapbox Vector Tile.
+
+        Geometries are clipped and encoded by PostGIS (`ST_AsMVT`), features
+        carry their ID and whether they are imported as attributes.
+
+        Parameters
+        ----------
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        bounds : tuple
+            Bounds of the tile in Web Mercator: minimum X, minimum Y, maximum
+            X and maximum Y.
+        imported : boolean
+            Whether data features must be imported, `None` for all of them.
+
+        Returns
+        -------
+        bytes
+            Tile with a single `datafeatures` layer, empty when there are no
+            data features within the bounds.
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+
+        conditions, params = self.get_conditions(
+            dataimport,
+            imported=imported,
+            bbox=bounds,
+            srid=3857
+        )
+        sql = (
+            'SELECT ST_AsMVT(tile, \'datafeatures\', 4096, \'geom\') FROM ('
+            'SELECT %s AS id, %s AS imported, ST_AsMVTGeom('
+            'ST_Transform(%s::geometry, 3857), '
+            'ST_MakeEnvelope(%%s, %%s, %%s, %%s, 3857), 4096, 64, true) '
+            'AS geom '
+            'FROM %s WHERE %s) AS tile WHERE geom IS NOT NULL'
+        ) % (
+            quote_name(opts.get_field('id').column),
+            quote_name(opts.get_field('imported').column),
+            quote_name(opts.get_field('geometry').column),
+            quote_name(opts.db_table),
+            conditions
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, list(bounds) + params)
+            tile = cursor.fetchone()[0]
+
+        return bytes(tile) if tile is not None else b''
+
+    def get_extent(self, dataimport, imported=None):
+        """
+        Get the extent of data features of a data import.
+
+        Parameters
+        ----------
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        imported : boolean
+            Whether data features must be imported, `None` for all of them.
+
+        Returns
+        -------
+        list
+            Minimum longitude, minimum latitude, maximum longitude and
+            maximum latitude, `None` when there are no data features.
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+
+        conditions, params = self.get_conditions(
+            dataimport,
+            imported=imported
+        )
+        sql = (
+            'SELECT ST_XMin(extent), ST_YMin(extent), ST_XMax(extent), '
+            'ST_YMax(extent) FROM (SELECT ST_Extent(%s::geometry) AS extent '
+            'FROM %s WHERE %s) AS datafeatures'
+        ) % (
+            quote_name(opts.get_field('geometry').column),
+            quote_name(opts.db_table),
+            conditions
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            extent = cursor.fetchone()
+
+        return list(extent) if extent[0] is not None else None
+
+    def get_geojson(self, dataimport, imported=None, bbox=None, limit=None,
+                    offset=0):
+        """
+        Get data features of a data import as GeoJSON.
+
+        Features are serialised by the database (`ST_AsGeoJSON`), the JSON
+        text is returned as it is.
+
+        Parameters
+        ----------
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        imported : boolean
+            Whether data features must be imported, `None` for all of them.
+        bbox : tuple
+            Minimum longitude, minimum latitude, maximum longitude and
+            maximum latitude data features must intersect, `None` for
+            anywhere.
+        limit : int
+            Maximum number of data features, `None` for all of them.
+        offset : int
+            Number of data features skipped, in order of their IDs.
+
+        Returns
+        -------
+        tuple
+            Number of all data features matching, and JSON array of GeoJSON
+            features (with `imported` next to their properties).
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+
+        id_column, imported_column, geometry_column, properties_column = [
+            quote_name(opts.get_field(name).column)
+            for name in ['id', 'imported', 'geometry', 'properties']
+        ]
+        table = quote_name(opts.db_table)
+        conditions, params = self.get_conditions(
+            dataimport,
+            imported=imported,
+            bbox=bbox
+        )
+
+        count_sql = 'SELECT COUNT(*) FROM %s WHERE %s' % (table, conditions)
+        sql = (
+            'SELECT COALESCE(json_agg(feature ORDER BY id), \'[]\')::text '
+            'FROM (SELECT %s AS id, json_build_object('
+            '\'type\', \'Feature\', \'id\', %s, '
+            '\'geometry\', ST_AsGeoJSON(%s)::json, '
+            '\'properties\', %s, \'imported\', %s) AS feature '
+            'FROM %s WHERE %s ORDER BY %s LIMIT %%s OFFSET %%s) AS features'
+        ) % (
+            id_column,
+            id_column,
+            geometry_column,
+            properties_column,
+            imported_column,
+            table,
+            conditions,
+            id_column
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(count_sql, params)
+            count = cursor.fetchone()[0]
+
+            cursor.execute(sql, params + [limit, offset])
+            features = cursor.fetchone()[0]
+
+        return count, features
+
+    def get_clusters(self, dataimport, size, imported=None, bbox=None):
+        """
+        Cluster data features of a data import in a grid.
+
+        Centroids of data features are snapped to the grid
+        (`ST_SnapToGrid`), and data features in the same cell are counted
+        by the database. Data features without a geometry are left out.
+
+        Parameters
+        ----------
+        dataimport : geokey_dataimports.models.DataImport
+            Data import the data features belong to.
+        size : float
+            Size of grid cells, in degrees.
+        imported : boolean
+            Whether data features must be imported, `None` for all of them.
+        bbox : tuple
+            Minimum longitude, minimum latitude, maximum longitude and
+            maximum latitude data features must intersect, `None` for
+            anywhere.
+
+        Returns
+        -------
+        str
+            JSON array of GeoJSON points, at centroids of the clusters, with
+            the number of data features (and the ID of the data feature, when
+            there is just one) as properties.
+        """
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta
+
+        conditions, params = self.get_conditions(
+            dataimport,
+            imported=imported,
+            bbox=bbox
+        )
+        geometry_column = quote_name(opts.get_field('geometry').column)
+        centroid = 'ST_Centroid(%s::geometry)' % geometry_column
+        sql = (
+            'SELECT COALESCE(json_agg(json_build_object('
+            '\'type\', \'Feature\', '
+            '\'geometry\', ST_AsGeoJSON(centroid)::json, '
+            '\'properties\', json_build_object(\'count\', count, '
+            '\'id\', CASE WHEN count = 1 THEN id END))), \'[]\')::text '
+            'FROM (SELECT COUNT(*) AS count, MIN(%s) AS id, '
+            'ST_Centroid(ST_Collect(%s)) AS centroid FROM %s WHERE %s '
+            'AND %s IS NOT NULL GROUP BY ST_SnapToGrid(%s, %%s)) AS clusters'
+        ) % (
+            quote_name(opts.get_field('id').column),
+            centroid,
+            quote_name(opts.db_table),
+            conditions,
+            geometry_column,
+            centroid
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [size])
+            clusters = cursor.fetchone()[0]
+
+        return clusters
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+import model_utils.fields
+try:
+    from django.contrib.postgres.fields import JSONField
+except ImportError:
+    from django_pgjson.fields import JsonBField as JSONField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0002_auto_20160329_0957'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataimport',
+            name='status',
+            field=model_utils.fields.StatusField(default='active', max_length=100, verbose_name='status', no_check_for_status=True, choices=[('active', 'active'), ('invalid', 'invalid'), ('deleted', 'deleted'), ('pending', 'pending'), ('processing', 'processing')]),
+        ),
+        migrations.AddField(
+            model_name='dataimport',
+            name='progress',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dataimport',
+            name='errors',
+            field=JSONField(null=True, blank=True),
+        ),
+    ]
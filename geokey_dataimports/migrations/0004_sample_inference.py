@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+import django.contrib.postgres.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0003_dataimport_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='inference',
+            field=models.CharField(default='full', max_length=10, choices=[('full', 'full'), ('sample', 'sample')]),
+        ),
+        migrations.AddField(
+            model_name='datafeature',
+            name='conflicts',
+            field=django.contrib.postgres.fields.ArrayField(size=None, null=True, base_field=models.CharField(max_length=100), blank=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+from django.conf import settings
+import django.contrib.postgres.fields
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('geokey_dataimports', '0004_sample_inference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributionImport',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, verbose_name='created', editable=False)),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, verbose_name='modified', editable=False)),
+                ('status', model_utils.fields.StatusField(default='pending', max_length=100, verbose_name='status', no_check_for_status=True, choices=[('pending', 'pending'), ('processing', 'processing'), ('completed', 'completed'), ('failed', 'failed')])),
+                ('status_changed', model_utils.fields.MonitorField(default=django.utils.timezone.now, verbose_name='status changed', monitor='status')),
+                ('ids', django.contrib.postgres.fields.ArrayField(size=None, base_field=models.IntegerField())),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('imported', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('started', models.DateTimeField(null=True, blank=True)),
+                ('finished', models.DateTimeField(null=True, blank=True)),
+                ('creator', models.ForeignKey(to=settings.AUTH_USER_MODEL)),
+                ('dataimport', models.ForeignKey(related_name='contributionimports', to='geokey_dataimports.DataImport')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
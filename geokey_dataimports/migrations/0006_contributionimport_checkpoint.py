@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+try:
+    from django.contrib.postgres.fields import JSONField
+except ImportError:
+    from django_pgjson.fields import JsonBField as JSONField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0005_contributionimport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contributionimport',
+            name='checkpoint',
+            field=models.PositiveIntegerField(null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name='contributionimport',
+            name='post_interactions',
+            field=JSONField(null=True, blank=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0006_contributionimport_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contributionimport',
+            name='workers',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='contributionimport',
+            name='speedup',
+            field=models.FloatField(null=True, blank=True),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import migrations
+try:
+    from django.contrib.postgres.fields import JSONField
+except ImportError:
+    from django_pgjson.fields import JsonBField as JSONField
+
+
+def get_ranges(ids):
+    """
+    Collapse IDs into ranges of consecutive IDs.
+
+    Copied from the selection helpers, so that the migration does not change
+    with them.
+    """
+    ranges = []
+
+    for value in sorted(set(ids)):
+        if ranges and ranges[-1][1] == value - 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+
+    return ranges
+
+
+def ids_to_selection(apps, schema_editor):
+    """Collapse IDs of data features selected into ranges."""
+    ContributionImport = apps.get_model(
+        'geokey_dataimports',
+        'ContributionImport'
+    )
+
+    for contributionimport in ContributionImport.objects.all():
+        contributionimport.selection = {
+            'ranges': get_ranges(contributionimport.ids)
+        }
+        contributionimport.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0007_contributionimport_workers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contributionimport',
+            name='selection',
+            field=JSONField(default=dict),
+        ),
+        migrations.RunPython(ids_to_selection, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='contributionimport',
+            name='ids',
+        ),
+    ]
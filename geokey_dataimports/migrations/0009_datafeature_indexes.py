@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0008_contributionimport_selection'),
+    ]
+
+    operations = [
+        # Geography column has its own GiST index already, map queries
+        # (tiles, bounding boxes, clusters) compare geometries instead
+        migrations.RunSQL(
+            'CREATE INDEX geokey_dataimports_datafeature_geometry_gist '
+            'ON geokey_dataimports_datafeature '
+            'USING GIST ((geometry::geometry));',
+            'DROP INDEX geokey_dataimports_datafeature_geometry_gist;'
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX geokey_dataimports_datafeature_not_imported '
+            'ON geokey_dataimports_datafeature (dataimport_id) '
+            'WHERE imported = false;',
+            'DROP INDEX geokey_dataimports_datafeature_not_imported;'
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX geokey_dataimports_datafeature_dataimport_imported '
+            'ON geokey_dataimports_datafeature (dataimport_id, imported);',
+            'DROP INDEX geokey_dataimports_datafeature_dataimport_imported;'
+        ),
+    ]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import models, migrations
+
+
+def count_datafeatures(apps, schema_editor):
+    """Count data features of existing data imports."""
+    DataImport = apps.get_model('geokey_dataimports', 'DataImport')
+    DataFeature = apps.get_model('geokey_dataimports', 'DataFeature')
+
+    for counts in DataFeature.objects.values('dataimport').annotate(
+            total=models.Count('id'),
+            imported=models.Count(
+                models.Case(models.When(imported=True, then=1))
+            )):
+        DataImport.objects.filter(pk=counts['dataimport']).update(
+            total_features=counts['total'],
+            imported_features=counts['imported']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0009_datafeature_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='total_features',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dataimport',
+            name='imported_features',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_datafeatures, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+
+from django.db import migrations
+
+try:
+    from django.contrib.postgres.fields import JSONField
+except ImportError:
+    from django_pgjson.fields import JsonBField as JSONField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0010_dataimport_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimport',
+            name='stats',
+            field=JSONField(null=True, blank=True),
+        ),
+    ]
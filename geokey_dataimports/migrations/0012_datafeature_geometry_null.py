@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geokey_dataimports', '0011_dataimport_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='datafeature',
+            name='geometry',
+            field=django.contrib.gis.db.models.fields.GeometryField(srid=4326, geography=True, null=True),
+        ),
+    ]
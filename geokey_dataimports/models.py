@@ -1,21 +1,16 @@
 """All models for the extension."""
 
 import sys
-import json
 import csv
-
-from osgeo import ogr
+import logging
 
 from django.conf import settings
 from django.dispatch import receiver
-from django.db import models
-from django.template.defaultfilters import slugify
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.gis.db import models as gis
 
-from bs4 import BeautifulSoup
-
-
 try:
     from django.contrib.postgres.fields import JSONField
 except ImportError:
@@ -23,13 +18,37 @@ except ImportError:
 from model_utils.models import StatusModel, TimeStampedModel
 
 from geokey.projects.models import Project
-from geokey.categories.models import Category, Field
-
-from geokey_dataimports.helpers.model_helpers import import_from_csv
-from .helpers import type_helpers
-from .base import STATUS, FORMAT
+from geokey.categories.models import Category
+from geokey.socialinteractions.models import SocialInteractionPost
+
+from .helpers.model_helpers import iter_csv_features
+from .helpers.field_helpers import assign_fields
+from .helpers.import_helpers import (
+    import_datafeatures,
+    import_datafeatures_parallel
+)
+from .helpers.inference_helpers import TypeInference
+from .helpers.pipeline_helpers import (
+    infer_types,
+    attach_geometries,
+    reservoir_sample,
+    validate_types,
+    extract_geometries
+)
+from .helpers.reader_helpers import iter_geojson_features, iter_kml_features
+from .helpers.selection_helpers import filter_selection
+from .helpers.stats_helpers import PipelineStats
+from .base import STATUS, FORMAT, INFERENCE, JOB_STATUS
 from .exceptions import FileParseError
-from .managers import DataImportManager
+from .signals import dataimport_parsed
+from .managers import (
+    DataImportManager,
+    DataFeatureManager,
+    ContributionImportManager
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 class DataImport(StatusModel, TimeStampedModel):
@@ -37,6 +56,7 @@ class DataImport(StatusModel, TimeStampedModel):
 
     STATUS = STATUS
     FORMAT = FORMAT
+    INFERENCE = INFERENCE
 
     name = models.CharField(max_length=100)
     description = models.TextField(null=True, blank=True)
@@ -46,6 +66,16 @@ class DataImport(StatusModel, TimeStampedModel):
         max_length=500
     )
     keys = ArrayField(models.CharField(max_length=100), null=True, blank=True)
+    progress = models.PositiveIntegerField(default=0)
+    total_features = models.PositiveIntegerField(default=0)
+    imported_features = models.PositiveIntegerField(default=0)
+    errors = JSONField(null=True, blank=True)
+    stats = JSONField(null=True, blank=True)
+    inference = models.CharField(
+        max_length=10,
+        choices=INFERENCE,
+        default=INFERENCE.full
+    )
 
     project = models.ForeignKey(
         'projects.Project',
@@ -65,6 +95,281 @@ class DataImport(StatusModel, TimeStampedModel):
         self.status = self.STATUS.deleted
         self.save()
 
+    def iter_features(self, inference):
+        """
+        Read features from the file one by one.
+
+        Parameters
+        ----------
+        inference : geokey_dataimports.helpers.inference_helpers.TypeInference
+            Inference of field types, gets columns of a CSV file added in the
+            order they appear in the header.
+
+        Returns
+        -------
+        generator
+            Yields each feature as a dict. The file gets closed once all
+            features have been read.
+        """
+        if self.dataformat == FORMAT.KML:
+            for feature in iter_kml_features(self.file.path):
+                yield feature
+
+            return
+
+        csv.field_size_limit(sys.maxsize)
+
+        with open(self.file.path, 'rU') as file_obj:
+            if self.dataformat == FORMAT.GeoJSON:
+                features = iter_geojson_features(file_obj)
+
+            if self.dataformat == FORMAT.CSV:
+                fields = []
+                features = iter_csv_features(fields=fields, file_obj=file_obj)
+                inference.add_columns(fields)
+
+            for feature in features:
+                yield feature
+
+    def parse_file(self):
+        """
+        Read the file and store data fields and data features from it.
+
+        The file goes through a pipeline of generators (reader, type inference,
+        geometry extraction, writer), so data features get stored while the
+        file is still being read and it is never held in memory at once.
+
+        With `DATAIMPORTS_INFERENCE` set to `sample`, types are inferred from
+        a random sample of `DATAIMPORTS_INFERENCE_SAMPLE_SIZE` features and
+        the file is read again to store data features. Data features with
+        values that contradict the types get flagged with the names of those
+        fields as `conflicts`, rows with no valid geometry get stored without
+        one and flagged with the geometry field. Otherwise, rows of CSV files
+        are read twice too: types are inferred from all of them first, so
+        that every data feature takes its geometry from the same field. The
+        mode used is stored as `inference`, the number of data features
+        stored as `total_features`. Time and rows of each stage are stored as
+        `stats`, with WKT geometries parsed by OGR timed apart from type
+        inference as the `ogr` stage.
+
+        Data features and data fields are stored in a single transaction.
+        When the data import is processed by a background job, `progress` is
+        updated with the number of data features stored so far, committed
+        together with them.
+
+        Raises
+        ------
+        geokey_dataimports.exceptions.FileParseError
+            When the file contains errors. Data features stored so far get
+            rolled back.
+        """
+        stats = PipelineStats()
+        inference = TypeInference(stats)
+        errors = []
+        mode = getattr(settings, 'DATAIMPORTS_INFERENCE', INFERENCE.full)
+
+        callback = None
+        if self.status == STATUS.processing:
+            callback = self.update_progress
+
+        if mode == INFERENCE.sample:
+            with stats.stage('sample'):
+                sample = reservoir_sample(
+                    self.iter_features(inference),
+                    getattr(
+                        settings,
+                        'DATAIMPORTS_INFERENCE_SAMPLE_SIZE',
+                        10000
+                    )
+                )
+
+                for feature in sample:
+                    inference.observe(
+                        feature['properties'],
+                        'geometry' not in feature
+                    )
+
+                stats.count('sample', len(sample))
+        elif self.dataformat == FORMAT.CSV:
+            # The geometry field of rows is known only once all of them have
+            # been read, so every data feature takes its geometry from it.
+            with stats.stage('inference'):
+                reader = self.iter_features(inference)
+                rows = 0
+
+                try:
+                    for feature in extract_geometries(
+                            infer_types(reader, inference),
+                            inference,
+                            errors):
+                        rows += 1
+                finally:
+                    reader.close()
+
+                stats.count('inference', rows)
+
+            if errors:
+                self.store_stats(stats)
+                raise FileParseError('Failed to read file.', errors)
+
+        reader = self.iter_features(inference)
+
+        try:
+            with transaction.atomic():
+                features = stats.timed(reader, 'read')
+
+                if mode == INFERENCE.sample:
+                    features = stats.timed(
+                        validate_types(features, inference),
+                        'validation'
+                    )
+                elif self.dataformat == FORMAT.CSV:
+                    features = stats.timed(
+                        attach_geometries(features, inference),
+                        'attach'
+                    )
+                else:
+                    features = stats.timed(
+                        infer_types(features, inference),
+                        'inference'
+                    )
+
+                features = stats.timed(
+                    extract_geometries(features, inference, errors),
+                    'geometries'
+                )
+
+                with stats.stage('insert'):
+                    count = DataFeature.objects.ingest(
+                        features,
+                        self,
+                        callback
+                    )
+                    stats.count('insert', count)
+
+                # Data features stored so far get rolled back
+                if errors:
+                    raise FileParseError('Failed to read file.', errors)
+
+                with stats.stage('datafields'):
+                    datafields = DataField.objects.bulk_create([
+                        DataField(name=name, types=types, dataimport=self)
+                        for name, types in inference.get_datafields()
+                    ])
+                    stats.count('datafields', len(datafields))
+
+                self.inference = mode
+                self.total_features = count
+                self.imported_features = 0
+                DataImport.objects.filter(pk=self.pk).update(
+                    inference=mode,
+                    total_features=count,
+                    imported_features=0
+                )
+        except FileParseError:
+            self.store_stats(stats)
+            raise
+        finally:
+            reader.close()
+
+        self.store_stats(stats)
+
+    def store_stats(self, stats):
+        """
+        Store stats of reading the file, log them and send them as a signal.
+
+        Parameters
+        ----------
+        stats : geokey_dataimports.helpers.stats_helpers.PipelineStats
+            Time and rows of each stage.
+        """
+        self.stats = stats.to_dict()
+        DataImport.objects.filter(pk=self.pk).update(stats=self.stats)
+
+        logger.info(
+            'Data import %s read in %.3fs: %s.',
+            self.id,
+            self.stats['seconds'],
+            ', '.join(
+                '%(name)s %(seconds).3fs (%(rows)s rows)' % stage
+                for stage in self.stats['stages']
+            )
+        )
+        dataimport_parsed.send(
+            sender=DataImport,
+            dataimport=self,
+            stats=self.stats
+        )
+
+    def update_progress(self, count):
+        """Store the number of data features stored so far."""
+        self.progress = count
+        DataImport.objects.filter(pk=self.pk).update(progress=count)
+
+    def process(self):
+        """
+        Parse the file of a data import claimed by a background job.
+
+        Anything stored by an earlier attempt is removed first. The status
+        changes to `active` when the file has been read, to `invalid` (with
+        the errors stored) when it could not be read. The data import stays
+        locked until then, so it is not claimed as interrupted meanwhile.
+        """
+        with transaction.atomic():
+            # Held by the worker until it finishes (or its connection drops)
+            DataImport.objects.select_for_update().filter(pk=self.pk).first()
+
+            self.datafields.all().delete()
+            self.datafeatures.all().delete()
+            self.stats = None
+
+            try:
+                self.parse_file()
+            except FileParseError as error:
+                self.status = STATUS.invalid
+                self.errors = error.errors
+            except Exception:
+                logger.exception('Failed to process data import %s.', self.id)
+                self.status = STATUS.invalid
+                self.errors = [{'messages': ['An unexpected error occurred.']}]
+            else:
+                self.status = STATUS.active
+                self.errors = None
+
+            self.update_counters()
+            self.progress = self.total_features
+            self.save()
+
+    def abort(self):
+        """Stop a data import interrupted while processing, as invalid."""
+        self.status = STATUS.invalid
+        self.errors = [{'messages': ['Reading the file was interrupted.']}]
+        self.save()
+
+    def update_counters(self):
+        """Count all data features and the ones imported again."""
+        counts = self.datafeatures.aggregate(
+            total=models.Count('id'),
+            imported=models.Count(
+                models.Case(models.When(imported=True, then=1))
+            )
+        )
+
+        self.total_features = counts['total']
+        self.imported_features = counts['imported']
+        DataImport.objects.filter(pk=self.pk).update(
+            total_features=self.total_features,
+            imported_features=self.imported_features
+        )
+
+    def get_latest_contributionimport(self):
+        """Get the latest import of data features as contributions."""
+        return self.contributionimports.order_by('-created').first()
+
+    def get_flagged_datafeatures(self):
+        """Get all data features with values that contradict field types."""
+        return self.datafeatures.filter(conflicts__isnull=False)
+
     def get_lookup_fields(self):
         """Get all lookup fields of a category."""
         lookupfields = {}
@@ -76,156 +381,17 @@ class DataImport(StatusModel, TimeStampedModel):
 
 @receiver(models.signals.post_save, sender=DataImport)
 def post_save_dataimport(sender, instance, created, **kwargs):
-    """Map data fields and data features when the data import gets created."""
-    if created:
-        datafields = []
-        datafeatures = []
-
-        fields = []
-        features = []
-        errors = []
-
-        if instance.dataformat == FORMAT.KML:
-            driver = ogr.GetDriverByName('KML')
-            reader = driver.Open(instance.file.path)
-
-            for layer in reader:
-                for feature in layer:
-                    test = json.loads(feature.ExportToJson())
-                    test['properties'] = table_to_json(test['properties']['Description'])[0]
-                    features.append(test)
-        else:
-            csv.field_size_limit(sys.maxsize)
-            file_obj = open(instance.file.path, 'rU')
-
-        if instance.dataformat == FORMAT.GeoJSON:
-            reader = json.load(file_obj)
-            features = reader['features']
-
-        if instance.dataformat == FORMAT.CSV:
-            import_from_csv(features=features, fields=fields, file_obj=file_obj)
-
-        for feature in features:
-            geometries = {}
-
-            for key, value in feature['properties'].items():
-                field = None
-
-                for existing_field in fields:
-                    if existing_field['name'] == key:
-                        field = existing_field
-                        break
-
-                if field is None:
-                    fields.append({
-                        'name': key,
-                        'good_types': set(['TextField', 'LookupField']),
-                        'bad_types': set([])
-                    })
-                    field = fields[-1]
-
-                fieldtype = None
-
-                if 'geometry' not in feature:
-                    try:
-                        geometry = ogr.CreateGeometryFromWkt(str(value))
-                        geometry = geometry.ExportToJson()
-                    except:
-                        geometry = None
-
-                    fieldtype = 'GeometryField'
-                    if geometry is not None:
-                        if fieldtype not in field['bad_types']:
-                            field['good_types'].add(fieldtype)
-                            geometries[field['name']] = json.loads(geometry)
-                    else:
-                        field['good_types'].discard(fieldtype)
-                        field['bad_types'].add(fieldtype)
-                        fieldtype = None
-
-                if fieldtype is None:
-                    fieldtype = 'NumericField'
-                    if type_helpers.is_numeric(value):
-                        if fieldtype not in field['bad_types']:
-                            field['good_types'].add(fieldtype)
-                    else:
-                        field['good_types'].discard(fieldtype)
-                        field['bad_types'].add(fieldtype)
-
-                    fieldtypes = ['DateField', 'DateTimeField']
-                    if type_helpers.is_date(value):
-                        for fieldtype in fieldtypes:
-                            if fieldtype not in field['bad_types']:
-                                field['good_types'].add(fieldtype)
-                    else:
-                        for fieldtype in fieldtypes:
-                            field['good_types'].discard(fieldtype)
-                            field['bad_types'].add(fieldtype)
-
-                    fieldtype = 'TimeField'
-                    if type_helpers.is_time(value):
-                        if fieldtype not in field['bad_types']:
-                            field['good_types'].add(fieldtype)
-                    else:
-                        field['good_types'].discard(fieldtype)
-                        field['bad_types'].add(fieldtype)
-
-            if 'geometry' not in feature and len(geometries) == 0:
-                errors.append({
-                    'line': feature['line'],
-                    'messages': ['The entry has no geometry set.']
-                })
-            else:
-                feature['geometries'] = geometries
-
-        geometryfield = None
-        for field in fields:
-            if 'GeometryField' not in field['good_types']:
-                datafields.append({
-                    'name': field['name'],
-                    'types': list(field['good_types'])
-                })
-            elif geometryfield is None:
-                geometryfield = field['name']
-
-        for feature in features:
-            geometry = None
-            if 'geometry' in feature:
-                geometry = feature['geometry']
-            elif 'geometries' in feature:
-                if not geometryfield:
-                    errors.append({
-                        'line': feature['line'],
-                        'messages': ['The file has no valid geometry field.']
-                    })
-                else:
-                    geometries = feature['geometries']
-                    if geometryfield in geometries:
-                        geometry = geometries[geometryfield]
-
-            if geometry:
-                datafeatures.append({
-                    'geometry': geometry,
-                    'properties': feature['properties']
-                })
-
-        if errors:
+    """
+    Map data fields and data features when the data import gets created.
+
+    Pending data imports are left for a background job.
+    """
+    if created and instance.status != STATUS.pending:
+        try:
+            instance.parse_file()
+        except FileParseError:
             instance.delete()
-            raise FileParseError('Failed to read file.', errors)
-        else:
-            for datafield in datafields:
-                if datafield['name']:
-                    DataField.objects.create(
-                        name=datafield['name'],
-                        types=list(datafield['types']),
-                        dataimport=instance
-                    )
-            for datafeature in datafeatures:
-                DataFeature.objects.create(
-                    geometry=json.dumps(datafeature['geometry']),
-                    properties=datafeature['properties'],
-                    dataimport=instance
-                )
+            raise
 
 
 class DataField(TimeStampedModel):
@@ -244,10 +410,11 @@ class DataField(TimeStampedModel):
         """
         Convert data field to regular GeoKey field.
 
+        Use `assign_fields` when converting more data fields at once, so
+        data features are written once for all of them.
+
         Parameters
         ----------
-        user : geokey.users.models.User
-            The request user.
         name : str
             The name of the field.
         fieldtype : str
@@ -258,69 +425,279 @@ class DataField(TimeStampedModel):
         geokey.categories.models.Field
             The field created.
         """
-        category = self.dataimport.category
-        field = None
+        return assign_fields(
+            self.dataimport,
+            [(self, None, name, fieldtype)]
+        )[0]
 
-        if self.key:
-            try:
-                field = category.fields.get(key=self.key)
-            except Category.DoesNotExist:
-                pass
 
-        proposed_key = slugify(self.name)
-        suggested_key = proposed_key
+class DataFeature(TimeStampedModel):
+    """Store a single data feature."""
 
-        if field:
-            suggested_key = field.key
-        else:
-            count = 1
-            while category.fields.filter(key=suggested_key).exists():
-                suggested_key = '%s-%s' % (proposed_key, count)
-                count += 1
+    imported = models.BooleanField(default=False)
+    geometry = gis.GeometryField(geography=True, null=True)
+    properties = JSONField(default={})
+    conflicts = ArrayField(
+        models.CharField(max_length=100),
+        null=True,
+        blank=True
+    )
 
-            self.key = suggested_key
-            self.save()
+    dataimport = models.ForeignKey(
+        'DataImport',
+        related_name='datafeatures'
+    )
 
-            field = Field.create(
-                name,
-                self.key,
-                '', False,
-                category,
-                fieldtype
-            )
+    objects = DataFeatureManager()
 
-        for datafeature in self.dataimport.datafeatures.all():
-            properties = datafeature.properties
-            if self.name in properties:
-                # Edge case: if field type is set as text but original value
-                # is a number - import will fail, because a method
-                # create_search_index within geokey/contributions/models.py
-                # will try to use number within regular expression. So the
-                # fix is to make sure value of such field type is always
-                # stringified.
-                if field.fieldtype == 'TextField':
-                    properties[self.name] = properties[self.name]
-                # If field key has changed - it needs to be reflected on feature
-                # properties too.
-                if self.key != self.name:
-                    properties[self.key] = properties.pop(self.name)
-            datafeature.properties = properties
-            datafeature.save()
-
-        return field
 
+class ContributionImport(StatusModel, TimeStampedModel):
+    """Store a single import of data features as contributions."""
 
-class DataFeature(TimeStampedModel):
-    """Store a single data feature."""
+    STATUS = JOB_STATUS
 
-    imported = models.BooleanField(default=False)
-    geometry = gis.GeometryField(geography=True)
-    properties = JSONField(default={})
+    selection = JSONField(default=dict)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+    checkpoint = models.PositiveIntegerField(null=True, blank=True)
+    post_interactions = JSONField(null=True, blank=True)
+    workers = models.PositiveIntegerField(default=1)
+    speedup = models.FloatField(null=True, blank=True)
 
     dataimport = models.ForeignKey(
         'DataImport',
-        related_name='datafeatures'
+        related_name='contributionimports'
     )
+    creator = models.ForeignKey(settings.AUTH_USER_MODEL)
+
+    objects = ContributionImportManager()
+
+    def save(self, *args, **kwargs):
+        """Count the data features to import when the import gets created."""
+        if self.pk is None:
+            self.total = self.get_datafeatures().count()
+
+        super(ContributionImport, self).save(*args, **kwargs)
+
+    def get_datafeatures(self):
+        """
+        Get the data features selected that are not imported yet.
+
+        Returns
+        -------
+        django.db.models.query.QuerySet
+            Data features to import.
+        """
+        return filter_selection(
+            self.dataimport.datafeatures.filter(imported=False),
+            self.selection
+        )
+
+    def process(self, parallel=False):
+        """
+        Import the data features as contributions.
+
+        Data features are imported in batches, each committed together with
+        the counters and the ID of its last data feature as a checkpoint. An
+        interrupted import processed again continues after the checkpoint, so
+        at most a single batch gets lost. Social media posts of the project
+        are disabled meanwhile. The status changes to `completed`, or to
+        `failed` when the import stops with an error.
+
+        When processed by a background job, with `DATAIMPORTS_IMPORT_WORKERS`
+        set to more than one, chunks of data features are imported by a pool
+        of worker processes instead, with no checkpoint: the counters are
+        worked out from data features still not imported, and the speedup is
+        stored when finished.
+
+        Parameters
+        ----------
+        parallel : boolean
+            Whether worker processes may be used. Never within a request: the
+            pool closes database connections and forks the process.
+        """
+        self.workers = 1
+
+        if parallel:
+            self.workers = max(
+                getattr(settings, 'DATAIMPORTS_IMPORT_WORKERS', 1),
+                1
+            )
+
+        self.disable_post_interactions()
+
+        if self.started is None:
+            self.started = timezone.now()
+
+        if self.workers > 1 or self.checkpoint is None:
+            self.reset_progress()
+
+        self.save()
+
+        try:
+            if self.workers > 1:
+                imported, self.speedup = import_datafeatures_parallel(
+                    self.dataimport,
+                    self.creator,
+                    self.get_datafeatures(),
+                    self.workers,
+                    self.update_progress
+                )
+            else:
+                import_datafeatures(
+                    self.dataimport,
+                    self.creator,
+                    self.get_datafeatures(),
+                    self.update_progress,
+                    start=self.checkpoint
+                )
+        except Exception:
+            logger.exception('Failed to import data import %s.', self.id)
+            status = self.STATUS.failed
+        else:
+            status = self.STATUS.completed
+
+        self.finish(status)
+
+    def reset_progress(self):
+        """
+        Work out the counters from data features not imported yet.
+
+        Data features that got imported since the import was created count as
+        imported, all others are processed again.
+        """
+        remaining = self.get_datafeatures().count()
+
+        self.imported = max(self.total - remaining, 0)
+        self.processed = self.imported
+        self.failed = 0
+        self.checkpoint = None
+
+    def finish(self, status):
+        """
+        Finish the import, restoring social media posts of the project.
+
+        Parameters
+        ----------
+        status : str
+            Final status of the import.
+        """
+        with transaction.atomic():
+            self.restore_post_interactions()
+            self.status = status
+            self.finished = timezone.now()
+            self.save()
+
+    def disable_post_interactions(self):
+        """
+        Disable social media posts of the project.
+
+        Their statuses are stored with the import before they change, so they
+        can be restored even when the import gets interrupted. Statuses
+        already stored are kept when the import continues.
+        """
+        posts = SocialInteractionPost.objects.filter(
+            project=self.dataimport.project
+        )
+
+        with transaction.atomic():
+            if self.post_interactions is None:
+                self.post_interactions = dict(
+                    (str(post_id), status)
+                    for post_id, status in posts.values_list('id', 'status')
+                )
+                self.save()
+
+            posts.filter(id__in=list(self.post_interactions.keys())).update(
+                status='inactive'
+            )
+
+    def restore_post_interactions(self):
+        """Restore social media posts of the project to stored statuses."""
+        if self.post_interactions is None:
+            return
+
+        ids = {}
+        for post_id, status in self.post_interactions.items():
+            ids.setdefault(status, []).append(int(post_id))
+
+        for status, post_ids in ids.items():
+            SocialInteractionPost.objects.filter(id__in=post_ids).update(
+                status=status
+            )
+
+        self.post_interactions = None
+
+    def update_progress(self, processed, imported, checkpoint):
+        """
+        Store the progress of a batch just imported.
+
+        Called inside the transaction of the batch, so the counters and the
+        checkpoint always match the contributions created. Chunks of a
+        parallel import are stored after they are committed.
+
+        Parameters
+        ----------
+        processed : int
+            Number of data features processed in the batch.
+        imported : int
+            Number of contributions created in the batch.
+        checkpoint : int
+            ID of the last data feature of the batch, `None` for chunks of a
+            parallel import.
+        """
+        self.processed += processed
+        self.imported += imported
+        self.failed = self.processed - self.imported
+        self.checkpoint = checkpoint
+
+        ContributionImport.objects.filter(pk=self.pk).update(
+            processed=self.processed,
+            imported=self.imported,
+            failed=self.failed,
+            checkpoint=self.checkpoint,
+            modified=timezone.now()
+        )
+
+    def get_rate(self):
+        """
+        Get the number of data features processed per second.
+
+        Returns
+        -------
+        float
+            Rate of the import, `None` when it has not started yet.
+        """
+        if self.started is None:
+            return None
+
+        elapsed = (self.finished or timezone.now()) - self.started
+        return self.processed / max(elapsed.total_seconds(), 0.001)
+
+    def get_progress(self):
+        """
+        Get the progress of the import.
+
+        Returns
+        -------
+        dict
+            Status, counters, rate and parallelism of the import.
+        """
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'processed': self.processed,
+            'imported': self.imported,
+            'failed': self.failed,
+            'rate': self.get_rate(),
+            'workers': self.workers,
+            'speedup': self.speedup
+        }
 
 
 @receiver(models.signals.post_save, sender=Project)
@@ -336,17 +713,3 @@ def post_save_category(sender, instance, **kwargs):
     if instance.status == 'deleted':
         DataImport.objects.filter(category=instance).delete()
 
-
-def table_to_json(table):
-    fields = []
-    table_data = []
-    model = BeautifulSoup(table, features="html.parser")
-    datum = {}
-    ta = model.find_all('table')[0]
-    for i, tr in enumerate(ta.find_all('tr', recursive=False)):
-        fields.append((tr.find_all('td')[0]).text)
-        datum[fields[i]] = (tr.find_all('td')[1]).text
-    if datum:
-        table_data.append(datum)
-
-    return(table_data)
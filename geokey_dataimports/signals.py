@@ -0,0 +1,7 @@
+"""All signals of the extension."""
+
+from django.dispatch import Signal
+
+
+# Sent when the file of a data import has been read, with stats of each stage
+dataimport_parsed = Signal(providing_args=['dataimport', 'stats'])
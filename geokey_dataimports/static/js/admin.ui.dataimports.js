@@ -4,13 +4,44 @@ $(document).ready(function() {
      *
      * Reacts to a button click, that has data-loader="true" set. Also uses
      * text entered in data-loader-text (separated with commas to have
-     * multiple) to show info next to a loader spinner.
+     * multiple) to show info next to a loader spinner. When data-loader-progress
+     * is set, progress of the import is polled from that URL and shown instead
+     * as soon as it starts.
     */
     var timeout, interval;
 
+    function checkProgress(url) {
+        $.get(url, function(response) {
+            var contributionimport = response.contributionimport;
+
+            if (contributionimport && contributionimport.status === 'processing') {
+                if (interval) {
+                    clearInterval(interval);
+                    interval = null;
+                }
+
+                $('p.loader-text').empty().text(
+                    'Imported ' + contributionimport.imported + ' of ' +
+                    contributionimport.total + ' data feature(s)'
+                );
+            }
+        }).always(function() {
+            window.setTimeout(function() {
+                checkProgress(url);
+            }, 2000);
+        });
+    }
+
     $('[data-loader="true"]').click(function() {
         var $this = $(this);
         var loaderText = $this.data('loader-text');
+        var loaderProgress = $this.data('loader-progress');
+
+        if (loaderProgress) {
+            window.setTimeout(function() {
+                checkProgress(loaderProgress);
+            }, 2000);
+        }
 
         if (loaderText) {
             loaderText = loaderText.split(',');
@@ -1,6 +1,7 @@
 """All helpers for the file mocks."""
 
 import csv
+import json
 
 
 def get_csv_file(fieldnames=None):
@@ -45,3 +46,104 @@ def get_csv_file(fieldnames=None):
         })
 
     return file
+
+
+def get_geojson_file():
+    """
+    Get GeoJSON file.
+
+    It adds three features with the same properties as the CSV file.
+
+    Returns
+    -------
+    FILE
+        Generated GeoJSON file.
+    """
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [30, 10]},
+            'properties': {
+                'ID': 1,
+                'Name': 'Meat',
+                'Short Description': 'Meat is good.'
+            }
+        },
+        {
+            'type': 'Feature',
+            'geometry': {
+                'type': 'LineString',
+                'coordinates': [[30, 10], [10, 30], [40, 40]]
+            },
+            'properties': {
+                'ID': 2,
+                'Name': 'Fish',
+                'Short Description': 'Fish is healthy.'
+            }
+        },
+        {
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [
+                    [[30, 10], [40, 40], [20, 40], [10, 20], [30, 10]]
+                ]
+            },
+            'properties': {
+                'ID': 3,
+                'Name': 'Vegetables',
+                'Short Description': 'Vegetables are even healthier.'
+            }
+        }
+    ]
+
+    with open('test_geojson.geojson', 'w') as file:
+        json.dump({'type': 'FeatureCollection', 'features': features}, file)
+
+    return file
+
+
+def get_kml_file():
+    """
+    Get KML file.
+
+    It adds three placemarks with the same properties as the CSV file, read
+    from the description table, `Data` and `SchemaData` respectively.
+
+    Returns
+    -------
+    FILE
+        Generated KML file.
+    """
+    with open('test_kml.kml', 'w') as file:
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<kml xmlns="http://www.opengis.net/kml/2.2"><Document><Folder>'
+            '<Placemark><name>Meat</name><description><![CDATA[<table>'
+            '<tr><td>ID</td><td>1</td></tr>'
+            '<tr><td>Name</td><td>Meat</td></tr>'
+            '<tr><td>Short Description</td><td>Meat is good.</td></tr>'
+            '</table>]]></description>'
+            '<Point><coordinates>30,10,0</coordinates></Point></Placemark>'
+            '<Placemark><ExtendedData>'
+            '<Data name="ID"><value>2</value></Data>'
+            '<Data name="Name"><value>Fish</value></Data>'
+            '<Data name="Short Description">'
+            '<value>Fish is healthy.</value></Data>'
+            '</ExtendedData><LineString>'
+            '<coordinates>30,10 10,30 40,40</coordinates>'
+            '</LineString></Placemark>'
+            '<Placemark><ExtendedData><SchemaData schemaUrl="#food">'
+            '<SimpleData name="ID">3</SimpleData>'
+            '<SimpleData name="Name">Vegetables</SimpleData>'
+            '<SimpleData name="Short Description">'
+            'Vegetables are even healthier.</SimpleData>'
+            '</SchemaData></ExtendedData><Polygon><outerBoundaryIs>'
+            '<LinearRing><coordinates>'
+            '30,10 40,40 20,40 10,20 30,10'
+            '</coordinates></LinearRing>'
+            '</outerBoundaryIs></Polygon></Placemark>'
+            '</Folder></Document></kml>'
+        )
+
+    return file
@@ -0,0 +1,42 @@
+"""All tests for COPY helpers."""
+
+from django.test import TestCase
+
+from ..helpers.copy_helpers import CopyStream, to_array_literal, to_copy_row
+
+
+class ToArrayLiteralTest(TestCase):
+    """Test to_array_literal method."""
+
+    def test_method(self):
+        """Test with values that need quoting."""
+        self.assertIsNone(to_array_literal(None))
+        self.assertEqual(to_array_literal([]), '{}')
+        self.assertEqual(
+            to_array_literal(['ID', 'Say "hi"', 'a\\b', 'c, d']),
+            '{"ID","Say \\"hi\\"","a\\\\b","c, d"}'
+        )
+
+
+class ToCopyRowTest(TestCase):
+    """Test to_copy_row method."""
+
+    def test_method(self):
+        """Test with values that need escaping."""
+        self.assertEqual(
+            to_copy_row(['a\tb', 'c\\nd', None, '{"e": "f\ng"}']),
+            'a\\tb\tc\\\\nd\t\\N\t{"e": "f\\ng"}\n'
+        )
+
+
+class CopyStreamTest(TestCase):
+    """Test CopyStream class."""
+
+    def test_read(self):
+        """Test reading rows in chunks."""
+        stream = CopyStream(iter(['a\tb\n', 'c\td\n']))
+
+        self.assertEqual(stream.read(3), 'a\tb')
+        self.assertEqual(stream.readline(), '\n')
+        self.assertEqual(stream.read(), 'c\td\n')
+        self.assertEqual(stream.read(8192), '')
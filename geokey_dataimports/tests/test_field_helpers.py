@@ -0,0 +1,101 @@
+"""All tests for field helpers."""
+
+import os
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from geokey.categories.tests.model_factories import TextFieldFactory
+
+from .model_factories import (
+    DataImportFactory,
+    DataFieldFactory,
+    DataFeatureFactory
+)
+from ..helpers.field_helpers import get_unique_key, assign_fields
+from ..models import DataFeature
+
+
+class GetUniqueKeyTest(TestCase):
+    """Test get_unique_key method."""
+
+    def test_method(self):
+        """Test that taken keys are numbered."""
+        self.assertEqual(get_unique_key('Field Name', []), 'field-name')
+        self.assertEqual(
+            get_unique_key('Field Name', ['field-name', 'field-name-1']),
+            'field-name-2'
+        )
+
+
+class AssignFieldsTest(TestCase):
+    """Test assign_fields method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+        self.existing = TextFieldFactory.create(
+            key='existing',
+            category=self.dataimport.category
+        )
+        self.datafields = [
+            DataFieldFactory.create(name='Name', dataimport=self.dataimport),
+            DataFieldFactory.create(name='Type', dataimport=self.dataimport),
+            DataFieldFactory.create(name='Old', dataimport=self.dataimport)
+        ]
+        self.datafeatures = DataFeatureFactory.create_batch(
+            3,
+            dataimport=self.dataimport,
+            properties={'Name': 'Tree', 'Type': 'Oak', 'Old': 'Yes'}
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.dataimport.file.path)
+
+    def test_method(self):
+        """Test that data features are updated once for all fields."""
+        with CaptureQueriesContext(connection) as queries:
+            fields = assign_fields(self.dataimport, [
+                (self.datafields[0], None, 'Name', 'TextField'),
+                (self.datafields[1], None, 'Type', 'TextField'),
+                (self.datafields[2], 'existing', 'Old', 'TextField')
+            ])
+
+        self.assertEqual(len([
+            query for query in queries
+            if query['sql'].startswith(
+                'UPDATE "%s"' % DataFeature._meta.db_table
+            )
+        ]), 1)
+
+        self.assertEqual(
+            [field.key for field in fields],
+            ['name', 'type', 'existing']
+        )
+        self.assertEqual(fields[2].id, self.existing.id)
+        self.assertEqual(
+            [datafield.key for datafield in self.datafields],
+            ['name', 'type', 'existing']
+        )
+
+        for datafeature in DataFeature.objects.filter(
+                dataimport=self.dataimport):
+            self.assertEqual(
+                datafeature.properties,
+                {'name': 'Tree', 'type': 'Oak', 'existing': 'Yes'}
+            )
+
+    def test_method_with_taken_key(self):
+        """Test that new fields do not take keys of existing ones."""
+        TextFieldFactory.create(key='name', category=self.dataimport.category)
+        fields = assign_fields(self.dataimport, [
+            (self.datafields[0], None, 'Name', 'TextField')
+        ])
+
+        self.assertEqual(fields[0].key, 'name-1')
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[0].id).properties,
+            {'name-1': 'Tree', 'Type': 'Oak', 'Old': 'Yes'}
+        )
@@ -3,7 +3,9 @@
 from django.test import TestCase
 
 from ..helpers.context_helpers import does_not_exist_msg
-from ..helpers.type_helpers import is_numeric, is_date, is_time
+from ..helpers.type_helpers import (
+    is_numeric, is_date, is_time, classify
+)
 
 
 class DoesNotExistMsgTest(TestCase):
@@ -149,3 +151,65 @@ class IsTimeTest(TestCase):
         """Test with time."""
         self.assertTrue(is_time('5:12'))
         self.assertTrue(is_time('23:14'))
+
+
+class ClassifyTest(TestCase):
+    """Test classify method."""
+
+    def test_method_with_empty_input(self):
+        """Test with empty input."""
+        self.assertEqual(classify(), set())
+        self.assertEqual(classify(''), set())
+
+    def test_method_with_text(self):
+        """Test with text."""
+        self.assertEqual(classify('London is great.'), set())
+        self.assertEqual(classify('POINT (30 10)'), set())
+
+    def test_method_with_number(self):
+        """Test with number."""
+        self.assertEqual(classify(29), {'NumericField'})
+        self.assertEqual(classify('29'), {'NumericField'})
+        self.assertEqual(classify('-2.9e3'), {'NumericField'})
+
+    def test_method_with_date(self):
+        """Test with date."""
+        self.assertEqual(
+            classify('2014-09-21T15:51:32.804Z'),
+            {'DateField', 'DateTimeField'}
+        )
+        self.assertEqual(
+            classify('2014'),
+            {'NumericField', 'DateField', 'DateTimeField'}
+        )
+        self.assertEqual(classify('2014-13-21'), set())
+
+    def test_method_with_time(self):
+        """Test with time."""
+        self.assertEqual(classify('5:12'), {'TimeField'})
+        self.assertEqual(classify('23:14'), {'TimeField'})
+        self.assertEqual(classify('24:14'), set())
+
+    def test_method_with_field_types(self):
+        """Test that only the types asked for are checked."""
+        self.assertEqual(classify('29', {'TimeField'}), set())
+        self.assertEqual(classify('5:12', {'TimeField'}), {'TimeField'})
+
+    def test_method_matches_helpers(self):
+        """Test that results are the same as with each helper on its own."""
+        values = [
+            '', '29', ' -3 ', '1.5', '.5', '5.', '1e5', '1.5e3', 'nan', 'inf',
+            '1.2.3', '2014', '20140921', '2014-09-21', '2014-02-30', '0:0',
+            '10:60', '12:30\n', 'Meat', 'POINT (30 10)', 29, 2.9, None
+        ]
+
+        for value in values:
+            types = set()
+            if is_numeric(value):
+                types.add('NumericField')
+            if is_date(value):
+                types.update(['DateField', 'DateTimeField'])
+            if is_time(value):
+                types.add('TimeField')
+
+            self.assertEqual(classify(value), types, value)
@@ -0,0 +1,390 @@
+"""All tests for import helpers."""
+
+import os
+import threading
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from geokey.core.models import LoggerHistory
+from geokey.users.tests.model_factories import UserFactory
+from geokey.projects.tests.model_factories import ProjectFactory
+from geokey.categories.tests.model_factories import (
+    CategoryFactory,
+    TextFieldFactory,
+    NumericFieldFactory,
+    LookupFieldFactory
+)
+from geokey.contributions.models import Observation
+from geokey.contributions.serializers import ContributionSerializer
+
+from .model_factories import DataImportFactory, DataFeatureFactory
+from ..helpers.import_helpers import (
+    get_search_index,
+    import_datafeatures,
+    import_datafeatures_parallel
+)
+
+
+class GetSearchIndexTest(TestCase):
+    """Test get_search_index method."""
+
+    def test_method(self):
+        """Test with text and numeric fields."""
+        category = CategoryFactory.create()
+        fields = [
+            TextFieldFactory.create(key='name', category=category),
+            NumericFieldFactory.create(key='size', category=category)
+        ]
+
+        self.assertEqual(
+            sorted(get_search_index(
+                {'name': 'Fish_and chips', 'size': 2},
+                fields
+            ).split(',')),
+            ['2', 'and', 'chips', 'fish']
+        )
+        self.assertEqual(get_search_index({}, fields), '')
+
+
+class ImportDataFeaturesTest(TestCase):
+    """Test import_datafeatures method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.user = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.user])
+        self.category = CategoryFactory.create(project=self.project)
+        self.dataimport = DataImportFactory.create(
+            keys=['Name', 'Type', 'Size'],
+            project=self.project,
+            category=self.category
+        )
+        self.file = self.dataimport.file.path
+
+        TextFieldFactory.create(key='Name', category=self.category)
+        LookupFieldFactory.create(key='Type', category=self.category)
+        NumericFieldFactory.create(
+            key='Size',
+            required=True,
+            category=self.category
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.file)
+
+    def create_datafeature(self, properties):
+        """Create a data feature of the data import."""
+        return DataFeatureFactory.create(
+            properties=properties,
+            dataimport=self.dataimport
+        )
+
+    def test_method(self):
+        """Test that contributions match the ones of the serializer."""
+        properties = {'Name': 'Fish', 'Type': 'Food', 'Size': 2, 'ID': '1'}
+        datafeature = self.create_datafeature(dict(properties))
+
+        imported = import_datafeatures(
+            self.dataimport,
+            self.user,
+            self.dataimport.datafeatures.filter(id=datafeature.id)
+        )
+        self.assertEqual(imported, 1)
+
+        observation = Observation.objects.get()
+        lookupvalue = self.category.fields.get(key='Type').lookupvalues.get()
+        self.assertEqual(lookupvalue.name, 'Food')
+
+        del properties['ID']
+        properties['Type'] = lookupvalue.id
+        serializer = ContributionSerializer(
+            data={
+                'location': {'geometry': datafeature.geometry},
+                'meta': {'category': self.category.id},
+                'properties': properties
+            },
+            context={'user': self.user, 'project': self.project}
+        )
+        serializer.is_valid(raise_exception=True)
+        reference = serializer.save()
+
+        for attr in [
+            'properties',
+            'status',
+            'search_index',
+            'display_field',
+            'expiry_field',
+            'version',
+            'category_id',
+            'project_id',
+            'creator_id'
+        ]:
+            self.assertEqual(
+                getattr(observation, attr),
+                getattr(reference, attr)
+            )
+
+        self.assertEqual(
+            observation.location.geometry,
+            reference.location.geometry
+        )
+        self.assertEqual(observation.location.creator, self.user)
+        self.assertEqual(observation.history.count(), 1)
+        self.assertEqual(
+            LoggerHistory.objects.filter(
+                observation__id=str(observation.id)
+            ).count(),
+            LoggerHistory.objects.filter(
+                observation__id=str(reference.id)
+            ).count()
+        )
+
+        datafeature.refresh_from_db()
+        self.assertTrue(datafeature.imported)
+
+    def test_method_with_invalid_datafeatures(self):
+        """Test that invalid data features are left as they are."""
+        valid = self.create_datafeature({'Name': 'Fish', 'Size': 2})
+        invalid = self.create_datafeature({'Name': 'Meat', 'Size': 'Big'})
+        missing = self.create_datafeature({'Name': 'Vegetables'})
+
+        imported = import_datafeatures(
+            self.dataimport,
+            self.user,
+            self.dataimport.datafeatures.filter(
+                id__in=[valid.id, invalid.id, missing.id]
+            )
+        )
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(Observation.objects.count(), 1)
+        self.assertEqual(
+            list(self.dataimport.datafeatures.filter(
+                imported=True
+            ).values_list('id', flat=True)),
+            [valid.id]
+        )
+
+    def test_method_when_imported(self):
+        """Test that data features already imported are skipped."""
+        datafeature = self.create_datafeature({'Name': 'Fish', 'Size': 2})
+        datafeature.imported = True
+        datafeature.save()
+
+        self.assertEqual(
+            import_datafeatures(
+                self.dataimport,
+                self.user,
+                self.dataimport.datafeatures.filter(id=datafeature.id)
+            ),
+            0
+        )
+        self.assertEqual(Observation.objects.count(), 0)
+
+    def test_method_without_geometry(self):
+        """Test that data features with no geometry are left as they are."""
+        datafeature = DataFeatureFactory.create(
+            geometry=None,
+            properties={'Name': 'Fish', 'Size': 2},
+            dataimport=self.dataimport
+        )
+
+        self.assertEqual(
+            import_datafeatures(
+                self.dataimport,
+                self.user,
+                self.dataimport.datafeatures.filter(id=datafeature.id)
+            ),
+            0
+        )
+        self.assertEqual(Observation.objects.count(), 0)
+
+    def test_method_with_inactive_category(self):
+        """Test that nothing is imported to an inactive category."""
+        datafeature = self.create_datafeature({'Name': 'Fish', 'Size': 2})
+        self.category.status = 'inactive'
+        self.category.save()
+
+        self.assertEqual(
+            import_datafeatures(
+                self.dataimport,
+                self.user,
+                self.dataimport.datafeatures.filter(id=datafeature.id)
+            ),
+            0
+        )
+        self.assertEqual(Observation.objects.count(), 0)
+
+    def test_method_with_lookup_values(self):
+        """Test that lookup values cost the same queries however many."""
+        lookupfield = self.category.fields.get(key='Type')
+        lookupfield.lookupvalues.create(name='Food')
+
+        counts = []
+        for names in [['Food', 'Drink'], ['Drink', 'Fruit', 'Snack', '5']]:
+            ids = [
+                self.create_datafeature({'Type': name, 'Size': 2}).id
+                for name in names
+            ]
+
+            with CaptureQueriesContext(connection) as queries:
+                imported = import_datafeatures(
+                    self.dataimport,
+                    self.user,
+                    self.dataimport.datafeatures.filter(id__in=ids)
+                )
+
+            self.assertEqual(imported, len(names))
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(
+            sorted(lookupfield.lookupvalues.values_list('name', flat=True)),
+            ['5', 'Drink', 'Food', 'Fruit', 'Snack']
+        )
+        self.assertEqual(
+            set(Observation.objects.values_list(
+                'properties__Type', flat=True
+            )),
+            set(lookupfield.lookupvalues.values_list('id', flat=True))
+        )
+
+
+class ImportDataFeaturesOverlapTest(TransactionTestCase):
+    """Test import_datafeatures method with imports running at once."""
+
+    def setUp(self):
+        """Set up test."""
+        self.user = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.user])
+        self.category = CategoryFactory.create(project=self.project)
+        self.dataimport = DataImportFactory.create(
+            keys=['Size'],
+            project=self.project,
+            category=self.category
+        )
+        self.file = self.dataimport.file.path
+
+        NumericFieldFactory.create(
+            key='Size',
+            required=True,
+            category=self.category
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.file)
+
+    @override_settings(DATAIMPORTS_IMPORT_BATCH_SIZE=2)
+    def test_method(self):
+        """Test that each data feature is imported once, by any import."""
+        ids = [
+            DataFeatureFactory.create(
+                properties={'Size': size},
+                dataimport=self.dataimport
+            ).id
+            for size in [1, 2, 3, 4]
+        ]
+        datafeatures = self.dataimport.datafeatures.filter(id__in=ids)
+        overlapping = []
+        threads = []
+
+        def run():
+            try:
+                overlapping.append(import_datafeatures(
+                    self.dataimport,
+                    self.user,
+                    datafeatures
+                ))
+            finally:
+                connection.close()
+
+        def callback(processed, count, last):
+            # Another import starts while the first batch is still locked
+            if not threads:
+                threads.append(threading.Thread(target=run))
+                threads[0].start()
+
+        imported = import_datafeatures(
+            self.dataimport,
+            self.user,
+            datafeatures,
+            callback
+        )
+        threads[0].join()
+
+        self.assertGreaterEqual(imported, 2)
+        self.assertEqual(imported + overlapping[0], 4)
+        self.assertEqual(Observation.objects.count(), 4)
+        self.assertEqual(
+            self.dataimport.datafeatures.filter(imported=False).count(),
+            0
+        )
+
+
+class ImportDataFeaturesParallelTest(TransactionTestCase):
+    """Test import_datafeatures_parallel method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.user = UserFactory.create()
+        self.project = ProjectFactory.create(add_admins=[self.user])
+        self.category = CategoryFactory.create(project=self.project)
+        self.dataimport = DataImportFactory.create(
+            keys=['Type', 'Size'],
+            project=self.project,
+            category=self.category
+        )
+        self.file = self.dataimport.file.path
+
+        LookupFieldFactory.create(key='Type', category=self.category)
+        NumericFieldFactory.create(
+            key='Size',
+            required=True,
+            category=self.category
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.file)
+
+    @override_settings(
+        DATAIMPORTS_IMPORT_CHUNK_SIZE=2,
+        DATAIMPORTS_IMPORT_BATCH_SIZE=1
+    )
+    def test_method(self):
+        """Test that each data feature is imported once, by any worker."""
+        ids = [
+            DataFeatureFactory.create(
+                properties={'Type': 'Food', 'Size': size},
+                dataimport=self.dataimport
+            ).id
+            for size in [1, 2, 3, 4, 5, 'Big']
+        ]
+        progress = []
+
+        imported, speedup = import_datafeatures_parallel(
+            self.dataimport,
+            self.user,
+            self.dataimport.datafeatures.filter(id__in=ids),
+            2,
+            lambda *args: progress.append(args)
+        )
+
+        self.assertEqual(imported, 5)
+        self.assertGreater(speedup, 0)
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(sum(args[0] for args in progress), 6)
+        self.assertEqual(sum(args[1] for args in progress), 5)
+        self.assertEqual(Observation.objects.count(), 5)
+        self.assertEqual(
+            self.category.fields.get(key='Type').lookupvalues.count(),
+            1
+        )
+        self.assertEqual(
+            self.dataimport.datafeatures.filter(imported=False).count(),
+            1
+        )
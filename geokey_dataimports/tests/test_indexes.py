@@ -0,0 +1,100 @@
+"""All tests for database indexes."""
+
+import os
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from .model_factories import DataImportFactory
+from ..models import DataImport
+
+
+SEED_ROWS = 1000000
+
+
+@unittest.skipUnless(
+    os.environ.get('DATAIMPORTS_TEST_INDEXES'),
+    'Seeds a million data features, set DATAIMPORTS_TEST_INDEXES to run.'
+)
+class DataFeatureIndexesTest(TestCase):
+    """Test that the planner uses indexes of data features."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed data features of a few data imports."""
+        cls.dataimports = [DataImportFactory.create() for index in range(10)]
+
+        with connection.cursor() as cursor:
+            # Spread across the world, stored one data import after another
+            # (as files are read), 1 in 100 not imported yet
+            cursor.execute(
+                'INSERT INTO geokey_dataimports_datafeature (created, '
+                'modified, imported, geometry, properties, dataimport_id) '
+                'SELECT now(), now(), n %% 100 <> 0, ST_SetSRID(ST_MakePoint('
+                'random() * 360 - 180, random() * 170 - 85), 4326)'
+                '::geography, '
+                '\'{}\', (%s::integer[])[(n - 1) * 10 / %s + 1] '
+                'FROM generate_series(1, %s) AS n',
+                [
+                    [dataimport.id for dataimport in cls.dataimports],
+                    SEED_ROWS,
+                    SEED_ROWS
+                ]
+            )
+            cursor.execute('ANALYZE geokey_dataimports_datafeature')
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove files of data imports."""
+        super(DataFeatureIndexesTest, cls).tearDownClass()
+
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def explain(self, sql, params):
+        """Get the query plan."""
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + sql, params)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def test_count_not_imported(self):
+        """Test counting data features not imported yet."""
+        plan = self.explain(
+            'SELECT COUNT(*) FROM geokey_dataimports_datafeature '
+            'WHERE dataimport_id = %s AND imported = false',
+            [self.dataimports[0].id]
+        )
+
+        self.assertNotIn('Seq Scan', plan)
+        self.assertTrue(
+            'geokey_dataimports_datafeature_not_imported' in plan or
+            'geokey_dataimports_datafeature_dataimport_imported' in plan
+        )
+
+    def test_count_imported(self):
+        """Test counting data features imported."""
+        plan = self.explain(
+            'SELECT COUNT(*) FROM geokey_dataimports_datafeature '
+            'WHERE dataimport_id = %s AND imported = true',
+            [self.dataimports[0].id]
+        )
+
+        self.assertNotIn('Seq Scan', plan)
+        self.assertIn(
+            'geokey_dataimports_datafeature_dataimport_imported',
+            plan
+        )
+
+    def test_bounding_box(self):
+        """Test data features within a bounding box."""
+        plan = self.explain(
+            'SELECT id FROM geokey_dataimports_datafeature '
+            'WHERE dataimport_id = %s AND geometry::geometry && '
+            'ST_MakeEnvelope(%s, %s, %s, %s, 4326)',
+            [self.dataimports[0].id, -0.5, 51, 0.5, 52]
+        )
+
+        self.assertNotIn('Seq Scan', plan)
+        self.assertIn('geokey_dataimports_datafeature_geometry_gist', plan)
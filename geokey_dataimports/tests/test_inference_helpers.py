@@ -0,0 +1,141 @@
+"""All tests for inference helpers."""
+
+from django.test import TestCase
+
+from ..helpers.inference_helpers import Column, TypeInference, parse_geometry
+from ..helpers.stats_helpers import PipelineStats
+
+
+class ParseGeometryTest(TestCase):
+    """Test parse_geometry method."""
+
+    def test_method(self):
+        """Test with valid and invalid geometries."""
+        self.assertEqual(
+            parse_geometry('POINT (30 10)'),
+            {'type': 'Point', 'coordinates': [30.0, 10.0]}
+        )
+        self.assertIsNone(parse_geometry('London is great.'))
+        self.assertIsNone(parse_geometry(29))
+
+    def test_method_with_ewkt(self):
+        """Test with EWKT geometries."""
+        self.assertEqual(
+            parse_geometry('SRID=4326;POINT (30 10)'),
+            {'type': 'Point', 'coordinates': [30.0, 10.0]}
+        )
+        self.assertIsNone(parse_geometry('SRID=3857;POINT (30 10)'))
+
+    def test_method_with_stats(self):
+        """Test that only values parsed by OGR are counted."""
+        stats = PipelineStats()
+        parse_geometry('POINT (30 10)', stats)
+        parse_geometry('London is great.', stats)
+        parse_geometry('POINT (a b)', stats)
+
+        self.assertEqual(stats.rows, {'ogr': 2})
+        self.assertEqual(stats.running, [])
+
+
+class ColumnTest(TestCase):
+    """Test Column class."""
+
+    def test_types(self):
+        """Test types with values of the same type."""
+        column = Column('Date')
+        column.observe('2014-09-21')
+        column.observe('2014-09-22T15:51:32')
+
+        self.assertEqual(
+            set(column.types),
+            {'TextField', 'LookupField', 'DateField', 'DateTimeField'}
+        )
+
+    def test_types_when_ruled_out(self):
+        """Test that ruled out types are not tested again."""
+        column = Column('ID')
+        column.observe('1')
+        column.observe('One')
+
+        self.assertEqual(column.candidates, {'GeometryField'})
+        self.assertEqual(set(column.types), {'TextField', 'LookupField'})
+
+        column.observe('2')
+        self.assertEqual(set(column.types), {'TextField', 'LookupField'})
+
+    def test_types_when_nothing_observed(self):
+        """Test types with no values."""
+        self.assertEqual(
+            set(Column('Empty').types),
+            {'TextField', 'LookupField'}
+        )
+
+    def test_geometry(self):
+        """Test geometry detection is turned off once it fails."""
+        column = Column('WKT')
+        self.assertIsNotNone(column.observe('POINT (30 10)', True))
+        self.assertTrue(column.is_geometry)
+
+        self.assertIsNone(column.observe('Nowhere', True))
+        self.assertFalse(column.is_geometry)
+        self.assertNotIn('GeometryField', column.candidates)
+
+
+class TypeInferenceTest(TestCase):
+    """Test TypeInference class."""
+
+    def test_observe(self):
+        """Test with many columns, keeping the order they appear in."""
+        inference = TypeInference()
+        inference.add_columns(['Column %s' % i for i in range(300)])
+
+        for row in range(10):
+            inference.observe(
+                dict(('Column %s' % i, str(row)) for i in range(300))
+            )
+
+        datafields = inference.get_datafields()
+        self.assertEqual(len(datafields), 300)
+        self.assertEqual(datafields[0][0], 'Column 0')
+        self.assertEqual(datafields[-1][0], 'Column 299')
+        self.assertIn('NumericField', datafields[0][1])
+
+    def test_geometryfield(self):
+        """Test geometry field is the first column with only geometries."""
+        inference = TypeInference()
+        inference.add_columns(['Name', 'Point', 'Line'])
+
+        geometries = inference.observe({
+            'Name': 'Fish',
+            'Point': 'POINT (30 10)',
+            'Line': 'LINESTRING (30 10, 10 30)'
+        }, True)
+        self.assertEqual(set(geometries.keys()), {'Point', 'Line'})
+        self.assertEqual(inference.geometryfield, 'Point')
+
+        inference.observe({'Point': 'Nowhere'}, True)
+        self.assertEqual(inference.geometryfield, 'Line')
+        self.assertEqual(
+            [name for name, types in inference.get_datafields()],
+            ['Name', 'Point']
+        )
+
+
+class TypeInferenceValidateTest(TestCase):
+    """Test validate method of TypeInference class."""
+
+    def test_method(self):
+        """Test with values that do and do not fit the types."""
+        inference = TypeInference()
+        inference.observe({'ID': '1', 'Date': '2014-09-21', 'Name': 'Fish'})
+
+        self.assertEqual(
+            inference.validate({'ID': '2', 'Date': '2014-09-22'}),
+            []
+        )
+        self.assertEqual(
+            sorted(inference.validate({'ID': 'Two', 'Date': 'Monday'})),
+            ['Date', 'ID']
+        )
+        self.assertEqual(inference.validate({'Name': 29, 'New': 'Yes'}), [])
+        self.assertIn('New', inference.columns)
@@ -0,0 +1,99 @@
+"""All tests for map helpers."""
+
+from django.test import TestCase
+
+from ..helpers.map_helpers import (
+    WEB_MERCATOR_EXTENT,
+    get_tile_bounds,
+    get_grid_size,
+    parse_imported,
+    parse_bbox,
+    parse_page,
+    parse_zoom
+)
+
+
+class GetTileBoundsTest(TestCase):
+    """Test get_tile_bounds method."""
+
+    def test_method(self):
+        """Test with tiles that exist."""
+        self.assertEqual(
+            get_tile_bounds(0, 0, 0),
+            (
+                -WEB_MERCATOR_EXTENT,
+                -WEB_MERCATOR_EXTENT,
+                WEB_MERCATOR_EXTENT,
+                WEB_MERCATOR_EXTENT
+            )
+        )
+        self.assertEqual(
+            get_tile_bounds('1', '1', '0'),
+            (0, 0, WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT)
+        )
+
+    def test_method_when_tile_does_not_exist(self):
+        """Test with tiles that do not exist."""
+        for tile in [(1, 2, 0), (1, 0, 2), (0, -1, 0), (25, 0, 0)]:
+            self.assertRaises(ValueError, get_tile_bounds, *tile)
+
+
+class ParseImportedTest(TestCase):
+    """Test parse_imported method."""
+
+    def test_method(self):
+        """Test with valid and invalid values."""
+        self.assertIsNone(parse_imported(None))
+        self.assertIsNone(parse_imported(''))
+        self.assertTrue(parse_imported('true'))
+        self.assertFalse(parse_imported('False'))
+        self.assertRaises(ValueError, parse_imported, 'yes')
+
+
+class ParseBboxTest(TestCase):
+    """Test parse_bbox method."""
+
+    def test_method(self):
+        """Test with valid and invalid bounding boxes."""
+        self.assertIsNone(parse_bbox(''))
+        self.assertEqual(
+            parse_bbox('-0.5,51,0.5,52.5'),
+            (-0.5, 51.0, 0.5, 52.5)
+        )
+
+        for value in ['1,2,3', '1,2,0,3', '-181,0,0,1', '0,0,1,91', 'a,b,c,d']:
+            self.assertRaises(ValueError, parse_bbox, value)
+
+
+class ParsePageTest(TestCase):
+    """Test parse_page method."""
+
+    def test_method(self):
+        """Test with valid and invalid pages."""
+        self.assertEqual(parse_page(None, None, 100), (1, 100))
+        self.assertEqual(parse_page('3', '20', 100), (3, 20))
+
+        for page, page_size in [('0', None), (None, '0'), (None, '101')]:
+            self.assertRaises(ValueError, parse_page, page, page_size, 100)
+
+
+class ParseZoomTest(TestCase):
+    """Test parse_zoom method."""
+
+    def test_method(self):
+        """Test with valid and invalid zoom levels."""
+        self.assertEqual(parse_zoom('0'), 0)
+        self.assertEqual(parse_zoom('12'), 12)
+
+        for value in [None, '', '-1', '25', 'world']:
+            self.assertRaises(ValueError, parse_zoom, value)
+
+
+class GetGridSizeTest(TestCase):
+    """Test get_grid_size method."""
+
+    def test_method(self):
+        """Test that cells halve with each zoom level."""
+        self.assertEqual(get_grid_size(0), 90)
+        self.assertEqual(get_grid_size(1), 45)
+        self.assertEqual(get_grid_size(0, cluster_size=256), 360)
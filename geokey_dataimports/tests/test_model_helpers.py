@@ -1,9 +1,14 @@
 # coding=utf-8
+from types import GeneratorType
+
 from django.test import TestCase
 from six import PY2, BytesIO, StringIO
 
 
-from geokey_dataimports.helpers.model_helpers import import_from_csv
+from geokey_dataimports.helpers.model_helpers import (
+    import_from_csv,
+    iter_csv_features
+)
 
 
 class MockCSV(object):
@@ -56,3 +61,27 @@ class ImportFromCSVTest(TestCase):
         for k, v in input_dict.items():
             self.assertEquals(v, features[0]['properties'][k])
 
+
+class IterCSVFeaturesTest(TestCase):
+    """Test iter_csv_features method."""
+
+    def test_method_is_lazy(self):
+        """Header is read straight away, rows are read one by one."""
+        if PY2:
+            mock_csv = BytesIO(b"abc,cde\n1,2\n3,")
+        else:
+            mock_csv = StringIO("abc,cde\n1,2\n3,")
+        fields = []
+        features = iter_csv_features(fields=fields, file_obj=mock_csv)
+
+        self.assertIsInstance(features, GeneratorType)
+        self.assertEqual(fields, ['abc', 'cde'])
+        self.assertEqual(
+            next(features),
+            {'line': 1, 'properties': {'abc': '1', 'cde': '2'}}
+        )
+        self.assertEqual(fields, ['abc', 'cde'])
+        self.assertEqual(
+            list(features),
+            [{'line': 2, 'properties': {'abc': '3'}}]
+        )
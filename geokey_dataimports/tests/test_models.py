@@ -1,8 +1,13 @@
 """All tests for models."""
 
 import os
+import tempfile
 
-from django.test import TestCase
+from datetime import timedelta
+
+from django.core.files import File
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from nose.tools import raises
 
@@ -12,8 +17,21 @@ from geokey.categories.models import Category
 from geokey.categories.tests.model_factories import CategoryFactory
 from geokey.contributions.models import Observation
 
-from .model_factories import DataImportFactory
-from ..models import DataImport, post_save_project, post_save_category
+from .helpers import file_helpers
+from .model_factories import (
+    DataImportFactory,
+    DataFieldFactory,
+    DataFeatureFactory
+)
+from ..base import STATUS
+from ..models import (
+    DataImport,
+    DataFeature,
+    ContributionImport,
+    post_save_project,
+    post_save_category
+)
+from ..signals import dataimport_parsed
 
 
 class DataImportTest(TestCase):
@@ -37,6 +55,525 @@ class DataImportTest(TestCase):
         DataImport.objects.get(pk=dataimport.id)
 
 
+class DataImportProcessTest(TestCase):
+    """Test processing data import in the background."""
+
+    def setUp(self):
+        """Set up test."""
+        self.files = []
+
+    def tearDown(self):
+        """Tear down test."""
+        for path in self.files:
+            os.remove(path)
+
+    def test_claim_and_process(self):
+        """
+        Test claim and process pending data import.
+
+        File should not be read until the data import is processed.
+        """
+        dataimport = DataImportFactory.create(status=STATUS.pending)
+        self.files.append(dataimport.file.path)
+
+        self.assertEqual(dataimport.datafeatures.count(), 0)
+
+        claimed = DataImport.objects.claim()
+        self.assertEqual(claimed, dataimport)
+        self.assertEqual(claimed.status, STATUS.processing)
+        self.assertIsNone(DataImport.objects.claim())
+
+        claimed.process()
+        dataimport.refresh_from_db()
+        self.assertEqual(dataimport.status, STATUS.active)
+        self.assertEqual(dataimport.progress, 3)
+        self.assertEqual(dataimport.datafields.count(), 3)
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+
+    def test_process_when_file_contains_errors(self):
+        """
+        Test process data import with file that contains errors.
+
+        Data import should become invalid, with errors stored.
+        """
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.csv', delete=False) as file:
+            file.write('ID,Name\n1,Meat\n2,Fish\n')
+        self.files.append(file.name)
+
+        with open(file.name) as file_obj:
+            dataimport = DataImportFactory.create(
+                status=STATUS.pending,
+                file=File(file_obj)
+            )
+        self.files.append(dataimport.file.path)
+
+        DataImport.objects.claim().process()
+        dataimport.refresh_from_db()
+        self.assertEqual(dataimport.status, STATUS.invalid)
+        self.assertEqual(len(dataimport.errors), 2)
+        self.assertEqual(dataimport.datafeatures.count(), 0)
+
+    def test_claim_interrupted_and_process(self):
+        """
+        Test claim and process data import interrupted while processing.
+
+        File should be read again, or the data import should become invalid
+        when aborted.
+        """
+        dataimports = DataImportFactory.create_batch(2, status=STATUS.pending)
+        self.files.extend(
+            dataimport.file.path for dataimport in dataimports
+        )
+        DataImport.objects.filter(
+            pk__in=[dataimport.id for dataimport in dataimports]
+        ).update(status=STATUS.processing)
+        self.assertIsNone(
+            DataImport.objects.claim_interrupted(timedelta(minutes=10))
+        )
+
+        DataImport.objects.filter(
+            pk__in=[dataimport.id for dataimport in dataimports]
+        ).update(modified=timezone.now() - timedelta(minutes=11))
+
+        claimed = DataImport.objects.claim_interrupted(timedelta(minutes=10))
+        self.assertEqual(claimed, dataimports[0])
+        claimed.process()
+
+        aborted = DataImport.objects.claim_interrupted(timedelta(minutes=10))
+        self.assertEqual(aborted, dataimports[1])
+        aborted.abort()
+
+        self.assertIsNone(
+            DataImport.objects.claim_interrupted(timedelta(minutes=10))
+        )
+
+        dataimports[0].refresh_from_db()
+        self.assertEqual(dataimports[0].status, STATUS.active)
+        self.assertEqual(dataimports[0].datafeatures.count(), 3)
+
+        dataimports[1].refresh_from_db()
+        self.assertEqual(dataimports[1].status, STATUS.invalid)
+        self.assertEqual(dataimports[1].datafeatures.count(), 0)
+
+    @override_settings(DATAIMPORTS_BATCH_SIZE=1)
+    def test_process_when_file_is_malformed(self):
+        """
+        Test process data import with file that is cut off.
+
+        Data import should become invalid, data features stored before the
+        file broke off should be rolled back.
+        """
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.geojson', delete=False) as file:
+            file.write(
+                '{"type": "FeatureCollection", "features": ['
+                '{"type": "Feature", "properties": {"Name": "Meat"}, '
+                '"geometry": {"type": "Point", "coordinates": [30, 10]}}, '
+                '{"type": "Feature", "properties": {"Name": "Fish"}, '
+                '"geometry": {"type": "Point", "coordinates": [10, 30]}}, '
+                '{"type": '
+            )
+        self.files.append(file.name)
+
+        with open(file.name) as file_obj:
+            dataimport = DataImportFactory.create(
+                status=STATUS.pending,
+                dataformat='GeoJSON',
+                file=File(file_obj)
+            )
+        self.files.append(dataimport.file.path)
+
+        DataImport.objects.claim().process()
+        dataimport.refresh_from_db()
+        self.assertEqual(dataimport.status, STATUS.invalid)
+        self.assertEqual(dataimport.datafeatures.count(), 0)
+
+
+class ContributionImportTest(TestCase):
+    """Test importing data features as contributions in the background."""
+
+    def setUp(self):
+        """Set up test."""
+        project = ProjectFactory.create()
+        self.dataimport = DataImportFactory.create(
+            keys=['Name'],
+            project=project,
+            category=CategoryFactory.create(project=project)
+        )
+        self.file = self.dataimport.file.path
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.file)
+
+    def test_claim_and_process(self):
+        """
+        Test claim and process pending contribution import.
+
+        Data features should not be imported until it is processed.
+        """
+        contributionimport = ContributionImport.objects.create(
+            selection={'exclude': []},
+            dataimport=self.dataimport,
+            creator=self.dataimport.creator
+        )
+        self.assertEqual(contributionimport.status, 'pending')
+        self.assertEqual(contributionimport.total, 3)
+        self.assertIsNone(contributionimport.get_rate())
+
+        claimed = ContributionImport.objects.claim()
+        self.assertEqual(claimed, contributionimport)
+        self.assertEqual(claimed.status, 'processing')
+        self.assertIsNone(ContributionImport.objects.claim())
+        self.assertEqual(Observation.objects.count(), 0)
+
+        claimed.process()
+        contributionimport.refresh_from_db()
+        self.assertEqual(contributionimport.status, 'completed')
+        self.assertEqual(contributionimport.processed, 3)
+        self.assertEqual(contributionimport.imported, 3)
+        self.assertEqual(contributionimport.failed, 0)
+        self.assertIsNotNone(contributionimport.finished)
+        self.assertGreater(contributionimport.get_rate(), 0)
+        self.assertEqual(Observation.objects.count(), 3)
+
+    @override_settings(DATAIMPORTS_IMPORT_WORKERS=4)
+    def test_process_without_parallel(self):
+        """
+        Test process contribution import within a request.
+
+        Data features should be imported by a single process, whatever the
+        number of workers set.
+        """
+        contributionimport = ContributionImport.objects.create(
+            selection={'exclude': []},
+            dataimport=self.dataimport,
+            creator=self.dataimport.creator
+        )
+        contributionimport.process()
+
+        contributionimport.refresh_from_db()
+        self.assertEqual(contributionimport.status, 'completed')
+        self.assertEqual(contributionimport.workers, 1)
+        self.assertIsNone(contributionimport.speedup)
+        self.assertEqual(contributionimport.imported, 3)
+
+    @override_settings(DATAIMPORTS_IMPORT_BATCH_SIZE=1)
+    def test_claim_interrupted_and_resume(self):
+        """
+        Test claim and resume interrupted contribution import.
+
+        Only data features after the checkpoint should be imported.
+        """
+        ids = list(self.dataimport.datafeatures.order_by(
+            'id'
+        ).values_list('id', flat=True))
+        contributionimport = ContributionImport.objects.create(
+            selection={'exclude': []},
+            dataimport=self.dataimport,
+            creator=self.dataimport.creator,
+            status='processing',
+            started=timezone.now(),
+            processed=1,
+            imported=1,
+            checkpoint=ids[0],
+            post_interactions={}
+        )
+        self.dataimport.datafeatures.filter(id=ids[0]).update(imported=True)
+        self.assertIsNone(
+            ContributionImport.objects.claim_interrupted(timedelta(minutes=10))
+        )
+
+        ContributionImport.objects.filter(pk=contributionimport.pk).update(
+            modified=timezone.now() - timedelta(minutes=11)
+        )
+        claimed = ContributionImport.objects.claim_interrupted(
+            timedelta(minutes=10)
+        )
+        self.assertEqual(claimed, contributionimport)
+        self.assertIsNone(
+            ContributionImport.objects.claim_interrupted(timedelta(minutes=10))
+        )
+
+        claimed.process()
+        contributionimport.refresh_from_db()
+        self.assertEqual(contributionimport.status, 'completed')
+        self.assertEqual(contributionimport.processed, 3)
+        self.assertEqual(contributionimport.imported, 3)
+        self.assertEqual(contributionimport.failed, 0)
+        self.assertEqual(contributionimport.checkpoint, ids[2])
+        self.assertIsNone(contributionimport.post_interactions)
+        self.assertEqual(Observation.objects.count(), 2)
+
+
+class DataFieldTest(TestCase):
+    """Test data field model."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+        self.datafeatures = [
+            DataFeatureFactory.create(
+                dataimport=self.dataimport,
+                properties={'Field Name': 'Value', 'other': 1}
+            ),
+            DataFeatureFactory.create(
+                dataimport=self.dataimport,
+                properties={'other': 2}
+            )
+        ]
+
+    def test_convert_to_field(self):
+        """Test converting data field to field."""
+        datafield = DataFieldFactory.create(
+            name='Field Name',
+            dataimport=self.dataimport
+        )
+        field = datafield.convert_to_field('Field Name', 'TextField')
+
+        self.assertEqual(field.key, 'field-name')
+        self.assertEqual(datafield.key, 'field-name')
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[0].id).properties,
+            {'field-name': 'Value', 'other': 1}
+        )
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[1].id).properties,
+            {'other': 2}
+        )
+
+    def test_rename_properties(self):
+        """Test renaming properties of all data features at once."""
+        with self.assertNumQueries(1):
+            updated = DataFeature.objects.rename_properties(
+                self.dataimport,
+                {'Field Name': 'other', 'other': 'another'}
+            )
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[0].id).properties,
+            {'other': 'Value', 'another': 1}
+        )
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[1].id).properties,
+            {'another': 2}
+        )
+
+    def test_rename_properties_to_existing_key(self):
+        """Test renaming property to a key that exists already."""
+        DataFeature.objects.rename_properties(
+            self.dataimport,
+            {'Field Name': 'other'}
+        )
+
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[0].id).properties,
+            {'other': 'Value'}
+        )
+        self.assertEqual(
+            DataFeature.objects.get(pk=self.datafeatures[1].id).properties,
+            {'other': 2}
+        )
+
+    def test_rename_properties_when_nothing_to_rename(self):
+        """Test renaming properties when keys do not change."""
+        with self.assertNumQueries(0):
+            updated = DataFeature.objects.rename_properties(
+                self.dataimport,
+                {'other': 'other'}
+            )
+
+        self.assertEqual(updated, 0)
+
+
+class PostSaveDataImportTest(TestCase):
+    """Test post save for data import."""
+
+    def setUp(self):
+        """Set up test."""
+        self.file = None
+
+    def tearDown(self):
+        """Tear down test."""
+        if self.file:
+            os.remove(self.file)
+
+    def test_post_save_dataimport_with_geojson(self):
+        """
+        Test create data import from GeoJSON.
+
+        Data fields and data features should be created from the file.
+        """
+        dataimport = DataImportFactory.create(
+            dataformat='GeoJSON',
+            file=File(open(file_helpers.get_geojson_file().name))
+        )
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.datafields.count(), 3)
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+        self.assertEqual(
+            sorted(
+                datafeature.properties['Name']
+                for datafeature in dataimport.datafeatures.all()
+            ),
+            ['Fish', 'Meat', 'Vegetables']
+        )
+        self.assertIn(
+            'NumericField',
+            dataimport.datafields.get(name='ID').types
+        )
+
+    def test_post_save_dataimport_with_stats(self):
+        """
+        Test create data import, measuring each stage.
+
+        Stats should be stored on the data import and sent as a signal.
+        """
+        received = []
+
+        def receiver(sender, dataimport, stats, **kwargs):
+            received.append(stats)
+
+        dataimport_parsed.connect(receiver)
+
+        try:
+            dataimport = DataImportFactory.create()
+        finally:
+            dataimport_parsed.disconnect(receiver)
+
+        self.file = dataimport.file.path
+
+        stats = DataImport.objects.get(pk=dataimport.id).stats
+        self.assertEqual(received, [stats])
+        self.assertEqual(
+            [stage['name'] for stage in stats['stages']],
+            [
+                'inference',
+                'ogr',
+                'insert',
+                'geometries',
+                'attach',
+                'read',
+                'datafields'
+            ]
+        )
+        self.assertEqual(
+            dict(
+                (stage['name'], stage['rows']) for stage in stats['stages']
+            ),
+            {
+                'inference': 3,
+                'ogr': 6,
+                'insert': 3,
+                'geometries': 3,
+                'attach': 3,
+                'read': 3,
+                'datafields': 3
+            }
+        )
+        self.assertGreaterEqual(
+            stats['seconds'] + 0.001,
+            sum(stage['seconds'] for stage in stats['stages'])
+        )
+
+    def test_post_save_dataimport_with_two_geometry_fields(self):
+        """
+        Test create data import from CSV with two fields of WKT geometries.
+
+        The first field is ruled out by the last row, all data features
+        should take their geometries from the second one.
+        """
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.csv', delete=False) as file:
+            file.write(
+                'First,Second,Name\n'
+                '"POINT (1 1)","POINT (30 10)",Meat\n'
+                '"POINT (2 2)","POINT (10 30)",Fish\n'
+                'Nowhere,"POINT (20 20)",Vegetables\n'
+            )
+
+        try:
+            with open(file.name) as file_obj:
+                dataimport = DataImportFactory.create(file=File(file_obj))
+        finally:
+            os.remove(file.name)
+
+        self.file = dataimport.file.path
+
+        self.assertEqual(
+            sorted(
+                datafeature.geometry.coords
+                for datafeature in dataimport.datafeatures.all()
+            ),
+            [(10.0, 30.0), (20.0, 20.0), (30.0, 10.0)]
+        )
+        self.assertEqual(
+            sorted(dataimport.datafields.values_list('name', flat=True)),
+            ['First', 'Name']
+        )
+
+    @override_settings(DATAIMPORTS_BATCH_SIZE=2)
+    def test_post_save_dataimport_in_batches(self):
+        """
+        Test create data import with batches smaller than the file.
+
+        All data features should be stored.
+        """
+        dataimport = DataImportFactory.create()
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.datafields.count(), 3)
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+
+    @override_settings(DATAIMPORTS_INGESTION='copy')
+    def test_post_save_dataimport_with_copy(self):
+        """
+        Test create data import with COPY ingestion.
+
+        All data features should be stored, same as with inserts.
+        """
+        dataimport = DataImportFactory.create()
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.datafields.count(), 3)
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+
+        datafeature = dataimport.datafeatures.get(properties__ID='1')
+        self.assertEqual(datafeature.geometry.geom_type, 'Point')
+        self.assertEqual(datafeature.geometry.coords, (30.0, 10.0))
+        self.assertEqual(datafeature.properties['Name'], 'Meat')
+        self.assertFalse(datafeature.imported)
+
+    @override_settings(
+        DATAIMPORTS_INFERENCE='sample',
+        DATAIMPORTS_INFERENCE_SAMPLE_SIZE=2
+    )
+    def test_post_save_dataimport_with_sample_inference(self):
+        """
+        Test create data import with types inferred from a sample.
+
+        All data features should be stored, the mode should be recorded.
+        """
+        dataimport = DataImportFactory.create()
+        self.file = dataimport.file.path
+
+        self.assertEqual(dataimport.inference, 'sample')
+        self.assertEqual(
+            DataImport.objects.get(pk=dataimport.id).inference,
+            'sample'
+        )
+        self.assertEqual(dataimport.datafields.count(), 3)
+        self.assertEqual(dataimport.datafeatures.count(), 3)
+        self.assertEqual(dataimport.get_flagged_datafeatures().count(), 0)
+        self.assertIn(
+            'NumericField',
+            dataimport.datafields.get(name='ID').types
+        )
+
+
 class PostSaveProjectTest(TestCase):
     """Test post save for project."""
 
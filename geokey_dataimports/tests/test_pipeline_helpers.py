@@ -0,0 +1,191 @@
+"""All tests for pipeline helpers."""
+
+from django.test import TestCase
+
+from ..helpers.inference_helpers import TypeInference
+from ..helpers.pipeline_helpers import (
+    infer_types,
+    attach_geometries,
+    reservoir_sample,
+    validate_types,
+    extract_geometries
+)
+
+
+class InferTypesTest(TestCase):
+    """Test infer_types method."""
+
+    def test_method_with_rows(self):
+        """Test with rows that have geometries in their properties."""
+        inference = TypeInference()
+        features = list(infer_types([
+            {'line': 1, 'properties': {'WKT': 'POINT (30 10)', 'ID': '1'}},
+            {'line': 2, 'properties': {'WKT': 'POINT (10 30)', 'ID': '2'}}
+        ], inference))
+
+        self.assertEqual(inference.geometryfield, 'WKT')
+        self.assertIn('NumericField', inference.columns['ID'].types)
+        self.assertNotIn('GeometryField', inference.columns['ID'].types)
+        self.assertEqual(
+            features[0]['geometries'],
+            {'WKT': {'type': 'Point', 'coordinates': [30.0, 10.0]}}
+        )
+
+    def test_method_with_features(self):
+        """Test with features that have their own geometry."""
+        inference = TypeInference()
+        features = list(infer_types([{
+            'geometry': {'type': 'Point', 'coordinates': [30, 10]},
+            'properties': {'Date': '2014-09-21'}
+        }], inference))
+
+        self.assertNotIn('geometries', features[0])
+        self.assertIn('DateField', inference.columns['Date'].types)
+        self.assertNotIn('GeometryField', inference.columns['Date'].types)
+
+
+class ReservoirSampleTest(TestCase):
+    """Test reservoir_sample method."""
+
+    def test_method(self):
+        """Test that the sample is spread across all items."""
+        sample = reservoir_sample(iter(range(10000)), 100, seed=1)
+
+        self.assertEqual(len(sample), 100)
+        self.assertEqual(len(set(sample)), 100)
+        self.assertTrue(any(item >= 5000 for item in sample))
+        self.assertEqual(sample, reservoir_sample(range(10000), 100, seed=1))
+
+    def test_method_with_fewer_items(self):
+        """Test with fewer items than the size of the sample."""
+        self.assertEqual(reservoir_sample(iter([1, 2, 3]), 10), [1, 2, 3])
+
+
+class AttachGeometriesTest(TestCase):
+    """Test attach_geometries method."""
+
+    def test_method(self):
+        """Test that only the geometry field is parsed."""
+        inference = TypeInference()
+        inference.observe({'A': 'POINT (1 1)', 'B': 'POINT (30 10)'}, True)
+        inference.observe({'A': 'Nowhere', 'B': 'POINT (10 30)'}, True)
+
+        features = list(attach_geometries([
+            {'properties': {'A': 'POINT (1 1)', 'B': 'POINT (3 4)'}},
+            {'properties': {'A': 'Nowhere', 'B': 'Nowhere'}},
+            {'geometry': {'type': 'Point', 'coordinates': [30, 10]}}
+        ], inference))
+
+        self.assertEqual(inference.geometryfield, 'B')
+        self.assertEqual(
+            features[0]['geometries'],
+            {'B': {'type': 'Point', 'coordinates': [3.0, 4.0]}}
+        )
+        self.assertEqual(features[1]['geometries'], {})
+        self.assertNotIn('geometries', features[2])
+
+
+class ValidateTypesTest(TestCase):
+    """Test validate_types method."""
+
+    def test_method(self):
+        """Test with rows that contradict the types inferred."""
+        inference = TypeInference()
+        inference.observe({'WKT': 'POINT (30 10)', 'ID': '1'}, True)
+
+        features = list(validate_types([
+            {'line': 2, 'properties': {'WKT': 'POINT (10 30)', 'ID': '2'}},
+            {'line': 3, 'properties': {'WKT': 'POINT (20 20)', 'ID': 'Three'}},
+            {'line': 4, 'properties': {'WKT': 'Nowhere', 'ID': '4'}}
+        ], inference))
+
+        self.assertEqual(features[0]['conflicts'], [])
+        self.assertEqual(
+            features[0]['geometries'],
+            {'WKT': {'type': 'Point', 'coordinates': [10.0, 30.0]}}
+        )
+        self.assertEqual(features[1]['conflicts'], ['ID'])
+        self.assertEqual(features[2]['geometries'], {})
+        self.assertEqual(features[2]['conflicts'], ['WKT'])
+        self.assertIn('NumericField', inference.columns['ID'].types)
+
+
+class ExtractGeometriesTest(TestCase):
+    """Test extract_geometries method."""
+
+    def test_method_is_lazy(self):
+        """Test that features get yielded one by one."""
+        inference = TypeInference()
+        errors = []
+        features = extract_geometries(infer_types(iter([
+            {'line': 1, 'properties': {'WKT': 'POINT (30 10)'}},
+            {'line': 2, 'properties': {'WKT': 'POINT (10 30)'}}
+        ]), inference), inference, errors)
+
+        geometry, properties, conflicts = next(features)
+        self.assertEqual(geometry['coordinates'], [30.0, 10.0])
+        self.assertEqual(properties, {'WKT': 'POINT (30 10)'})
+        self.assertIsNone(conflicts)
+        self.assertEqual(len(list(features)), 1)
+        self.assertEqual(errors, [])
+
+    def test_method_after_inference(self):
+        """Test that all rows take the field inferred from all of them."""
+        rows = [
+            {'line': line, 'properties': {'A': first, 'B': second}}
+            for line, (first, second) in enumerate([
+                ('POINT (1 1)', 'POINT (3 4)'),
+                ('POINT (2 2)', 'POINT (5 6)'),
+                ('Nowhere', 'POINT (7 8)')
+            ], 1)
+        ]
+        inference = TypeInference()
+        errors = []
+        list(extract_geometries(
+            infer_types([dict(row) for row in rows], inference),
+            inference,
+            errors
+        ))
+        features = list(extract_geometries(
+            attach_geometries([dict(row) for row in rows], inference),
+            inference,
+            errors
+        ))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [geometry['coordinates'] for geometry, _, _ in features],
+            [[3.0, 4.0], [5.0, 6.0], [7.0, 8.0]]
+        )
+
+    def test_method_with_flagged_geometry(self):
+        """Test that rows validated with no geometry are flagged."""
+        inference = TypeInference()
+        inference.observe({'WKT': 'POINT (30 10)', 'ID': '1'}, True)
+        errors = []
+        features = list(extract_geometries(validate_types([
+            {'line': 2, 'properties': {'WKT': 'POINT (10 30)', 'ID': '2'}},
+            {'line': 3, 'properties': {'WKT': 'Nowhere', 'ID': 'Three'}}
+        ], inference), inference, errors))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(features[0][2], [])
+        self.assertEqual(
+            features[1],
+            (None, {'WKT': 'Nowhere', 'ID': 'Three'}, ['ID', 'WKT'])
+        )
+
+    def test_method_with_no_geometry(self):
+        """Test with rows that have no geometry set."""
+        inference = TypeInference()
+        errors = []
+        features = list(extract_geometries(infer_types([
+            {'line': 1, 'properties': {'WKT': 'POINT (30 10)'}},
+            {'line': 2, 'properties': {'Name': 'Fish'}}
+        ], inference), inference, errors))
+
+        self.assertEqual(len(features), 1)
+        self.assertEqual(errors, [{
+            'line': 2,
+            'messages': ['The entry has no geometry set.']
+        }])
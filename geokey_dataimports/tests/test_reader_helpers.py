@@ -0,0 +1,188 @@
+"""All tests for reader helpers."""
+
+import os
+import json
+
+from django.test import TestCase
+
+from six import StringIO
+
+from .helpers import file_helpers
+from ..helpers.reader_helpers import (
+    iter_geojson_features,
+    iter_kml_features,
+    table_to_json
+)
+
+
+class IterGeoJSONFeaturesTest(TestCase):
+    """Test iter_geojson_features method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.features = []
+        for i in range(20):
+            self.features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [i, 1.5]},
+                'properties': {'Name': 'Feature %s ]},[' % i, 'Count': i}
+            })
+
+    def test_method_with_small_chunks(self):
+        """Test with chunks much smaller than a single feature."""
+        content = json.dumps({
+            'type': 'FeatureCollection',
+            'crs': {'type': 'name', 'properties': {'name': 'EPSG:4326'}},
+            'features': self.features,
+            'bbox': [0, 1.5, 19, 1.5]
+        }, indent=2)
+
+        for chunk_size in [1, 7, 100, 65536]:
+            self.assertEqual(
+                list(iter_geojson_features(
+                    StringIO(content),
+                    chunk_size=chunk_size
+                )),
+                self.features
+            )
+
+    def test_method_is_lazy(self):
+        """Test that features get yielded before the file is fully read."""
+        content = StringIO(json.dumps({
+            'type': 'FeatureCollection',
+            'features': self.features
+        }))
+
+        features = iter_geojson_features(content, chunk_size=10)
+        self.assertEqual(next(features), self.features[0])
+        self.assertLess(content.tell(), len(content.getvalue()))
+
+    def test_method_with_no_features(self):
+        """Test with empty collection."""
+        self.assertEqual(
+            list(iter_geojson_features(StringIO('{"features": []}'))),
+            []
+        )
+
+    def test_method_with_missing_features(self):
+        """Test with objects that are not feature collections."""
+        for content in ['{}', json.dumps(self.features[0])]:
+            with self.assertRaises(KeyError):
+                list(iter_geojson_features(StringIO(content)))
+
+    def test_method_with_invalid_file(self):
+        """Test with file that is not a JSON object."""
+        with self.assertRaises(ValueError):
+            list(iter_geojson_features(StringIO('[1, 2, 3]')))
+
+    def test_method_with_malformed_feature(self):
+        """Test that malformed features are not read until the end of file."""
+        content = StringIO('{"features": [{"type": ' + ' ' * 1000)
+
+        with self.assertRaises(ValueError):
+            list(iter_geojson_features(content, chunk_size=10, max_size=100))
+
+        self.assertLess(content.tell(), 200)
+
+    def test_method_with_long_feature(self):
+        """Test with feature longer than the maximum size."""
+        content = json.dumps({
+            'type': 'FeatureCollection',
+            'features': self.features
+        })
+
+        with self.assertRaises(ValueError):
+            list(iter_geojson_features(
+                StringIO(content),
+                chunk_size=10,
+                max_size=50
+            ))
+
+        self.assertEqual(
+            list(iter_geojson_features(
+                StringIO(content),
+                chunk_size=10,
+                max_size=500
+            )),
+            self.features
+        )
+
+
+class IterKMLFeaturesTest(TestCase):
+    """Test iter_kml_features method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.file = file_helpers.get_kml_file().name
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.file)
+
+    def test_method(self):
+        """Test with attributes from descriptions and extended data."""
+        features = list(iter_kml_features(self.file))
+
+        self.assertEqual(len(features), 3)
+        self.assertEqual(
+            features[0]['geometry'],
+            {'type': 'Point', 'coordinates': [30.0, 10.0]}
+        )
+        self.assertEqual(features[1]['geometry']['type'], 'LineString')
+        self.assertEqual(features[2]['geometry']['type'], 'Polygon')
+        self.assertEqual(
+            [feature['properties'] for feature in features],
+            [
+                {
+                    'ID': '1',
+                    'Name': 'Meat',
+                    'Short Description': 'Meat is good.'
+                },
+                {
+                    'ID': '2',
+                    'Name': 'Fish',
+                    'Short Description': 'Fish is healthy.'
+                },
+                {
+                    'ID': '3',
+                    'Name': 'Vegetables',
+                    'Short Description': 'Vegetables are even healthier.'
+                }
+            ]
+        )
+
+    def test_method_is_lazy(self):
+        """Test that placemarks get yielded one by one."""
+        features = iter_kml_features(self.file)
+
+        self.assertEqual(next(features)['properties']['Name'], 'Meat')
+        self.assertEqual(len(list(features)), 2)
+
+
+class TableToJSONTest(TestCase):
+    """Test table_to_json method."""
+
+    def test_method(self):
+        """Test with a table of field names and values."""
+        self.assertEqual(
+            table_to_json(
+                '<table><tr><td>Name</td><td>Fish &amp; <b>chips</b></td></tr>'
+                '<tr><td>Price</td><td>5</td></tr></table>'
+            ),
+            [{'Name': 'Fish & chips', 'Price': '5'}]
+        )
+
+    def test_method_with_more_tables(self):
+        """Test that only the first table is read."""
+        self.assertEqual(
+            table_to_json(
+                '<table><tr><td>Name</td><td>Fish</td></tr></table>'
+                '<table><tr><td>Name</td><td>Meat</td></tr>'
+                '<tr><td>Price</td><td>5</td></tr></table>'
+            ),
+            [{'Name': 'Fish'}]
+        )
+
+    def test_method_with_no_rows(self):
+        """Test with an empty table."""
+        self.assertEqual(table_to_json('<table></table>'), [])
@@ -0,0 +1,100 @@
+"""All tests for selection helpers."""
+
+import os
+
+from django.test import TestCase
+
+from .model_factories import DataImportFactory, DataFeatureFactory
+from ..helpers.selection_helpers import (
+    get_ranges,
+    parse_selection,
+    filter_selection
+)
+
+
+class GetRangesTest(TestCase):
+    """Test get_ranges method."""
+
+    def test_method(self):
+        """Test that consecutive IDs are collapsed."""
+        self.assertEqual(get_ranges([]), [])
+        self.assertEqual(
+            get_ranges([7, 1, 2, 3, 5, 7, 8]),
+            [[1, 3], [5, 5], [7, 8]]
+        )
+
+
+class ParseSelectionTest(TestCase):
+    """Test parse_selection method."""
+
+    def test_method(self):
+        """Test with valid selections."""
+        self.assertEqual(parse_selection(None), {'ranges': []})
+        self.assertEqual(parse_selection('[3, 1, 2]'), {'ranges': [[1, 3]]})
+        self.assertEqual(
+            parse_selection('{"exclude": [9, 3]}'),
+            {'exclude': [3, 9]}
+        )
+        self.assertEqual(
+            parse_selection('{"ranges": [[1, 2], [4, 8]]}'),
+            {'ranges': [[1, 2], [4, 8]]}
+        )
+
+    def test_method_with_invalid_selections(self):
+        """Test with invalid selections."""
+        for value in [
+            'all',
+            '["1"]',
+            '{"exclude": "1"}',
+            '{"ranges": [[2, 1]]}',
+            '{"ranges": [[1]]}',
+            '{"ranges": [], "exclude": []}',
+            '{}'
+        ]:
+            self.assertRaises(ValueError, parse_selection, value)
+
+
+class FilterSelectionTest(TestCase):
+    """Test filter_selection method."""
+
+    def setUp(self):
+        """Set up test."""
+        self.dataimport = DataImportFactory.create()
+        self.file = self.dataimport.file.path
+        self.ids = [
+            DataFeatureFactory.create(dataimport=self.dataimport).id
+            for index in range(5)
+        ]
+        self.datafeatures = self.dataimport.datafeatures.filter(
+            id__in=self.ids
+        )
+
+    def tearDown(self):
+        """Tear down test."""
+        os.remove(self.file)
+
+    def get_ids(self, selection):
+        """Get IDs of data features selected."""
+        return sorted(filter_selection(
+            self.datafeatures,
+            selection
+        ).values_list('id', flat=True))
+
+    def test_method_with_exclude(self):
+        """Test with all data features except some."""
+        self.assertEqual(self.get_ids({'exclude': []}), self.ids)
+        self.assertEqual(
+            self.get_ids({'exclude': [self.ids[1], self.ids[3]]}),
+            [self.ids[0], self.ids[2], self.ids[4]]
+        )
+
+    def test_method_with_ranges(self):
+        """Test with ranges of IDs."""
+        self.assertEqual(self.get_ids({'ranges': []}), [])
+        self.assertEqual(
+            self.get_ids({'ranges': [
+                [self.ids[0], self.ids[1]],
+                [self.ids[4], self.ids[4]]
+            ]}),
+            [self.ids[0], self.ids[1], self.ids[4]]
+        )
@@ -0,0 +1,45 @@
+"""All tests for stats helpers."""
+
+from django.test import TestCase
+
+from ..helpers.stats_helpers import PipelineStats
+
+
+class PipelineStatsTest(TestCase):
+    """Test PipelineStats."""
+
+    def test_timed(self):
+        """Test that each stage is timed and its items counted."""
+        stats = PipelineStats()
+        items = stats.timed(
+            (item * 2 for item in stats.timed(range(5), 'read')),
+            'double'
+        )
+
+        with stats.stage('store'):
+            stored = list(items)
+            stats.count('store', len(stored))
+
+        result = stats.to_dict()
+
+        self.assertEqual(stored, [0, 2, 4, 6, 8])
+        self.assertEqual(
+            [(stage['name'], stage['rows']) for stage in result['stages']],
+            [('store', 5), ('double', 5), ('read', 5)]
+        )
+        self.assertGreaterEqual(
+            result['seconds'] + 0.001,
+            sum(stage['seconds'] for stage in result['stages'])
+        )
+        self.assertEqual(stats.running, [])
+
+    def test_stage_with_error(self):
+        """Test that a stage stops when it fails."""
+        stats = PipelineStats()
+
+        with self.assertRaises(ValueError):
+            with stats.stage('store'):
+                raise ValueError()
+
+        self.assertEqual(stats.running, [])
+        self.assertEqual(stats.to_dict()['stages'][0]['name'], 'store')
@@ -11,7 +11,10 @@ from ..views import (
     DataImportCreateCategoryPage,
     DataImportAssignFieldsPage,
     DataImportAllDataFeaturesPage,
-    RemoveDataImportPage
+    RemoveDataImportPage,
+    DataImportDataFeaturesAjax,
+    DataImportDataFeatureClustersAjax,
+    DataImportDataFeaturesTileAjax
 )
 
 
@@ -171,3 +174,83 @@ class UrlsTest(TestCase):
         )
         self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
         self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+
+    # ###########################
+    # TEST AJAX API
+    # ###########################
+
+    def test_ajax_dataimport_datafeatures_reverse(self):
+        """Test reverser for data import data features."""
+        reversed_url = reverse(
+            'geokey_dataimports:ajax_dataimport_datafeatures',
+            kwargs={'project_id': 1, 'dataimport_id': 5}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/ajax/projects/1/dataimports/5/datafeatures/'
+        )
+
+    def test_ajax_dataimport_datafeatures_resolve(self):
+        """Test resolver for data import data features."""
+        resolved_url = resolve('/ajax/projects/1/dataimports/5/datafeatures/')
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportDataFeaturesAjax.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+
+    def test_ajax_dataimport_datafeature_clusters_reverse(self):
+        """Test reverser for data import data feature clusters."""
+        reversed_url = reverse(
+            'geokey_dataimports:ajax_dataimport_datafeature_clusters',
+            kwargs={'project_id': 1, 'dataimport_id': 5}
+        )
+        self.assertEqual(
+            reversed_url,
+            '/ajax/projects/1/dataimports/5/datafeatures/clusters/'
+        )
+
+    def test_ajax_dataimport_datafeature_clusters_resolve(self):
+        """Test resolver for data import data feature clusters."""
+        resolved_url = resolve(
+            '/ajax/projects/1/dataimports/5/datafeatures/clusters/'
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportDataFeatureClustersAjax.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+
+    def test_ajax_dataimport_datafeatures_tile_reverse(self):
+        """Test reverser for data import data features as vector tiles."""
+        reversed_url = reverse(
+            'geokey_dataimports:ajax_dataimport_datafeatures_tile',
+            kwargs={
+                'project_id': 1,
+                'dataimport_id': 5,
+                'zoom': 2,
+                'x': 1,
+                'y': 3
+            }
+        )
+        self.assertEqual(
+            reversed_url,
+            '/ajax/projects/1/dataimports/5/datafeatures/tiles/2/1/3.mvt'
+        )
+
+    def test_ajax_dataimport_datafeatures_tile_resolve(self):
+        """Test resolver for data import data features as vector tiles."""
+        resolved_url = resolve(
+            '/ajax/projects/1/dataimports/5/datafeatures/tiles/2/1/3.mvt'
+        )
+        self.assertEqual(
+            resolved_url.func.__name__,
+            DataImportDataFeaturesTileAjax.__name__
+        )
+        self.assertEqual(int(resolved_url.kwargs['project_id']), 1)
+        self.assertEqual(int(resolved_url.kwargs['dataimport_id']), 5)
+        self.assertEqual(int(resolved_url.kwargs['zoom']), 2)
+        self.assertEqual(int(resolved_url.kwargs['x']), 1)
+        self.assertEqual(int(resolved_url.kwargs['y']), 3)
@@ -7,7 +7,11 @@ from django.core.files import File
 from django.core.urlresolvers import reverse
 from django.http import HttpRequest
 from django.template.loader import render_to_string
-from django.test import TestCase, RequestFactory
+from django.db import connection
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APIRequestFactory, force_authenticate
 from django.contrib.messages import get_messages
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.contrib.auth.models import AnonymousUser
@@ -26,7 +30,7 @@ from geokey.contributions.models import Observation
 from .helpers import file_helpers
 from .model_factories import DataImportFactory
 from ..helpers.context_helpers import does_not_exist_msg
-from ..models import DataImport, DataField, DataFeature
+from ..models import DataImport, DataField, DataFeature, ContributionImport
 from ..forms import CategoryForm, DataImportForm
 from ..views import (
     IndexPage,
@@ -36,6 +40,10 @@ from ..views import (
     DataImportCreateCategoryPage,
     DataImportAssignFieldsPage,
     DataImportAllDataFeaturesPage,
+    DataImportProgressAjax,
+    DataImportDataFeaturesAjax,
+    DataImportDataFeatureClustersAjax,
+    DataImportDataFeaturesTileAjax,
     RemoveDataImportPage
 )
 
@@ -313,7 +321,9 @@ class AllDataImportsPageTest(TestCase):
                 'PLATFORM_NAME': get_current_site(self.request).name,
                 'user': self.request.user,
                 'messages': get_messages(self.request),
-                'project': self.project
+                'project': self.project,
+                'dataimports': list(self.project.dataimports.select_related(
+                    'category', 'creator'))
             }
         )
 
@@ -323,6 +333,29 @@ class AllDataImportsPageTest(TestCase):
             rendered
         )
 
+    def test_get_with_admin_queries(self):
+        """
+        Test GET with with admin, when there are more data imports.
+
+        It should not query more, counters are stored on data imports.
+        """
+        self.request.user = self.admin
+        DataImportFactory.create(project=self.project)
+
+        with CaptureQueriesContext(connection) as one:
+            self.view(self.request, project_id=self.project.id).render()
+
+        DataImportFactory.create_batch(2, project=self.project)
+
+        with CaptureQueriesContext(connection) as three:
+            response = self.view(
+                self.request,
+                project_id=self.project.id
+            ).render()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(one), len(three))
+
     def test_get_when_no_project(self):
         """
         Test GET with with admin, when project does not exist.
@@ -694,6 +727,41 @@ class AddDataImportPageTest(TestCase):
         self.assertEqual(DataField.objects.count(), 3)
         self.assertEqual(DataFeature.objects.count(), 3)
 
+    @override_settings(DATAIMPORTS_BACKGROUND=True)
+    def test_post_with_admin_when_processing_in_background(self):
+        """
+        Test POST with with admin, when files are processed in background.
+
+        It should add new pending data import without reading the file. Also,
+        it should redirect to a single data import page to show progress.
+        """
+        self.data['category_create'] = 'false'
+        self.data['category'] = self.category.id
+        request = self.factory.post(self.url, self.data)
+        request.user = self.admin
+
+        setattr(request, 'session', 'session')
+        messages = FallbackStorage(request)
+        setattr(request, '_messages', messages)
+
+        response = self.view(request, project_id=self.project.id)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(
+            reverse(
+                'geokey_dataimports:single_dataimport',
+                kwargs={
+                    'project_id': self.project.id,
+                    'dataimport_id': DataImport.objects.first().id
+                }
+            ),
+            response['location']
+        )
+        self.assertEqual(DataImport.objects.count(), 1)
+        self.assertEqual(DataImport.objects.first().status, 'pending')
+        self.assertEqual(DataField.objects.count(), 0)
+        self.assertEqual(DataFeature.objects.count(), 0)
+
     def test_post_when_wrong_data(self):
         """
         Test POST with with admin, when data is wrong.
@@ -2467,18 +2535,11 @@ class DataImportAllDataFeaturesPageTest(TestCase):
             category=self.category
         )
 
-        ids = []
-        self.datafeatures = {
-            'type': 'FeatureCollection',
-            'features': []
-        }
-        for datafeature in self.dataimport.datafeatures.all():
-            self.datafeatures['features'].append({
-                'type': 'Feature',
-                'id': datafeature.id,
-                'geometry': json.loads(datafeature.geometry.json)
-            })
-            ids.append(datafeature.id)
+        ids = list(self.dataimport.datafeatures.values_list('id', flat=True))
+        self.extent = DataFeature.objects.get_extent(
+            self.dataimport,
+            imported=False
+        )
 
         self.data = {
             'ids': json.dumps(ids)
@@ -2608,7 +2669,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(self.request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -2820,6 +2881,104 @@ class DataImportAllDataFeaturesPageTest(TestCase):
         self.assertEqual(DataFeature.objects.filter(imported=True).count(), 3)
         self.assertEqual(Observation.objects.count(), 3)
 
+        contributionimport = ContributionImport.objects.get()
+        self.assertEqual(contributionimport.status, 'completed')
+        self.assertEqual(contributionimport.total, 3)
+        self.assertEqual(contributionimport.processed, 3)
+        self.assertEqual(contributionimport.imported, 3)
+        self.assertEqual(contributionimport.failed, 0)
+
+    @override_settings(DATAIMPORTS_BACKGROUND=True)
+    def test_post_with_admin_when_importing_in_background(self):
+        """
+        Test POST with with admin, when data is imported in background.
+
+        It should add new pending contribution import without converting data
+        features to contributions.
+        """
+        request = self.factory.post(self.url, self.data)
+        request.user = self.admin
+
+        setattr(request, 'session', 'session')
+        messages = FallbackStorage(request)
+        setattr(request, '_messages', messages)
+
+        response = self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=self.dataimport.id
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(DataFeature.objects.filter(imported=True).count(), 0)
+        self.assertEqual(Observation.objects.count(), 0)
+
+        contributionimport = ContributionImport.objects.get()
+        self.assertEqual(contributionimport.status, 'pending')
+        self.assertEqual(contributionimport.total, 3)
+        self.assertEqual(contributionimport.creator, self.admin)
+
+    def test_post_with_admin_when_selecting_all_except(self):
+        """
+        Test POST with with admin, when all data features except one selected.
+
+        It should convert all other data features to contributions.
+        """
+        excluded = self.dataimport.datafeatures.order_by('id').first()
+        self.data = {'selection': json.dumps({'exclude': [excluded.id]})}
+        request = self.factory.post(self.url, self.data)
+        request.user = self.admin
+
+        setattr(request, 'session', 'session')
+        messages = FallbackStorage(request)
+        setattr(request, '_messages', messages)
+
+        response = self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=self.dataimport.id
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Observation.objects.count(), 2)
+        self.assertEqual(
+            list(DataFeature.objects.filter(
+                imported=False
+            ).values_list('id', flat=True)),
+            [excluded.id]
+        )
+
+        contributionimport = ContributionImport.objects.get()
+        self.assertEqual(contributionimport.total, 2)
+        self.assertEqual(
+            contributionimport.selection,
+            {'exclude': [excluded.id]}
+        )
+
+    def test_post_when_selection_is_not_valid(self):
+        """
+        Test POST with with admin, when selection is not valid.
+
+        It should not allow to convert data features to contributions.
+        """
+        self.data = {'selection': json.dumps({'exclude': 'all'})}
+        request = self.factory.post(self.url, self.data)
+        request.user = self.admin
+
+        setattr(request, 'session', 'session')
+        messages = FallbackStorage(request)
+        setattr(request, '_messages', messages)
+
+        response = self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=self.dataimport.id
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ContributionImport.objects.count(), 0)
+        self.assertEqual(Observation.objects.count(), 0)
+
     def test_post_when_no_ids(self):
         """
         Test POST with with admin, when no IDs are provided.
@@ -2965,7 +3124,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -3009,7 +3168,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -3052,7 +3211,7 @@ class DataImportAllDataFeaturesPageTest(TestCase):
                 'messages': get_messages(request),
                 'project': self.project,
                 'dataimport': self.dataimport,
-                'datafeatures': self.datafeatures
+                'extent': self.extent
             }
         )
 
@@ -3296,3 +3455,288 @@ class RemoveDataImportPageTest(TestCase):
             response['location']
         )
         self.assertEqual(DataImport.objects.count(), 1)
+
+
+class DataImportAjaxTestMixin(object):
+    """Set up a data import requested via AJAX, test access to it."""
+
+    view_class = None
+    url_name = None
+    data = {}
+    view_kwargs = {}
+
+    def setUp(self):
+        """Set up test."""
+        self.factory = APIRequestFactory()
+        self.view = self.view_class.as_view()
+
+        self.user = UserFactory.create()
+        self.admin = UserFactory.create()
+
+        self.project = ProjectFactory.create(add_admins=[self.admin])
+        self.dataimport = DataImportFactory.create(project=self.project)
+        self.url = '/'
+
+        if self.url_name:
+            self.url = reverse(
+                'geokey_dataimports:%s' % self.url_name,
+                kwargs={
+                    'project_id': self.project.id,
+                    'dataimport_id': self.dataimport.id
+                }
+            )
+
+    def tearDown(self):
+        """Tear down test."""
+        for dataimport in DataImport.objects.all():
+            if dataimport.file:
+                dataimport.file.delete()
+
+    def get_response(self, user, data=None, dataimport_id=None, **kwargs):
+        """Get the response for the user."""
+        request = self.factory.get(
+            self.url,
+            self.data if data is None else data
+        )
+        force_authenticate(request, user=user)
+
+        view_kwargs = dict(self.view_kwargs, **kwargs)
+        response = self.view(
+            request,
+            project_id=self.project.id,
+            dataimport_id=dataimport_id or self.dataimport.id,
+            **view_kwargs
+        )
+
+        if hasattr(response, 'render'):
+            response.render()
+
+        return response
+
+    def test_get_with_user(self):
+        """
+        Test GET with user.
+
+        It should not allow access, when user is not an administrator.
+        """
+        response = self.get_response(self.user)
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_when_no_dataimport(self):
+        """
+        Test GET with admin, when data import does not exist.
+
+        It should return 404 response.
+        """
+        response = self.get_response(self.admin, dataimport_id=634842156456)
+        self.assertEqual(response.status_code, 404)
+
+
+class DataImportProgressAjaxTest(DataImportAjaxTestMixin, TestCase):
+    """Test data import progress via AJAX."""
+
+    view_class = DataImportProgressAjax
+    url_name = 'ajax_dataimport_progress'
+
+    def test_get_with_admin(self):
+        """
+        Test GET with admin.
+
+        It should return progress of the latest contribution import.
+        """
+        response = self.get_response(self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {
+            'status': 'active',
+            'progress': 0,
+            'contributionimport': None
+        })
+
+        contributionimport = ContributionImport.objects.create(
+            selection={'exclude': []},
+            dataimport=self.dataimport,
+            creator=self.admin
+        )
+        contributionimport.update_progress(
+            2,
+            1,
+            self.dataimport.datafeatures.order_by('id')[1].id
+        )
+
+        response = self.get_response(self.admin)
+        progress = json.loads(response.content)['contributionimport']
+        self.assertEqual(progress['id'], contributionimport.id)
+        self.assertEqual(progress['status'], 'pending')
+        self.assertEqual(progress['total'], 3)
+        self.assertEqual(progress['processed'], 2)
+        self.assertEqual(progress['imported'], 1)
+        self.assertEqual(progress['failed'], 1)
+        self.assertIsNone(progress['rate'])
+
+
+class DataImportDataFeaturesAjaxTest(DataImportAjaxTestMixin, TestCase):
+    """Test data import data features via AJAX."""
+
+    view_class = DataImportDataFeaturesAjax
+    url_name = 'ajax_dataimport_datafeatures'
+
+    def test_get_with_admin(self):
+        """
+        Test GET with admin.
+
+        It should return all data features as GeoJSON.
+        """
+        response = self.get_response(self.admin)
+        self.assertEqual(response.status_code, 200)
+
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(content['type'], 'FeatureCollection')
+        self.assertEqual(content['count'], 3)
+        self.assertIsNone(content['next'])
+        self.assertIsNone(content['previous'])
+
+        datafeatures = self.dataimport.datafeatures.order_by('id')
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            [datafeature.id for datafeature in datafeatures]
+        )
+        self.assertEqual(
+            content['features'][0]['geometry'],
+            json.loads(datafeatures[0].geometry.json)
+        )
+        self.assertEqual(
+            content['features'][0]['properties'],
+            datafeatures[0].properties
+        )
+        self.assertFalse(content['features'][0]['imported'])
+
+    def test_get_with_admin_when_filtering(self):
+        """
+        Test GET with admin, when data features are filtered and paginated.
+
+        It should return data features on the page matching the filters.
+        """
+        datafeatures = self.dataimport.datafeatures.order_by('id')
+        datafeatures.filter(id=datafeatures[0].id).update(imported=True)
+
+        response = self.get_response(
+            self.admin,
+            {'imported': 'false', 'page_size': 1, 'page': 2}
+        )
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(content['count'], 2)
+        self.assertEqual(
+            [feature['id'] for feature in content['features']],
+            [datafeatures[2].id]
+        )
+        self.assertIsNone(content['next'])
+        self.assertIn('page=1', content['previous'])
+
+        response = self.get_response(self.admin, {'bbox': '-20,-20,-10,-10'})
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(content['count'], 0)
+        self.assertEqual(content['features'], [])
+
+    def test_get_when_filters_are_not_valid(self):
+        """
+        Test GET with admin, when filters or page are not valid.
+
+        It should return 400 response.
+        """
+        for data in [
+            {'bbox': '20,10,10,20'},
+            {'bbox': 'world'},
+            {'imported': 'yes'},
+            {'page': 0},
+            {'page_size': 100000}
+        ]:
+            response = self.get_response(self.admin, data)
+            self.assertEqual(response.status_code, 400)
+
+
+class DataImportDataFeatureClustersAjaxTest(DataImportAjaxTestMixin, TestCase):
+    """Test data import data feature clusters via AJAX."""
+
+    view_class = DataImportDataFeatureClustersAjax
+    url_name = 'ajax_dataimport_datafeature_clusters'
+    data = {'zoom': 0}
+
+    def test_get_with_admin(self):
+        """
+        Test GET with admin.
+
+        It should return fewer clusters when zoomed out, counting all data
+        features.
+        """
+        counts = {}
+        for zoom in [0, 10]:
+            response = self.get_response(self.admin, {'zoom': zoom})
+            self.assertEqual(response.status_code, 200)
+
+            content = json.loads(response.content.decode('utf-8'))
+            self.assertEqual(content['type'], 'FeatureCollection')
+            self.assertEqual(
+                sum(
+                    feature['properties']['count']
+                    for feature in content['features']
+                ),
+                3
+            )
+            counts[zoom] = len(content['features'])
+
+        self.assertLess(counts[0], counts[10])
+
+        response = self.get_response(
+            self.admin,
+            {'zoom': 0, 'imported': 'true'}
+        )
+        content = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(content['features'], [])
+
+    def test_get_when_zoom_is_not_valid(self):
+        """
+        Test GET with admin, when zoom level or filters are not valid.
+
+        It should return 400 response.
+        """
+        for data in [{}, {'zoom': 99}, {'zoom': 1, 'bbox': 'world'}]:
+            response = self.get_response(self.admin, data)
+            self.assertEqual(response.status_code, 400)
+
+
+class DataImportDataFeaturesTileAjaxTest(DataImportAjaxTestMixin, TestCase):
+    """Test data import data features as vector tiles via AJAX."""
+
+    view_class = DataImportDataFeaturesTileAjax
+    view_kwargs = {'zoom': '0', 'x': '0', 'y': '0'}
+
+    def test_get_with_admin(self):
+        """
+        Test GET with admin.
+
+        It should return the tile with data features, filtered by whether
+        they are imported.
+        """
+        response = self.get_response(self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Type'],
+            'application/vnd.mapbox-vector-tile'
+        )
+        self.assertIn(b'datafeatures', response.content)
+
+        response = self.get_response(self.admin, data={'imported': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+
+    def test_get_when_tile_is_not_valid(self):
+        """
+        Test GET with admin, when tile or filter is not valid.
+
+        It should return 400 response.
+        """
+        response = self.get_response(self.admin, zoom='1', x='2', y='0')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.get_response(self.admin, data={'imported': 'yes'})
+        self.assertEqual(response.status_code, 400)
@@ -10,7 +10,11 @@ from .views import (
     DataImportCreateCategoryPage,
     DataImportAssignFieldsPage,
     DataImportAllDataFeaturesPage,
-    RemoveDataImportPage
+    RemoveDataImportPage,
+    DataImportProgressAjax,
+    DataImportDataFeaturesAjax,
+    DataImportDataFeatureClustersAjax,
+    DataImportDataFeaturesTileAjax
 )
 
 
@@ -58,5 +62,32 @@ urlpatterns = [
         r'^admin/projects/(?P<project_id>[0-9]+)/'
         r'dataimports/(?P<dataimport_id>[0-9]+)/remove/$',
         RemoveDataImportPage.as_view(),
-        name='dataimport_remove')
+        name='dataimport_remove'),
+
+    # ###########################
+    # AJAX API
+    # ###########################
+
+    url(
+        r'^ajax/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/progress/$',
+        DataImportProgressAjax.as_view(),
+        name='ajax_dataimport_progress'),
+    url(
+        r'^ajax/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/datafeatures/$',
+        DataImportDataFeaturesAjax.as_view(),
+        name='ajax_dataimport_datafeatures'),
+    url(
+        r'^ajax/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/datafeatures/clusters/$',
+        DataImportDataFeatureClustersAjax.as_view(),
+        name='ajax_dataimport_datafeature_clusters'),
+    url(
+        r'^ajax/projects/(?P<project_id>[0-9]+)/'
+        r'dataimports/(?P<dataimport_id>[0-9]+)/'
+        r'datafeatures/tiles/(?P<zoom>[0-9]+)/(?P<x>[0-9]+)/(?P<y>[0-9]+)'
+        r'\.mvt$',
+        DataImportDataFeaturesTileAjax.as_view(),
+        name='ajax_dataimport_datafeatures_tile')
 ]
@@ -5,26 +5,41 @@
 
 import json
 
-from django.core.exceptions import ValidationError
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.views.generic import CreateView, FormView, TemplateView
+from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.db.models import IntegerField, Q, Count, Case, When
 from django.contrib import messages
 
 from braces.views import LoginRequiredMixin
 
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
 from geokey.projects.models import Project
 from geokey.projects.views import ProjectContext
 from geokey.categories.base import DEFAULT_STATUS
-from geokey.categories.models import Category, LookupValue
-from geokey.contributions.serializers import ContributionSerializer
-from geokey.socialinteractions.models import SocialInteractionPost
+from geokey.categories.models import Category
+from geokey.core.decorators import handle_exceptions_for_ajax
 
 from .helpers.context_helpers import does_not_exist_msg
-from .base import FORMAT
+from .helpers.field_helpers import assign_fields
+from .helpers.map_helpers import (
+    get_tile_bounds,
+    get_grid_size,
+    parse_imported,
+    parse_bbox,
+    parse_page,
+    parse_zoom
+)
+from .helpers.selection_helpers import parse_selection
+from .base import STATUS, FORMAT, JOB_STATUS
 from .exceptions import FileParseError
-from .models import DataImport
+from .models import DataImport, DataFeature, ContributionImport
 from .forms import CategoryForm, DataImportForm
 
 
@@ -88,6 +103,39 @@ class AllDataImportsPage(LoginRequiredMixin, ProjectContext, TemplateView):
 
     template_name = 'di_all_dataimports.html'
 
+    def get_context_data(self, project_id, *args, **kwargs):
+        """
+        GET method for the template.
+
+        Return the context to render the view. Overwrite the method by adding
+        all data imports of the project to the context, with categories and
+        creators loaded at once, so the page takes the same number of queries
+        however many data imports there are.
+
+        Parameters
+        ----------
+        project_id : int
+            Identifies the project in the database.
+
+        Returns
+        -------
+        dict
+            Context.
+        """
+        context = super(AllDataImportsPage, self).get_context_data(
+            project_id,
+            *args,
+            **kwargs
+        )
+        project = context.get('project')
+
+        if project:
+            context['dataimports'] = list(
+                project.dataimports.select_related('category', 'creator')
+            )
+
+        return context
+
 
 class AddDataImportPage(LoginRequiredMixin, ProjectContext, CreateView):
     """Add new data import page."""
@@ -157,6 +205,9 @@ class AddDataImportPage(LoginRequiredMixin, ProjectContext, CreateView):
                         'with WKT formatted geometries formats are supported.'
                     )
 
+                if getattr(settings, 'DATAIMPORTS_BACKGROUND', False):
+                    form.instance.status = STATUS.pending
+
                 if form.instance.dataformat:
                     try:
                         if self.request.POST.get('category_create') == 'false':
@@ -202,12 +253,23 @@ class AddDataImportPage(LoginRequiredMixin, ProjectContext, CreateView):
         """
         Set URL redirection when data import created successfully.
 
+        Data imports waiting for a background job redirect to a single data
+        import page, where progress is shown.
+
         Returns
         -------
         str
             URL for redirection.
         """
-        if self.object.category:
+        if self.object.status == STATUS.pending:
+            return reverse(
+                'geokey_dataimports:single_dataimport',
+                kwargs={
+                    'project_id': self.kwargs['project_id'],
+                    'dataimport_id': self.object.id
+                }
+            )
+        elif self.object.category:
             return reverse(
                 'geokey_dataimports:dataimport_assign_fields',
                 kwargs={
@@ -476,17 +538,17 @@ class DataImportCreateCategoryPage(DataImportContext, CreateView):
                 dataimport.save()
 
                 ids = data.getlist('ids')
-                keys = []
-
-                if ids:
-                    for datafield in dataimport.datafields.filter(id__in=ids):
-                        field = datafield.convert_to_field(
-                            data.get('fieldname_%s' % datafield.id),
-                            data.get('fieldtype_%s' % datafield.id)
-                        )
-                        keys.append(field.key)
+                fields = assign_fields(dataimport, [
+                    (
+                        datafield,
+                        None,
+                        data.get('fieldname_%s' % datafield.id),
+                        data.get('fieldtype_%s' % datafield.id)
+                    )
+                    for datafield in dataimport.datafields.filter(id__in=ids)
+                ]) if ids else []
 
-                dataimport.keys = keys
+                dataimport.keys = [field.key for field in fields]
                 dataimport.save()
 
                 messages.success(
@@ -569,23 +631,17 @@ class DataImportAssignFieldsPage(DataImportContext, TemplateView):
                 )
             else:
                 ids = data.getlist('ids')
-                keys = []
-
-                if ids:
-                    for datafield in dataimport.datafields.filter(id__in=ids):
-                        key = data.get('existingfield_%s' % datafield.id)
-
-                        if key:
-                            datafield.key = key
-                            datafield.save()
-
-                        field = datafield.convert_to_field(
-                            data.get('fieldname_%s' % datafield.id),
-                            data.get('fieldtype_%s' % datafield.id)
-                        )
-                        keys.append(field.key)
+                fields = assign_fields(dataimport, [
+                    (
+                        datafield,
+                        data.get('existingfield_%s' % datafield.id),
+                        data.get('fieldname_%s' % datafield.id),
+                        data.get('fieldtype_%s' % datafield.id)
+                    )
+                    for datafield in dataimport.datafields.filter(id__in=ids)
+                ]) if ids else []
 
-                dataimport.keys = keys
+                dataimport.keys = [field.key for field in fields]
                 dataimport.save()
 
                 messages.success(
@@ -612,7 +668,8 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
         GET method for the template.
 
         Return the context to render the view. Overwrite the method by adding
-        all data features (not imported yet) to the context.
+        the extent of all data features (not imported yet) to the context,
+        data features themselves are loaded as vector tiles.
 
         Returns
         -------
@@ -626,18 +683,10 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
         dataimport = context.get('dataimport')
 
         if dataimport:
-            datafeatures = []
-            for datafeature in dataimport.datafeatures.filter(imported=False):
-                datafeatures.append({
-                    'type': 'Feature',
-                    'id': datafeature.id,
-                    'geometry': json.loads(datafeature.geometry.json)
-                })
-
-            context['datafeatures'] = {
-                'type': 'FeatureCollection',
-                'features': datafeatures
-            }
+            context['extent'] = DataFeature.objects.get_extent(
+                dataimport,
+                imported=False
+            )
 
         return context
 
@@ -660,8 +709,9 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
             Redirects to a single data import when fields are assigned.
         django.http.HttpResponse
             Rendered template if project or data import does not exist, project
-            is locked, data import has no category associated with it, or data
-            import has no fields assigned.
+            is locked, data import has no category associated with it, data
+            import has no fields assigned, or selection of data features is
+            not valid.
         """
         data = self.request.POST
         context = self.get_context_data(project_id, dataimport_id)
@@ -684,78 +734,40 @@ class DataImportAllDataFeaturesPage(DataImportContext, TemplateView):
                     'The data import has no fields assigned.'
                 )
             else:
+                try:
+                    selection = parse_selection(
+                        data.get('selection') or data.get('ids')
+                    )
+                except ValueError:
+                    messages.error(
+                        request,
+                        'The selection of data features is not valid.'
+                    )
+                    return self.render_to_response(context)
 
-                # temporarily disable post interactions
-                post_interactions_backup = {}
-                post_interactions = SocialInteractionPost.objects.filter(project_id=project_id)
-                for post_interaction in post_interactions:
-                    post_interactions_backup[post_interaction] = post_interaction.status
-                    post_interaction.status = 'inactive'
-                    post_interaction.save()
-
-                ids = data.get('ids')
-
-                if ids:
-                    ids = json.loads(ids)
-                else:
-                    ids = []
-
-                lookupfields = dataimport.get_lookup_fields()
-                datafeatures = dataimport.datafeatures.filter(
-                    id__in=ids,
-                    imported=False
+                contributionimport = ContributionImport(
+                    selection=selection,
+                    dataimport=dataimport,
+                    creator=self.request.user
                 )
 
-                imported = 0
-                for datafeature in datafeatures:
-                    properties = datafeature.properties
-
-                    for key, value in dict(properties).items():
-                        if key not in dataimport.keys:
-                            del properties[key]
-                        elif key in lookupfields:
-                            value, created = LookupValue.objects.get_or_create(
-                                name=value,
-                                field=lookupfields[key]
-                            )
-                            properties[key] = value.id
-
-                    feature = {
-                        "location": {
-                            "geometry": datafeature.geometry
-                        },
-                        "meta": {
-                            "category": dataimport.category.id,
-                        },
-                        "properties": properties
-                    }
-
-                    serializer = ContributionSerializer(
-                        data=feature,
-                        context={
-                            'user': self.request.user,
-                            'project': dataimport.project
-                        }
+                if getattr(settings, 'DATAIMPORTS_BACKGROUND', False):
+                    contributionimport.save()
+                    messages.success(
+                        request,
+                        'Data is being imported in the background.'
+                    )
+                else:
+                    contributionimport.status = JOB_STATUS.processing
+                    contributionimport.save()
+                    contributionimport.process()
+                    messages.success(
+                        request,
+                        '%s contribution(s) imported.' % (
+                            contributionimport.imported
+                        )
                     )
 
-                    try:
-                        serializer.is_valid(raise_exception=True)
-                        serializer.save()
-                        datafeature.imported = True
-                        datafeature.save()
-                        imported += 1
-                    except ValidationError:
-                        pass
-
-                # restore post interactions
-                for post_interaction, status_backup in post_interactions_backup.items():
-                    post_interaction.status = status_backup
-                    post_interaction.save()
-
-                messages.success(
-                    request,
-                    '%s contribution(s) imported.' % imported
-                )
                 return redirect(
                     'geokey_dataimports:single_dataimport',
                     project_id=project_id,
@@ -817,3 +829,286 @@ class RemoveDataImportPage(DataImportContext, TemplateView):
                 )
 
         return self.render_to_response(context)
+
+
+# ###########################
+# AJAX API
+# ###########################
+
+class DataImportProgressAjax(APIView):
+    """Data import progress via AJAX."""
+
+    @handle_exceptions_for_ajax
+    def get(self, request, project_id, dataimport_id):
+        """
+        GET method for the progress of a data import.
+
+        Parameters
+        ----------
+        request : rest_framework.request.Request
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+
+        Returns
+        -------
+        rest_framework.response.Response
+            Status and progress of reading the file, together with progress
+            of the latest import of data features as contributions (`None`
+            when there has not been any).
+        """
+        project = Project.objects.as_admin(request.user, project_id)
+
+        try:
+            dataimport = DataImport.objects.get(
+                pk=dataimport_id,
+                project=project
+            )
+        except DataImport.DoesNotExist:
+            return Response(
+                {'error': does_not_exist_msg('Data import')},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        contributionimport = dataimport.get_latest_contributionimport()
+
+        return Response({
+            'status': dataimport.status,
+            'progress': dataimport.progress,
+            'contributionimport': (
+                contributionimport.get_progress()
+                if contributionimport else None
+            )
+        })
+
+
+class DataImportDataFeaturesAjax(APIView):
+    """Data import data features via AJAX."""
+
+    @handle_exceptions_for_ajax
+    def get(self, request, project_id, dataimport_id):
+        """
+        GET method for data features as GeoJSON.
+
+        Data features can be filtered with the `bbox` parameter (minimum
+        longitude, minimum latitude, maximum longitude and maximum latitude,
+        separated with commas) and by whether they are imported with the
+        `imported` parameter (`true` or `false`). They are paginated with the
+        `page` and `page_size` parameters, up to `DATAIMPORTS_PAGE_SIZE` on a
+        page.
+
+        Parameters
+        ----------
+        request : rest_framework.request.Request
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+
+        Returns
+        -------
+        django.http.HttpResponse
+            Feature collection with data features on the page, together with
+            the number of all data features matching and URLs of the next
+            and the previous page.
+        rest_framework.response.Response
+            Error when data import does not exist, or filters or page are not
+            valid.
+        """
+        project = Project.objects.as_admin(request.user, project_id)
+
+        try:
+            dataimport = DataImport.objects.get(
+                pk=dataimport_id,
+                project=project
+            )
+        except DataImport.DoesNotExist:
+            return Response(
+                {'error': does_not_exist_msg('Data import')},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            bbox = parse_bbox(request.GET.get('bbox'))
+            imported = parse_imported(request.GET.get('imported'))
+            page, page_size = parse_page(
+                request.GET.get('page'),
+                request.GET.get('page_size'),
+                getattr(settings, 'DATAIMPORTS_PAGE_SIZE', 1000)
+            )
+        except ValueError as error:
+            return Response(
+                {'error': str(error)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        count, features = DataFeature.objects.get_geojson(
+            dataimport,
+            imported=imported,
+            bbox=bbox,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+
+        url = request.build_absolute_uri()
+        links = {
+            'next': (
+                replace_query_param(url, 'page', page + 1)
+                if page * page_size < count else None
+            ),
+            'previous': (
+                replace_query_param(url, 'page', page - 1)
+                if page > 1 else None
+            )
+        }
+
+        # Features are JSON already, only the collection around is dumped
+        return HttpResponse(
+            '{"type": "FeatureCollection", "count": %d, "next": %s, '
+            '"previous": %s, "features": %s}' % (
+                count,
+                json.dumps(links['next']),
+                json.dumps(links['previous']),
+                features
+            ),
+            content_type='application/json'
+        )
+
+
+class DataImportDataFeatureClustersAjax(APIView):
+    """Data import data feature clusters via AJAX."""
+
+    @handle_exceptions_for_ajax
+    def get(self, request, project_id, dataimport_id):
+        """
+        GET method for data features clustered for a zoom level.
+
+        Data features are clustered in a grid with cells about
+        `DATAIMPORTS_CLUSTER_SIZE` pixels wide at the `zoom` parameter. They
+        can be filtered with the `bbox` parameter (minimum longitude, minimum
+        latitude, maximum longitude and maximum latitude, separated with
+        commas) and by whether they are imported with the `imported`
+        parameter (`true` or `false`).
+
+        Parameters
+        ----------
+        request : rest_framework.request.Request
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+
+        Returns
+        -------
+        django.http.HttpResponse
+            Feature collection with a point for each cluster, and the number
+            of data features in it.
+        rest_framework.response.Response
+            Error when data import does not exist, or zoom level or filters
+            are not valid.
+        """
+        project = Project.objects.as_admin(request.user, project_id)
+
+        try:
+            dataimport = DataImport.objects.get(
+                pk=dataimport_id,
+                project=project
+            )
+        except DataImport.DoesNotExist:
+            return Response(
+                {'error': does_not_exist_msg('Data import')},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            zoom = parse_zoom(request.GET.get('zoom'))
+            bbox = parse_bbox(request.GET.get('bbox'))
+            imported = parse_imported(request.GET.get('imported'))
+        except ValueError as error:
+            return Response(
+                {'error': str(error)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        clusters = DataFeature.objects.get_clusters(
+            dataimport,
+            get_grid_size(
+                zoom,
+                getattr(settings, 'DATAIMPORTS_CLUSTER_SIZE', 64)
+            ),
+            imported=imported,
+            bbox=bbox
+        )
+
+        # Clusters are JSON already, only the collection around is dumped
+        return HttpResponse(
+            '{"type": "FeatureCollection", "features": %s}' % clusters,
+            content_type='application/json'
+        )
+
+
+class DataImportDataFeaturesTileAjax(APIView):
+    """Data import data features as vector tiles via AJAX."""
+
+    @handle_exceptions_for_ajax
+    def get(self, request, project_id, dataimport_id, zoom, x, y):
+        """
+        GET method for a vector tile of data features.
+
+        Data features can be filtered by whether they are imported with the
+        `imported` parameter (`true` or `false`).
+
+        Parameters
+        ----------
+        request : rest_framework.request.Request
+            Object representing the request.
+        project_id : int
+            Identifies the project in the database.
+        dataimport_id : int
+            Identifies the data import in the database.
+        zoom : int
+            Zoom level of the tile.
+        x : int
+            Column of the tile.
+        y : int
+            Row of the tile.
+
+        Returns
+        -------
+        django.http.HttpResponse
+            Mapbox Vector Tile with data features, carrying their IDs and
+            whether they are imported.
+        rest_framework.response.Response
+            Error when data import does not exist, or tile or filter is not
+            valid.
+        """
+        project = Project.objects.as_admin(request.user, project_id)
+
+        try:
+            dataimport = DataImport.objects.get(
+                pk=dataimport_id,
+                project=project
+            )
+        except DataImport.DoesNotExist:
+            return Response(
+                {'error': does_not_exist_msg('Data import')},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            bounds = get_tile_bounds(zoom, x, y)
+            imported = parse_imported(request.GET.get('imported'))
+        except ValueError as error:
+            return Response(
+                {'error': str(error)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return HttpResponse(
+            DataFeature.objects.get_tile(dataimport, bounds, imported),
+            content_type='application/vnd.mapbox-vector-tile'
+        )